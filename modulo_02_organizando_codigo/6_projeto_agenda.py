@@ -11,66 +11,139 @@
 #   - Módulos (Lição 2.5)
 # ============================================================
 
+import argparse
 import json
 import os
+import threading
 from datetime import datetime
 
+from agenda_armazenamento import ArmazenamentoAgenda
+from agenda_contato import Contato
+from agenda_duplicados import fundir_duplicados, procurar_duplicados
+from agenda_exportacao import exportar
+from agenda_importacao import importar
+from agenda_indice import ContactStore
+from agenda_validacao import validar_email, validar_nome, validar_telefone
+
 # ============================================================
 # CONFIGURAÇÕES
 # ============================================================
 
+# Formato escolhido pela extensão: ".json" (lista), ".jsonl" (um por
+# linha) ou ".bin" (binário, abre bem mais rápido)
 ARQUIVO_CONTATOS = "agenda_contatos.json"
 VERSAO = "1.0"
 
+# Fotografia (agenda_contatos.json) + diário de mudanças (.json.log)
+# Veja agenda_armazenamento.py
+armazenamento = ArmazenamentoAgenda(ARQUIVO_CONTATOS)
+
+# Com a agenda aberta em outra janela, cada gravação espera a vez
+# (veja agenda_trava.py)
+armazenamento.trava.ao_esperar = lambda: print("⏳ Agenda em uso por outra sessão, aguardando...")
+
 # ============================================================
 # FUNÇÕES DE DADOS (manipulação de contatos)
 # ============================================================
 
-def carregar_contatos():
+def carregar_contatos(contatos=None):
     """
-    Carrega os contatos do arquivo JSON.
-    Retorna lista vazia se arquivo não existir.
+    Carrega os contatos do arquivo JSON e reaplica o diário de mudanças.
+    O arquivo é lido aos poucos, sem guardar o texto inteiro na memória.
+    Retorna um ContactStore (vazio se o arquivo não existir).
     """
+    if contatos is None:
+        contatos = ContactStore()
     try:
-        if os.path.exists(ARQUIVO_CONTATOS):
-            with open(ARQUIVO_CONTATOS, "r", encoding="utf-8") as arquivo:
-                return json.load(arquivo)
-        return []
+        armazenamento.carregar_em(contatos)
     except json.JSONDecodeError:
         print("⚠ Erro ao ler arquivo. Iniciando agenda vazia.")
-        return []
+        contatos.limpar()
     except Exception as e:
         print(f"⚠ Erro inesperado: {e}")
-        return []
+        contatos.limpar()
+    return contatos
+
+
+# Com uma agenda enorme, ler o arquivo leva alguns segundos. Em vez de
+# esperar, o menu aparece na hora e uma "thread" (um trabalho que roda
+# ao mesmo tempo que o resto do programa) vai enchendo o ContactStore.
+# Antes de mexer nos contatos, as opções do menu chamam aguardar_carga().
+carga = {"thread": None}
+
+
+def iniciar_carga(contatos):
+    """Começa a carregar os contatos em segundo plano."""
+    carga["thread"] = threading.Thread(
+        target=carregar_contatos, args=(contatos,), daemon=True
+    )
+    carga["thread"].start()
 
 
-def salvar_contatos(contatos):
+def carga_terminou():
+    """True quando todos os contatos já foram carregados."""
+    return carga["thread"] is None or not carga["thread"].is_alive()
+
+
+def aguardar_carga(contatos):
+    """Espera a carga em segundo plano terminar, mostrando o progresso."""
+    if carga_terminou():
+        return
+    while not carga_terminou():
+        print(f"\r⏳ Carregando contatos... {len(contatos)} lido(s)", end="", flush=True)
+        carga["thread"].join(0.5)
+    print(f"\r📂 {len(contatos)} contato(s) carregado(s).        ")
+
+
+def salvar_contatos(contatos, tudo_no_diario=True):
     """
-    Salva a lista de contatos no arquivo JSON.
+    Salva a lista INTEIRA de contatos no arquivo JSON (e zera o diário).
+    tudo_no_diario=False: houve mudanças que não passaram pelo diário.
     Retorna True se salvou com sucesso, False se houve erro.
     """
     try:
-        with open(ARQUIVO_CONTATOS, "w", encoding="utf-8") as arquivo:
-            json.dump(contatos, arquivo, indent=2, ensure_ascii=False)
+        armazenamento.compactar(contatos, tudo_no_diario)
         return True
     except Exception as e:
         print(f"⚠ Erro ao salvar: {e}")
         return False
 
 
-def buscar_por_nome(contatos, termo):
+def salvar_operacao(contatos, operacao, contato, alteracoes=None):
     """
-    Busca contatos que contenham o termo no nome.
-    Retorna lista de contatos encontrados.
+    Faz UMA mudança ("adicionar", "editar" ou "excluir") nos contatos e
+    salva só ela no diário. De tempos em tempos, grava a lista inteira
+    (compactação).
+
+    Antes, recebe o que outras sessões abertas na mesma agenda gravaram.
+    Na edição, `contato` é o contato como o usuário o viu e `alteracoes`
+    o que ele digitou: campos que outra sessão mudou são mantidos.
+    Retorna True se salvou com sucesso, False se houve erro.
     """
-    termo = termo.lower().strip()
-    encontrados = []
+    try:
+        conflitos = armazenamento.salvar_mudanca(contatos, operacao, contato, alteracoes)
+    except Exception as e:
+        print(f"⚠ Erro ao salvar: {e}")
+        return False
+
+    if conflitos is None:
+        print("⚠ Este contato foi excluído por outra sessão.")
+        return False
+    for campo, deles, meu in conflitos:
+        print(f"⚠ {campo.title()} também foi alterado por outra sessão "
+              f"('{deles or ''}'); ficou o que você digitou ('{meu}').")
+    return True
 
-    for contato in contatos:
-        if termo in contato["nome"].lower():
-            encontrados.append(contato)
 
-    return encontrados
+def buscar_por_nome(contatos, termo):
+    """
+    Busca aproximada no nome, email, telefone e notas: "jose" acha
+    "José", "jsoe" também, e "tiago" acha "Thiago" (veja agenda_busca.py).
+    Retorna os contatos que mais combinam, do melhor para o pior.
+    """
+    if contatos.busca is None and len(contatos) > 10_000:
+        print("⏳ Preparando o índice de busca (só na primeira vez)...")
+    return contatos.buscar(termo)
 
 
 def buscar_por_id(contatos, id_contato):
@@ -78,68 +151,12 @@ def buscar_por_id(contatos, id_contato):
     Busca um contato pelo ID.
     Retorna o contato ou None se não encontrar.
     """
-    for contato in contatos:
-        if contato["id"] == id_contato:
-            return contato
-    return None
+    return contatos.por_id(id_contato)
 
 
 def gerar_id(contatos):
     """Gera um novo ID único para o contato."""
-    if len(contatos) == 0:
-        return 1
-
-    maior_id = max(c["id"] for c in contatos)
-    return maior_id + 1
-
-
-# ============================================================
-# FUNÇÕES DE VALIDAÇÃO
-# ============================================================
-
-def validar_email(email):
-    """
-    Valida formato básico de email.
-    Retorna True se válido, False se inválido.
-    """
-    email = email.strip()
-    if not email:  # Email vazio é permitido
-        return True
-    if "@" not in email:
-        return False
-    if "." not in email.split("@")[1]:
-        return False
-    return True
-
-
-def validar_telefone(telefone):
-    """
-    Valida formato básico de telefone.
-    Aceita apenas números, espaços, parênteses e hífen.
-    """
-    telefone = telefone.strip()
-    if not telefone:  # Telefone vazio é permitido
-        return True
-
-    caracteres_validos = "0123456789 ()-+"
-    for char in telefone:
-        if char not in caracteres_validos:
-            return False
-
-    # Deve ter pelo menos 8 dígitos
-    digitos = sum(1 for c in telefone if c.isdigit())
-    return digitos >= 8
-
-
-def validar_nome(nome):
-    """
-    Valida o nome do contato.
-    Retorna True se válido, False se inválido.
-    """
-    nome = nome.strip()
-    if len(nome) < 2:
-        return False
-    return True
+    return contatos.proximo_id
 
 
 # ============================================================
@@ -166,7 +183,8 @@ def exibir_menu():
     print("│  4. ✏️  Editar contato           │")
     print("│  5. 🗑️  Excluir contato          │")
     print("│  6. 📊 Estatísticas             │")
-    print("│  7. 💾 Exportar para texto      │")
+    print("│  7. 💾 Exportar contatos        │")
+    print("│  8. 👥 Contatos duplicados      │")
     print("│  0. 🚪 Sair                     │")
     print("└─────────────────────────────────┘")
 
@@ -233,7 +251,7 @@ def adicionar_contato(contatos):
     """Adiciona um novo contato à agenda."""
     print("\n--- ADICIONAR CONTATO ---\n")
 
-    # Coleta dados
+    # Coleta dados (a carga pode terminar enquanto o usuário digita)
     nome = pedir_texto("Nome: ", obrigatorio=True, validador=validar_nome)
     telefone = pedir_texto("Telefone: ", obrigatorio=False, validador=validar_telefone)
     email = pedir_texto("Email: ", obrigatorio=False, validador=validar_email)
@@ -245,25 +263,28 @@ def adicionar_contato(contatos):
 
     notas = pedir_texto("Notas (opcional): ", obrigatorio=False)
 
-    # Cria o contato
-    novo_contato = {
-        "id": gerar_id(contatos),
-        "nome": nome.title(),
-        "telefone": telefone if telefone else None,
-        "email": email.lower() if email else None,
-        "categoria": categoria.title(),
-        "notas": notas if notas else None,
-        "criado_em": datetime.now().strftime("%d/%m/%Y %H:%M")
-    }
+    # O próximo id só é conhecido depois de ler todos os contatos
+    aguardar_carga(contatos)
+
+    # Cria o contato (veja agenda_contato.py)
+    novo_contato = Contato(
+        id=gerar_id(contatos),
+        nome=nome.title(),
+        telefone=telefone if telefone else None,
+        email=email.lower() if email else None,
+        categoria=categoria.title(),
+        notas=notas if notas else None,
+        criado_em=datetime.now().strftime("%d/%m/%Y %H:%M"),
+    )
 
     # Confirmação
     print("\n--- Confirme os dados ---")
     exibir_contato(novo_contato, detalhado=True)
 
     if pedir_confirmacao("\nSalvar este contato?"):
-        contatos.append(novo_contato)
-        if salvar_contatos(contatos):
-            print("\n✅ Contato adicionado com sucesso!")
+        # O id pode mudar se outra sessão adicionou um contato antes
+        if salvar_operacao(contatos, "adicionar", novo_contato):
+            print(f"\n✅ Contato adicionado com sucesso! (ID {novo_contato['id']})")
         else:
             print("\n⚠ Contato adicionado, mas houve erro ao salvar.")
     else:
@@ -278,8 +299,8 @@ def listar_contatos(contatos):
         print("\n📭 A agenda está vazia.")
         return
 
-    # Ordena por nome
-    contatos_ordenados = sorted(contatos, key=lambda c: c["nome"])
+    # Já vem em ordem de nome (índice do ContactStore)
+    contatos_ordenados = contatos.ordenados_por_nome()
 
     print(f"\n📒 Total: {len(contatos)} contato(s)\n")
     print("-" * 50)
@@ -294,20 +315,20 @@ def listar_contatos(contatos):
 
 
 def buscar_contato(contatos):
-    """Busca contatos por nome."""
+    """Busca contatos por nome, email, telefone ou notas."""
     print("\n--- BUSCAR CONTATO ---\n")
 
     if len(contatos) == 0:
         print("📭 A agenda está vazia.")
         return
 
-    termo = pedir_texto("Digite o nome (ou parte dele): ")
+    termo = pedir_texto("Digite o nome, email ou telefone (ou parte dele): ")
     encontrados = buscar_por_nome(contatos, termo)
 
     if len(encontrados) == 0:
         print(f"\n❌ Nenhum contato encontrado com '{termo}'.")
     else:
-        print(f"\n✅ Encontrado(s) {len(encontrados)} contato(s):\n")
+        print(f"\n✅ {len(encontrados)} contato(s) mais parecido(s) com '{termo}':\n")
         for contato in encontrados:
             exibir_contato(contato, detalhado=True)
 
@@ -353,34 +374,37 @@ def editar_contato(contatos):
     # Edição
     print("\n(Pressione Enter para manter o valor atual)\n")
 
+    # Junta as mudanças primeiro: o ContactStore aplica todas de uma vez
+    alteracoes = {}
+
     novo_nome = input(f"Nome [{contato['nome']}]: ").strip()
     if novo_nome and validar_nome(novo_nome):
-        contato["nome"] = novo_nome.title()
+        alteracoes["nome"] = novo_nome.title()
 
     novo_tel = input(f"Telefone [{contato.get('telefone', '')}]: ").strip()
     if novo_tel:
         if validar_telefone(novo_tel):
-            contato["telefone"] = novo_tel
+            alteracoes["telefone"] = novo_tel
         else:
             print("⚠ Telefone inválido, mantendo anterior.")
 
     novo_email = input(f"Email [{contato.get('email', '')}]: ").strip()
     if novo_email:
         if validar_email(novo_email):
-            contato["email"] = novo_email.lower()
+            alteracoes["email"] = novo_email.lower()
         else:
             print("⚠ Email inválido, mantendo anterior.")
 
     nova_cat = input(f"Categoria [{contato.get('categoria', 'Geral')}]: ").strip()
     if nova_cat:
-        contato["categoria"] = nova_cat.title()
+        alteracoes["categoria"] = nova_cat.title()
 
     novas_notas = input(f"Notas [{contato.get('notas', '')}]: ").strip()
     if novas_notas:
-        contato["notas"] = novas_notas
+        alteracoes["notas"] = novas_notas
 
-    # Salva
-    if salvar_contatos(contatos):
+    # Salva (o ContactStore é alterado lá, junto com a gravação)
+    if salvar_operacao(contatos, "editar", contato, alteracoes):
         print("\n✅ Contato atualizado com sucesso!")
     else:
         print("\n⚠ Erro ao salvar alterações.")
@@ -421,8 +445,7 @@ def excluir_contato(contatos):
 
     # Confirmação
     if pedir_confirmacao(f"\n⚠️ Excluir '{contato['nome']}'?"):
-        contatos.remove(contato)
-        if salvar_contatos(contatos):
+        if salvar_operacao(contatos, "excluir", contato):
             print("\n✅ Contato excluído com sucesso!")
         else:
             print("\n⚠ Erro ao salvar alterações.")
@@ -431,7 +454,11 @@ def excluir_contato(contatos):
 
 
 def mostrar_estatisticas(contatos):
-    """Mostra estatísticas da agenda."""
+    """
+    Mostra estatísticas da agenda.
+    Os números já vêm prontos (veja agenda_estatisticas.py): nada de
+    percorrer todos os contatos a cada vez.
+    """
     print("\n--- ESTATÍSTICAS ---\n")
 
     total = len(contatos)
@@ -440,78 +467,231 @@ def mostrar_estatisticas(contatos):
     if total == 0:
         return
 
-    # Contagem por categoria
-    categorias = {}
-    for c in contatos:
-        cat = c.get("categoria", "Geral")
-        categorias[cat] = categorias.get(cat, 0) + 1
+    estatisticas = contatos.estatisticas
 
     print("\n📁 Por categoria:")
-    for cat, qtd in sorted(categorias.items()):
+    for cat, qtd in sorted(estatisticas.por_categoria.items()):
         porcentagem = (qtd / total) * 100
         print(f"   {cat}: {qtd} ({porcentagem:.0f}%)")
 
-    # Com email/telefone
-    com_email = sum(1 for c in contatos if c.get("email"))
-    com_telefone = sum(1 for c in contatos if c.get("telefone"))
+    print(f"\n📧 Com email: {estatisticas.com_email}")
+    print(f"📞 Com telefone: {estatisticas.com_telefone}")
+
+    if estatisticas.por_dominio:
+        print("\n🌐 Domínios de email mais comuns:")
+        for dominio, qtd in estatisticas.top_dominios(5):
+            print(f"   {dominio}: {qtd}")
+
+    if estatisticas.por_dia:
+        print("\n📅 Últimos dias com contatos novos:")
+        for dia, qtd in estatisticas.dias_recentes(7):
+            print(f"   {dia}: {qtd}")
 
-    print(f"\n📧 Com email: {com_email}")
-    print(f"📞 Com telefone: {com_telefone}")
+    repetidos = contatos.telefones_repetidos()
+    print(f"\n👥 Telefones usados por mais de um contato: {len(repetidos)}")
+    for telefone, qtd in sorted(repetidos.items(), key=lambda item: -item[1])[:5]:
+        print(f"   {telefone}: {qtd} contatos")
 
 
-def exportar_para_texto(contatos):
-    """Exporta contatos para um arquivo de texto."""
+def exportar_contatos(contatos):
+    """Exporta contatos em txt, CSV, vCard ou JSON Lines (veja agenda_exportacao.py)."""
     print("\n--- EXPORTAR CONTATOS ---\n")
 
     if len(contatos) == 0:
         print("📭 A agenda está vazia.")
         return
 
-    nome_arquivo = "contatos_exportados.txt"
+    print("Formatos: 1. Texto (.txt)  2. Planilha (.csv)")
+    print("          3. vCard (.vcf)  4. JSON Lines (.jsonl)")
+    escolha = input("Formato (Enter para texto): ").strip() or "1"
+    extensoes = {"1": ".txt", "2": ".csv", "3": ".vcf", "4": ".jsonl"}
+    if escolha not in extensoes:
+        print("❌ Formato inválido.")
+        return
+
+    nome_arquivo = "contatos_exportados" + extensoes[escolha]
+    if pedir_confirmacao("Comprimir com gzip?"):
+        nome_arquivo += ".gz"
 
     try:
-        with open(nome_arquivo, "w", encoding="utf-8") as f:
-            f.write("=" * 50 + "\n")
-            f.write("        AGENDA DE CONTATOS\n")
-            f.write(f"        Exportado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
-            f.write("=" * 50 + "\n\n")
-
-            for c in sorted(contatos, key=lambda x: x["nome"]):
-                f.write(f"Nome: {c['nome']}\n")
-                if c.get("telefone"):
-                    f.write(f"Telefone: {c['telefone']}\n")
-                if c.get("email"):
-                    f.write(f"Email: {c['email']}\n")
-                f.write(f"Categoria: {c.get('categoria', 'Geral')}\n")
-                if c.get("notas"):
-                    f.write(f"Notas: {c['notas']}\n")
-                f.write("-" * 30 + "\n\n")
-
-            f.write(f"\nTotal: {len(contatos)} contato(s)\n")
-
-        print(f"✅ Contatos exportados para '{nome_arquivo}'!")
+        total = exportar(contatos, nome_arquivo)
+        print(f"✅ {total} contato(s) exportado(s) para '{nome_arquivo}'!")
 
     except Exception as e:
         print(f"❌ Erro ao exportar: {e}")
 
 
+def mostrar_sugestoes(sugestoes, quantas=10):
+    """Mostra os grupos de possíveis duplicados (os primeiros `quantas`)."""
+    for automatico, motivo, grupo in sugestoes[:quantas]:
+        if automatico:
+            print(f"\n🔁 Duplicados ({motivo}):")
+        else:
+            print(f"\n❓ Talvez duplicados, confira ({motivo}):")
+        for contato in grupo:
+            print(f"   [{contato['id']:03d}] {contato['nome']:<25} "
+                  f"{contato['telefone'] or '-':<18} {contato['email'] or '-'}")
+    if len(sugestoes) > quantas:
+        print(f"\n... e mais {len(sugestoes) - quantas} grupo(s).")
+
+
+def juntar_duplicados(contatos):
+    """
+    Junta os duplicados certos (veja agenda_duplicados.py) e grava a
+    agenda uma vez só. A procura é refeita com a agenda travada e em
+    dia, caso outra sessão tenha mudado algo enquanto o usuário lia.
+    Retorna (grupos juntados, contatos removidos), ou None se houve erro.
+    """
+    with armazenamento.trava:
+        armazenamento.sincronizar(contatos)
+        grupos, removidos = fundir_duplicados(contatos, procurar_duplicados(contatos))
+        # As junções não passaram pelo diário: as outras sessões vão
+        # ler a agenda de novo
+        if removidos and not salvar_contatos(contatos, tudo_no_diario=False):
+            return None
+    return grupos, removidos
+
+
+def contatos_duplicados(contatos):
+    """Procura contatos repetidos e oferece juntar os certos."""
+    print("\n--- CONTATOS DUPLICADOS ---\n")
+
+    if len(contatos) > 100_000:
+        print("⏳ Procurando duplicados...")
+    sugestoes = procurar_duplicados(contatos)
+    if not sugestoes:
+        print("✅ Nenhum contato duplicado.")
+        return
+
+    automaticas = sum(1 for automatico, _, _ in sugestoes if automatico)
+    print(f"👥 {len(sugestoes)} grupo(s) de possíveis duplicados, "
+          f"{automaticas} com certeza.")
+    mostrar_sugestoes(sugestoes)
+
+    if not automaticas:
+        return
+    print("\nAo juntar, fica o contato mais antigo, completado pelos outros,")
+    print("com as notas de todos. Os \"talvez\" não são mexidos.")
+    if pedir_confirmacao(f"Juntar os {automaticas} grupo(s) com certeza?"):
+        resultado = juntar_duplicados(contatos)
+        if resultado is not None:
+            print(f"\n✅ {resultado[0]} grupo(s) juntado(s), "
+                  f"{resultado[1]} contato(s) a menos.")
+    else:
+        print("\n❌ Operação cancelada.")
+
+
+def duplicados_da_agenda(fundir=False, mostrar=20):
+    """
+    Procura duplicados sem abrir o menu; com fundir=True, junta os
+    certos e grava a agenda.
+    """
+    contatos = carregar_contatos()
+    sugestoes = procurar_duplicados(contatos)
+    automaticas = sum(1 for automatico, _, _ in sugestoes if automatico)
+    print(f"👥 {len(contatos)} contato(s), {len(sugestoes)} grupo(s) de possíveis "
+          f"duplicados, {automaticas} com certeza.")
+    mostrar_sugestoes(sugestoes, mostrar)
+    if not fundir or not automaticas:
+        return True
+
+    resultado = juntar_duplicados(contatos)
+    if resultado is None:
+        return False
+    print(f"\n✅ {resultado[0]} grupo(s) juntado(s), {resultado[1]} contato(s) a menos.")
+    return True
+
+
+def importar_arquivo(caminho, relatorio="importacao_rejeitados.csv", processos=0):
+    """
+    Importa um arquivo .csv, .vcf ou .jsonl inteiro, sem perguntas
+    (veja agenda_importacao.py). A agenda é gravada uma vez só, no fim.
+
+    A agenda fica travada do começo ao fim: outras sessões abertas
+    esperam a importação terminar para gravar.
+    """
+    with armazenamento.trava:
+        contatos = carregar_contatos()
+        print(f"📂 {len(contatos)} contato(s) na agenda. Importando '{caminho}'...")
+
+        try:
+            importados, rejeitados = importar(contatos, caminho, relatorio, processos)
+        except (OSError, ValueError) as e:
+            print(f"❌ Erro ao importar: {e}")
+            return False
+
+        # Os importados não passaram pelo diário: as outras sessões
+        # vão ler a agenda de novo
+        if importados and not salvar_contatos(contatos, tudo_no_diario=False):
+            return False
+    print(f"✅ {importados} contato(s) importado(s).")
+    if rejeitados:
+        print(f"⚠ {rejeitados} registro(s) recusado(s): veja '{relatorio}'.")
+    return True
+
+
 # ============================================================
 # PROGRAMA PRINCIPAL
 # ============================================================
 
+def ler_linha_de_comando():
+    """
+    Sem argumentos, a agenda abre o menu. Com "importar" ou
+    "duplicados", faz só isso e termina:
+        python 6_projeto_agenda.py importar contatos.csv --processos 4
+        python 6_projeto_agenda.py duplicados --fundir
+    """
+    parser = argparse.ArgumentParser(description="Agenda de contatos")
+    comandos = parser.add_subparsers(dest="comando")
+
+    importar_parser = comandos.add_parser(
+        "importar", help="importa contatos de um arquivo .csv, .vcf ou .jsonl (.gz opcional)")
+    importar_parser.add_argument("arquivo")
+    importar_parser.add_argument("--relatorio", default="importacao_rejeitados.csv",
+                                 help="CSV com os registros recusados e o motivo")
+    importar_parser.add_argument("--processos", type=int, default=0,
+                                 help="validar em paralelo com N processos")
+
+    duplicados_parser = comandos.add_parser(
+        "duplicados", help="procura contatos repetidos (com --fundir, junta os certos)")
+    duplicados_parser.add_argument("--fundir", action="store_true",
+                                   help="juntar os duplicados certos e gravar a agenda")
+    duplicados_parser.add_argument("--mostrar", type=int, default=20,
+                                   help="quantos grupos mostrar")
+    return parser.parse_args()
+
+
 def main():
     """Função principal do programa."""
-    # Carrega contatos existentes
-    contatos = carregar_contatos()
+    argumentos = ler_linha_de_comando()
+    if argumentos.comando == "importar":
+        importar_arquivo(argumentos.arquivo, argumentos.relatorio, argumentos.processos)
+        return
+    if argumentos.comando == "duplicados":
+        duplicados_da_agenda(argumentos.fundir, argumentos.mostrar)
+        return
+
+    # Carrega contatos existentes (em segundo plano)
+    contatos = ContactStore()
+    iniciar_carga(contatos)
 
     exibir_cabecalho()
-    print(f"\n📂 {len(contatos)} contato(s) carregado(s).")
+    print("\n📂 Carregando contatos...")
 
     # Loop principal
     while True:
+        if not carga_terminou():
+            print(f"\n⏳ {len(contatos)} contato(s) lido(s) até agora...")
         exibir_menu()
         opcao = input("\nEscolha uma opção: ").strip()
 
+        # Adicionar espera só na hora de salvar; sair não precisa esperar
+        if opcao not in ("1", "0"):
+            aguardar_carga(contatos)
+            # Traz o que outras sessões gravaram (se nada mudou, é só
+            # ler a primeira linha do diário e ver que não cresceu)
+            armazenamento.sincronizar(contatos)
+
         if opcao == "1":
             adicionar_contato(contatos)
         elif opcao == "2":
@@ -525,12 +705,21 @@ def main():
         elif opcao == "6":
             mostrar_estatisticas(contatos)
         elif opcao == "7":
-            exportar_para_texto(contatos)
+            exportar_contatos(contatos)
+        elif opcao == "8":
+            contatos_duplicados(contatos)
         elif opcao == "0":
+            # Ao sair, junta o diário em uma fotografia nova
+            # (só com a agenda inteira na memória!)
+            if carga_terminou() and armazenamento.operacoes_no_diario:
+                salvar_contatos(contatos)
+            elif carga_terminou() and contatos.busca is not None and contatos.busca.mudou:
+                # Guarda o índice de busca montado agora para a próxima vez
+                armazenamento.gravar_busca(contatos.busca)
             print("\n👋 Até logo! Seus contatos foram salvos.")
             break
         else:
-            print("\n⚠ Opção inválida! Digite um número de 0 a 7.")
+            print("\n⚠ Opção inválida! Digite um número de 0 a 8.")
 
         input("\nPressione Enter para continuar...")
 
@@ -0,0 +1,576 @@
+# ============================================================
+# ARMAZENAMENTO DA AGENDA: FOTOGRAFIA + DIÁRIO DE OPERAÇÕES
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py):
+#
+#   armazenamento = ArmazenamentoAgenda("agenda_contatos.json")
+#   armazenamento.carregar_em(contatos)
+#   armazenamento.salvar_mudanca(contatos, "adicionar", contato)
+#
+# Antes, cada adição/edição/exclusão reescrevia o arquivo JSON
+# INTEIRO. Com 500 mil contatos isso leva segundos, e se o programa
+# cair no meio da escrita o arquivo fica pela metade (corrompido).
+#
+# Agora são dois arquivos:
+#   agenda_contatos.json      → "fotografia" (snapshot): todos os
+#                               contatos em um certo momento
+#   agenda_contatos.json.log  → diário: uma linha JSON para cada
+#                               mudança feita depois da fotografia
+#                               (formato "JSON Lines")
+#
+#   {"op": "adicionar", "contato": {"id": 8, "nome": "Ana", ...}}
+#   {"op": "editar", "contato": {"id": 3, "nome": "Bia", ...}}
+#   {"op": "excluir", "id": 7}
+#
+# Gravar uma mudança = acrescentar UMA linha no fim do diário,
+# não importa o tamanho da agenda. Ao carregar, lemos a fotografia
+# e "reaplicamos" o diário por cima, na ordem.
+#
+# De tempos em tempos (a cada COMPACTAR_A_CADA mudanças e ao sair
+# da agenda) o diário é "compactado": gravamos uma fotografia nova
+# e começamos um diário novo. A fotografia nova vai primeiro para um
+# arquivo temporário e só depois troca de nome com os.replace(),
+# que é atômico: se o programa cair no meio, a fotografia antiga
+# continua inteira. Junto dela vão as estatísticas do ContactStore
+# (agenda_contatos.json.stats.json, veja agenda_estatisticas.py) e o
+# índice da busca aproximada (agenda_contatos.json.busca, veja
+# agenda_busca.py).
+#
+# VÁRIAS SESSÕES AO MESMO TEMPO: cada mudança é gravada com a agenda
+# TRAVADA (agenda_trava.py), e antes de gravar a sessão lê o que as
+# outras acrescentaram no diário desde a última vez, a partir da
+# POSIÇÃO onde parou (só o final do arquivo, nunca a agenda toda).
+# Cada compactação aumenta a GERAÇÃO, gravada na primeira linha do
+# diário novo:
+#
+#   {"op": "geracao", "geracao": 8}
+#
+# Assim uma sessão percebe que outra gravou uma fotografia nova. O
+# diário anterior fica guardado (.log.anterior) para quem ainda não
+# tinha lido o final dele; só quem ficou duas gerações para trás
+# precisa ler a agenda inteira de novo.
+#
+# LEITURA AOS POUCOS: json.load() precisa do texto INTEIRO na
+# memória antes de devolver o primeiro contato. Aqui o arquivo é
+# lido em pedaços de 64 KB e cada contato é entregue assim que
+# termina de ser lido (um "gerador", com yield). A fotografia pode
+# ser uma lista JSON (.json), JSON Lines (.jsonl, um contato por
+# linha) ou binária (.bin, veja agenda_binario.py), escolhida pela
+# extensão do arquivo. Para trocar de formato:
+#
+#   converter_agenda("agenda_contatos.json", "agenda_contatos.bin")
+# ============================================================
+
+import contextlib
+import gc
+import json
+import os
+
+from agenda_binario import gravar_binario, ler_binario, ler_binario_com_indice
+from agenda_busca import IndiceBusca
+from agenda_contato import Contato
+from agenda_estatisticas import EstatisticasAgenda
+from agenda_trava import TravaArquivo, mesclar_alteracoes
+
+# Quantas mudanças acumular no diário antes de gravar uma fotografia nova
+COMPACTAR_A_CADA = 1000
+
+# Tamanho de cada pedaço lido do arquivo (em caracteres)
+TAMANHO_PEDACO = 64 * 1024
+
+
+def _como_dicionario(objeto):
+    """Objetos como o Contato (agenda_contato.py) sabem virar dicionário"""
+    if hasattr(objeto, "para_dict"):
+        return objeto.para_dict()
+    raise TypeError(f"{type(objeto).__name__} não pode ser gravado em JSON")
+
+
+# Um codificador só, reaproveitado em todas as linhas
+para_json = json.JSONEncoder(ensure_ascii=False, default=_como_dicionario).encode
+
+
+@contextlib.contextmanager
+def sem_coleta_de_lixo():
+    """
+    Pausa o coletor de lixo "cíclico" do Python durante uma carga grande.
+
+    Ele procura grupos de objetos que apontam uns para os outros. Criar
+    um milhão de contatos de uma vez faz ele rodar centenas de vezes,
+    cada vez olhando todos os objetos, e contatos nunca formam ciclos.
+    """
+    estava_ligado = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if estava_ligado:
+            gc.enable()
+
+
+def _geracao(caminho):
+    """Geração gravada na primeira linha do diário (0 se não tem)"""
+    try:
+        with open(caminho, "rb") as diario:
+            primeira = diario.readline()
+    except OSError:
+        return 0
+    if not primeira.startswith(b'{"op": "geracao"') or not primeira.endswith(b"\n"):
+        return 0
+    return json.loads(primeira)["geracao"]
+
+
+def _versoes_finais(registros):
+    """Mudanças do diário → {id: versão final do contato, ou None se foi excluído}"""
+    # Adicionar e editar guardam o contato inteiro, então reaplicar a
+    # mesma linha duas vezes dá o mesmo resultado (o que permite repetir
+    # o diário depois de uma queda sem estragar nada).
+    mudados = {}
+    for registro in registros:
+        if registro["op"] == "excluir":
+            mudados[registro["id"]] = None
+        else:
+            mudados[registro["contato"]["id"]] = Contato.de_dict(registro["contato"])
+    return mudados
+
+
+def _aplicar(contatos, id_contato, contato):
+    """Troca (ou tira, se contato=None) o contato com esse id no ContactStore"""
+    antigo = contatos.por_id(id_contato)
+    if antigo is not None:
+        contatos.remover(antigo)
+    if contato is not None:
+        contatos.adicionar(contato)
+
+
+class ArmazenamentoAgenda:
+    """Fotografia JSON dos contatos + diário de mudanças (JSON Lines)"""
+
+    def __init__(self, arquivo, compactar_a_cada=COMPACTAR_A_CADA):
+        self.arquivo = arquivo
+        self.arquivo_diario = arquivo + ".log"
+        self.arquivo_diario_anterior = arquivo + ".log.anterior"
+        self.arquivo_estatisticas = arquivo + ".stats.json"
+        self.arquivo_busca = arquivo + ".busca"
+        self.compactar_a_cada = compactar_a_cada
+        self.operacoes_no_diario = 0
+        self.trava = TravaArquivo(arquivo + ".lock")
+        # Até onde esta sessão já leu: geração do diário e posição (bytes)
+        self.geracao = 0
+        self.posicao_diario = 0
+        self.fotografia = None  # assinatura da fotografia que foi lida
+
+    # ---------- Leitura ----------
+
+    def carregar(self):
+        """Lê a fotografia, reaplica o diário e devolve a lista de contatos"""
+        with sem_coleta_de_lixo():
+            return list(self.ler())
+
+    def ler(self):
+        """
+        Entrega os contatos (objetos Contato, já com o diário aplicado)
+        um a um, enquanto o arquivo vai sendo lido.
+
+        A agenda fica travada até o último contato (ou até o gerador ser
+        fechado): se outra sessão compactasse no meio, a fotografia nova
+        já teria mudanças MAIS NOVAS que as do diário lido antes, e o
+        diário velho as desfaria.
+        """
+        with self.trava:
+            mudados = self._ler_mudancas()
+            for contato in self._ler_fotografia():
+                if contato.id in mudados:
+                    contato = mudados.pop(contato.id)
+                    if contato is None:
+                        continue  # excluído depois da fotografia
+                yield contato
+
+            # Sobraram os contatos adicionados depois da fotografia
+            for contato in mudados.values():
+                if contato is not None:
+                    yield contato
+
+    def carregar_em(self, contatos):
+        """
+        Enche um ContactStore com a fotografia e o diário.
+
+        A fotografia entra de uma vez, junto com as estatísticas gravadas
+        ao lado dela (se ainda valem para essa fotografia). Com a
+        fotografia .bin, os nomes normalizados e a ordem alfabética também
+        já vêm prontos do arquivo. As poucas mudanças do diário entram
+        depois, uma a uma, atualizando índices e estatísticas.
+
+        A agenda fica travada durante a leitura: nenhuma outra sessão
+        troca a fotografia ou o diário no meio.
+        """
+        with self.trava:
+            mudados = self._ler_mudancas()
+            estatisticas = self._ler_estatisticas()
+            with sem_coleta_de_lixo():
+                if self.arquivo.endswith(".bin") and os.path.exists(self.arquivo):
+                    fotografia, ids, nomes = ler_binario_com_indice(self.arquivo)
+                    contatos.carregar(fotografia, nomes, ids, estatisticas)
+                else:
+                    contatos.carregar(self._ler_fotografia(), estatisticas=estatisticas)
+                self.fotografia = None
+                if os.path.exists(self.arquivo):
+                    self.fotografia = self._assinatura_fotografia()
+                    # Índice da busca aproximada, se foi gravado com esta fotografia
+                    contatos.busca = IndiceBusca.ler(self.arquivo_busca, self.fotografia)
+
+            for id_contato, contato in mudados.items():
+                _aplicar(contatos, id_contato, contato)
+
+    def _ler_mudancas(self):
+        """Diário → {id: versão final do contato, ou None se foi excluído}"""
+        # O diário é pequeno (no máximo COMPACTAR_A_CADA linhas): lemos
+        # primeiro, guardando só a versão final de cada contato mudado.
+        self.geracao = _geracao(self.arquivo_diario)
+        registros, self.posicao_diario = self._ler_diario(self.arquivo_diario)
+        self.operacoes_no_diario = len(registros)
+        return _versoes_finais(registros)
+
+    def _ler_fotografia(self):
+        if not os.path.exists(self.arquivo):
+            return iter(())
+        if self.arquivo.endswith(".bin"):
+            return ler_binario(self.arquivo)
+        if self.arquivo.endswith(".jsonl"):
+            return map(Contato.de_dict, ler_linhas_json(self.arquivo))
+        return map(Contato.de_dict, ler_lista_json(self.arquivo))
+
+    def _assinatura_fotografia(self):
+        """Tamanho e hora de modificação: mudam se a fotografia mudar"""
+        informacoes = os.stat(self.arquivo)
+        return [informacoes.st_size, informacoes.st_mtime_ns]
+
+    def _ler_estatisticas(self):
+        """Estatísticas gravadas ao lado da fotografia, ou None se não valem mais"""
+        try:
+            with open(self.arquivo_estatisticas, "r", encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+            if dados["fotografia"] != self._assinatura_fotografia():
+                return None  # a fotografia foi trocada depois
+            return EstatisticasAgenda.de_dict(dados)
+        except (OSError, ValueError, KeyError):
+            return None  # sem arquivo ou arquivo estragado: o ContactStore reconta
+
+    def _ler_diario(self, caminho, desde=0):
+        """
+        Mudanças do diário a partir da posição `desde` (em bytes).
+        Retorna (lista de mudanças, posição do fim da última linha inteira).
+        Chamar só com a agenda travada.
+        """
+        if not os.path.exists(caminho):
+            return [], 0
+
+        registros = []
+        completos = desde  # bytes até o fim da última linha inteira
+        with open(caminho, "rb") as diario:
+            diario.seek(desde)
+            for linha in diario:
+                if not linha.endswith(b"\n"):
+                    break  # última linha cortada por uma queda: descarta
+                completos += len(linha)
+                registro = json.loads(linha)
+                if registro["op"] != "geracao":
+                    registros.append(registro)
+
+        # Corta o pedaço incompleto, para a próxima linha não grudar nele
+        # (com a trava, ninguém está escrevendo essa linha agora)
+        if caminho == self.arquivo_diario and os.path.getsize(caminho) > completos:
+            os.truncate(caminho, completos)
+        return registros, completos
+
+    # ---------- Outras sessões ----------
+
+    def sincronizar(self, contatos):
+        """
+        Traz para o ContactStore o que OUTRAS sessões gravaram desde a
+        última leitura. Retorna quantas mudanças chegaram.
+
+        Normalmente só o final do diário é lido (a partir de
+        posicao_diario). Se outra sessão compactou, lemos o final do
+        diário anterior e o diário novo; se compactou mais de uma vez
+        (ou mudou contatos sem passar pelo diário, como a importação),
+        a agenda é lida de novo.
+        """
+        with self.trava:
+            geracao = _geracao(self.arquivo_diario)
+            if geracao == self.geracao:
+                registros, self.posicao_diario = self._ler_diario(
+                    self.arquivo_diario, self.posicao_diario)
+                self.operacoes_no_diario += len(registros)
+            elif (geracao == self.geracao + 1
+                  and _geracao(self.arquivo_diario_anterior) == self.geracao):
+                registros, _ = self._ler_diario(self.arquivo_diario_anterior,
+                                                self.posicao_diario)
+                novos, self.posicao_diario = self._ler_diario(self.arquivo_diario)
+                registros += novos
+                self.geracao = geracao
+                self.operacoes_no_diario = len(novos)
+                self.fotografia = self._assinatura_fotografia()
+            else:
+                contatos.limpar()
+                self.carregar_em(contatos)
+                return len(contatos)
+
+            for id_contato, contato in _versoes_finais(registros).items():
+                _aplicar(contatos, id_contato, contato)
+            return len(registros)
+
+    # ---------- Escrita ----------
+
+    def salvar_mudanca(self, contatos, operacao, contato, alteracoes=None):
+        """
+        Faz UMA mudança no ContactStore e grava no diário, com a agenda
+        travada e em dia com as outras sessões.
+
+        operacao: "adicionar" → contato novo (recebe aqui o próximo id
+                                livre, contando os das outras sessões)
+                  "editar"    → contato como o usuário viu, mais as
+                                alteracoes {campo: valor} digitadas
+                  "excluir"   → contato a excluir
+
+        Retorna os conflitos da edição [(campo, valor da outra sessão,
+        valor que vale)] (lista vazia se não houve), ou None se outra
+        sessão já excluiu o contato.
+        """
+        with self.trava:
+            self.sincronizar(contatos)
+            conflitos = []
+            if operacao == "adicionar":
+                contato["id"] = contatos.proximo_id
+                contatos.adicionar(contato)
+            else:
+                atual = contatos.por_id(contato["id"])
+                if atual is None:
+                    return None
+                if operacao == "editar":
+                    alteracoes, conflitos = mesclar_alteracoes(contato, atual, alteracoes)
+                    contatos.editar(atual, alteracoes)
+                else:
+                    contatos.remover(atual)
+                contato = atual
+
+            if self.registrar(operacao, contato):
+                self.compactar(contatos)
+        return conflitos
+
+    def registrar(self, operacao, contato):
+        """
+        Acrescenta uma mudança no fim do diário.
+
+        operacao: "adicionar", "editar" ou "excluir"
+        Retorna True quando o diário já está grande e é hora de compactar.
+        """
+        if operacao == "excluir":
+            registro = {"op": operacao, "id": contato["id"]}
+        else:
+            registro = {"op": operacao, "contato": contato}
+        linha = (para_json(registro) + "\n").encode("utf-8")
+
+        with self.trava:
+            with open(self.arquivo_diario, "ab") as diario:
+                inicio = diario.tell()
+                diario.write(linha)
+                diario.flush()
+                os.fsync(diario.fileno())  # só retorna quando chegou ao disco
+            # Se ninguém escreveu antes desta linha, ela já está "lida"
+            if inicio == self.posicao_diario:
+                self.posicao_diario = inicio + len(linha)
+
+        self.operacoes_no_diario += 1
+        return self.operacoes_no_diario >= self.compactar_a_cada
+
+    def compactar(self, contatos, tudo_no_diario=True):
+        """
+        Grava uma fotografia nova de forma atômica e começa um diário novo.
+
+        Um ContactStore primeiro recebe o que outras sessões gravaram
+        (sincronizar), para a fotografia não apagar nada delas.
+        tudo_no_diario=False avisa que houve mudanças fora do diário
+        (como a importação): as outras sessões vão ler a agenda de novo.
+        """
+        with self.trava:
+            em_memoria = hasattr(contatos, "por_id")
+            if em_memoria:
+                self.sincronizar(contatos)
+            else:
+                tudo_no_diario = False  # uma lista qualquer: não dá para saber
+
+            temporario = self.arquivo + ".tmp"
+            if self.arquivo.endswith(".bin"):
+                arquivo = open(temporario, "wb")
+            else:
+                arquivo = open(temporario, "w", encoding="utf-8")
+            with arquivo:
+                if self.arquivo.endswith(".bin"):
+                    gravar_binario(arquivo, contatos)
+                elif self.arquivo.endswith(".jsonl"):
+                    escrever_linhas_json(arquivo, contatos)
+                else:
+                    escrever_lista_json(arquivo, contatos)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, self.arquivo)
+
+            # Se cair exatamente aqui, o diário antigo é reaplicado sobre a
+            # fotografia nova no próximo carregamento: sem problema, pois
+            # reaplicar uma operação não muda o resultado
+            self._comecar_diario(tudo_no_diario)
+            self.fotografia = self._assinatura_fotografia()
+            self._gravar_estatisticas(getattr(contatos, "estatisticas", None))
+            self.gravar_busca(getattr(contatos, "busca", None))
+
+    def _comecar_diario(self, guardar_anterior):
+        """Diário novo, só com a geração seguinte na primeira linha"""
+        geracao = max(self.geracao, _geracao(self.arquivo_diario)) + 1
+        cabecalho = (para_json({"op": "geracao", "geracao": geracao}) + "\n").encode("utf-8")
+        temporario = self.arquivo_diario + ".tmp"
+        with open(temporario, "wb") as diario:
+            diario.write(cabecalho)
+            diario.flush()
+            os.fsync(diario.fileno())
+
+        # O diário antigo fica guardado para as sessões que ainda não
+        # leram o final dele (veja sincronizar)
+        if guardar_anterior and os.path.exists(self.arquivo_diario):
+            os.replace(self.arquivo_diario, self.arquivo_diario_anterior)
+        elif os.path.exists(self.arquivo_diario_anterior):
+            os.remove(self.arquivo_diario_anterior)
+        os.replace(temporario, self.arquivo_diario)
+
+        self.geracao = geracao
+        self.posicao_diario = len(cabecalho)
+        self.operacoes_no_diario = 0
+
+    def gravar_busca(self, busca):
+        """
+        Grava o índice da busca aproximada ao lado da fotografia atual
+        (ou apaga o antigo, se não houver índice).
+
+        Pode ser chamado mesmo com mudanças no diário: ao abrir, elas
+        entram de novo no índice, e entradas repetidas não atrapalham.
+        Se outra sessão já trocou a fotografia, não grava nada (o índice
+        desta sessão não conhece os contatos da fotografia nova).
+        """
+        with self.trava:
+            if busca is None or not os.path.exists(self.arquivo):
+                if os.path.exists(self.arquivo_busca):
+                    os.remove(self.arquivo_busca)
+                return
+            assinatura = self._assinatura_fotografia()
+            if assinatura != self.fotografia:
+                return
+            temporario = self.arquivo_busca + ".tmp"
+            with open(temporario, "wb") as arquivo:
+                busca.gravar(arquivo, assinatura)
+            os.replace(temporario, self.arquivo_busca)
+
+    def _gravar_estatisticas(self, estatisticas):
+        """Grava as estatísticas da fotografia nova (ou apaga as antigas)"""
+        if estatisticas is None:
+            if os.path.exists(self.arquivo_estatisticas):
+                os.remove(self.arquivo_estatisticas)
+            return
+        dados = estatisticas.para_dict()
+        dados["fotografia"] = self._assinatura_fotografia()
+        temporario = self.arquivo_estatisticas + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False)
+        os.replace(temporario, self.arquivo_estatisticas)
+
+
+def converter_agenda(origem, destino):
+    """
+    Copia a agenda de um formato para outro (pela extensão):
+    .json, .jsonl ou .bin. O diário da origem entra na cópia.
+    Retorna quantos contatos foram copiados.
+    """
+    contatos = list(ArmazenamentoAgenda(origem).ler())
+    ArmazenamentoAgenda(destino).compactar(contatos)
+    return len(contatos)
+
+
+def escrever_lista_json(arquivo, contatos, linhas_por_escrita=1000):
+    """
+    Grava os contatos como uma lista JSON, um contato por linha.
+
+    Continua sendo JSON válido (json.load lê normalmente), mas é bem
+    mais rápido que json.dump(..., indent=2) e ainda dá para ler.
+    """
+    arquivo.write("[\n")
+    bloco = []
+    primeiro = True
+    for contato in contatos:
+        bloco.append(para_json(contato))
+        if len(bloco) == linhas_por_escrita:
+            arquivo.write(("" if primeiro else ",\n") + ",\n".join(bloco))
+            primeiro = False
+            bloco = []
+    if bloco:
+        arquivo.write(("" if primeiro else ",\n") + ",\n".join(bloco))
+    arquivo.write("\n]\n")
+
+
+def escrever_linhas_json(arquivo, contatos, linhas_por_escrita=1000):
+    """Grava os contatos em JSON Lines: um objeto JSON por linha"""
+    bloco = []
+    for contato in contatos:
+        bloco.append(para_json(contato) + "\n")
+        if len(bloco) == linhas_por_escrita:
+            arquivo.write("".join(bloco))
+            bloco = []
+    arquivo.write("".join(bloco))
+
+
+def ler_linhas_json(caminho):
+    """Lê um arquivo JSON Lines, entregando um objeto por vez"""
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+
+
+def ler_lista_json(caminho, tamanho_pedaco=TAMANHO_PEDACO):
+    """
+    Lê uma lista JSON ([{...}, {...}]) em pedaços, entregando cada
+    item assim que ele termina de ser lido.
+
+    raw_decode() lê UM valor JSON a partir de uma posição do texto e
+    diz onde ele terminou. Se o item ainda não chegou inteiro, dá
+    erro: lemos mais um pedaço e tentamos de novo.
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        texto = arquivo.read(tamanho_pedaco)
+        posicao = _pular_espacos(texto, 0)
+        if texto[posicao:posicao + 1] != "[":
+            raise json.JSONDecodeError("Esperava '[' no início", texto, posicao)
+        posicao += 1
+        fim_do_arquivo = False
+
+        while True:
+            posicao = _pular_espacos(texto, posicao, ",")
+            if texto[posicao:posicao + 1] == "]":
+                return
+            try:
+                item, posicao = decodificador.raw_decode(texto, posicao)
+            except json.JSONDecodeError:
+                if fim_do_arquivo:
+                    raise
+                # Item incompleto: descarta o que já foi lido e lê mais
+                pedaco = arquivo.read(tamanho_pedaco)
+                fim_do_arquivo = not pedaco
+                texto = texto[posicao:] + pedaco
+                posicao = 0
+                continue
+            yield item
+
+
+def _pular_espacos(texto, posicao, tambem=""):
+    while posicao < len(texto) and (texto[posicao].isspace() or texto[posicao] in tambem):
+        posicao += 1
+    return posicao
@@ -0,0 +1,193 @@
+# ============================================================
+# FOTOGRAFIA BINÁRIA DA AGENDA (.bin)
+# ============================================================
+# Usado por agenda_armazenamento.py quando o arquivo termina em .bin:
+#
+#   ARQUIVO_CONTATOS = "agenda_contatos.bin"
+#
+# Ler JSON é lento porque o texto é analisado caractere por
+# caractere, e cada contato vira um dicionário antes de virar um
+# Contato. Com 1 milhão de contatos a agenda leva vários segundos
+# para abrir.
+#
+# Aqui os dados são gravados "por coluna": todos os ids juntos,
+# depois todos os nomes juntos, depois todos os telefones... Cada
+# coluna de texto é UM bloco UTF-8 com os valores separados por
+# "\0", e vira uma lista com um único .split() (feito em C, rápido).
+#
+#   cabeçalho: "AGENDAB\0" + versão do formato + total de contatos
+#   bloco:     tamanho (4 bytes) + bytes
+#
+#   blocos, nesta ordem:
+#     ids          → inteiros de 8 bytes (array "q")
+#     nome, telefone, email, notas, criado_em → textos separados por \0
+#     nomes normalizados → o índice de nomes do ContactStore, pronto
+#     categorias   → as categorias diferentes, separadas por \0
+#     códigos      → para cada contato, a posição da sua categoria
+#                    (4 bytes cada, array "I")
+#
+# Valores vazios (None) são gravados como "\1". E se o próprio texto
+# tiver um "\0" ou "\1" (ex.: notas coladas de outro programa)? Ele
+# é "escapado" com o caractere "\2": "\0" → "\2" "0", "\1" → "\2" "1"
+# e o próprio "\2" → "\2" "2". Ao ler, só os valores com "\2" são
+# desfeitos: o que foi gravado volta igualzinho. Os contatos são
+# gravados em ordem de nome, junto com os nomes já normalizados:
+# ao abrir a agenda, o ContactStore recebe o índice pronto, sem
+# normalizar nem ordenar nada.
+#
+# A VERSÃO no cabeçalho permite mudar o formato no futuro sem
+# confundir arquivos antigos: quem lê confere antes de continuar.
+# ============================================================
+
+import itertools
+import re
+import struct
+import sys
+from array import array
+
+from agenda_contato import Contato
+from agenda_texto import normalizar
+
+MAGICO = b"AGENDAB\0"
+VERSAO_FORMATO = 2  # 2: "\0", "\1" e "\2" dentro dos textos são escapados
+VERSOES_LIDAS = (1, 2)  # a versão 1 (sem escape) continua abrindo
+CABECALHO = struct.Struct("<8sHI")   # mágico, versão, total de contatos
+TAMANHO = struct.Struct("<I")
+
+SEPARADOR = "\0"
+NULO = "\1"
+ESCAPE = "\2"
+CAMPOS_TEXTO = ("nome", "telefone", "email", "notas", "criado_em")
+
+_ESCAPADO = re.compile("\2(.)", re.DOTALL)
+_ORIGINAL = {"0": SEPARADOR, "1": NULO, "2": ESCAPE}
+
+
+def _texto(valor):
+    """Valor de um campo → texto seguro para guardar na coluna"""
+    if valor is None:
+        return NULO
+    if SEPARADOR in valor or NULO in valor or ESCAPE in valor:
+        valor = (valor.replace(ESCAPE, ESCAPE + "2")
+                 .replace(SEPARADOR, ESCAPE + "0")
+                 .replace(NULO, ESCAPE + "1"))
+    return valor
+
+
+def _desescapar(valor):
+    """Desfaz o _texto(): "\\2" "0" → "\\0" etc."""
+    return _ESCAPADO.sub(lambda achado: _ORIGINAL[achado.group(1)], valor)
+
+
+def _valores(bloco, total, escapado=True):
+    """Bloco de uma coluna de texto → lista de valores (None no lugar de \\1)"""
+    texto = str(bloco, "utf-8")
+    valores = texto.split(SEPARADOR) if total else []
+    if NULO in valores:
+        valores = [None if valor == NULO else valor for valor in valores]
+    # A busca por "\2" no bloco inteiro é feita em C: quase sempre não
+    # acha nada e a lista fica como está
+    if escapado and ESCAPE in texto:
+        valores = [_desescapar(valor) if valor and ESCAPE in valor else valor
+                   for valor in valores]
+    return valores
+
+
+def inteiros_de_bytes(tipo, bloco):
+    """Bloco gravado por bytes_de_inteiros() → array do tipo pedido"""
+    numeros = array(tipo)
+    numeros.frombytes(bloco)
+    if sys.byteorder == "big":  # o arquivo é sempre little-endian
+        numeros.byteswap()
+    return numeros
+
+
+def bytes_de_inteiros(numeros):
+    """array de inteiros → bytes, sempre em little-endian"""
+    if sys.byteorder == "big":
+        numeros = array(numeros.typecode, numeros)
+        numeros.byteswap()
+    return numeros.tobytes()
+
+
+def gravar_blocos(arquivo, blocos):
+    """Grava cada bloco de bytes precedido do seu tamanho"""
+    for bloco in blocos:
+        arquivo.write(TAMANHO.pack(len(bloco)))
+        arquivo.write(bloco)
+
+
+def ler_blocos(dados, posicao):
+    """Bytes gravados por gravar_blocos() (a partir de posicao) → lista de blocos"""
+    blocos = []
+    while posicao < len(dados):
+        (tamanho,) = TAMANHO.unpack_from(dados, posicao)
+        posicao += TAMANHO.size
+        blocos.append(dados[posicao:posicao + tamanho])
+        posicao += tamanho
+    return blocos
+
+
+def gravar_binario(arquivo, contatos):
+    """Grava os contatos no formato binário (arquivo aberto em modo "wb")"""
+    pares = sorted((normalizar(contato["nome"]), contato["id"], contato)
+                   for contato in contatos)
+    contatos = [contato for _, _, contato in pares]
+
+    ids = array("q")
+    colunas = {campo: [] for campo in CAMPOS_TEXTO}
+    categorias = {}
+    codigos = array("I")
+    for contato in contatos:
+        ids.append(contato["id"])
+        for campo in CAMPOS_TEXTO:
+            colunas[campo].append(_texto(contato[campo]))
+        codigos.append(categorias.setdefault(contato["categoria"], len(categorias)))
+
+    blocos = [bytes_de_inteiros(ids)]
+    blocos += [SEPARADOR.join(colunas[campo]).encode("utf-8") for campo in CAMPOS_TEXTO]
+    blocos.append(SEPARADOR.join(_texto(nome) for nome, _, _ in pares).encode("utf-8"))
+    blocos.append(SEPARADOR.join(map(_texto, categorias)).encode("utf-8"))
+    blocos.append(bytes_de_inteiros(codigos))
+
+    arquivo.write(CABECALHO.pack(MAGICO, VERSAO_FORMATO, len(contatos)))
+    gravar_blocos(arquivo, blocos)
+
+
+def ler_binario(caminho):
+    """Lê um arquivo .bin e entrega os contatos (objetos Contato)"""
+    contatos, _, _ = ler_binario_com_indice(caminho)
+    return contatos
+
+
+def ler_binario_com_indice(caminho):
+    """
+    Lê um arquivo .bin.
+
+    Retorna (contatos, ids, nomes): os contatos em ordem alfabética e,
+    na mesma ordem, seus ids e nomes normalizados (o índice pronto).
+    """
+    with open(caminho, "rb") as arquivo:
+        dados = memoryview(arquivo.read())
+
+    magico, versao, total = CABECALHO.unpack_from(dados, 0)
+    if magico != MAGICO:
+        raise ValueError(f"{caminho} não é uma fotografia binária da agenda")
+    if versao not in VERSOES_LIDAS:
+        raise ValueError(f"{caminho} usa a versão {versao} do formato "
+                         f"(esta agenda lê as versões {VERSOES_LIDAS})")
+    escapado = versao >= 2
+
+    blocos = ler_blocos(dados, CABECALHO.size)
+    ids = inteiros_de_bytes("q", blocos[0]).tolist()
+    nomes, telefones, emails, notas, criados, normalizados = [
+        _valores(bloco, total, escapado) for bloco in blocos[1:7]
+    ]
+    categorias = _valores(blocos[7], total, escapado)
+    por_contato = map(categorias.__getitem__, inteiros_de_bytes("I", blocos[8]))
+
+    # Monta cada Contato direto das colunas, sem dicionário no meio
+    contatos = itertools.starmap(
+        Contato, zip(ids, nomes, telefones, emails, por_contato, notas, criados)
+    )
+    return contatos, ids, normalizados
@@ -0,0 +1,372 @@
+# ============================================================
+# BUSCA APROXIMADA DA AGENDA: TRIGRAMAS + SOM DAS PALAVRAS
+# ============================================================
+# Usado pelo ContactStore (agenda_indice.py):
+#
+#   contatos.buscar("jose")       → "José Silva" (sem acento)
+#   contatos.buscar("jsoe silva") → "José Silva" (erro de digitação)
+#   contatos.buscar("tiago")      → "Thiago Souza" (mesmo som)
+#   contatos.buscar("9999-8888")  → quem tem esse telefone
+#
+# A busca antiga procurava o termo no nome de TODOS os contatos, um
+# por um, e só achava o texto exato.
+#
+# Aqui cada palavra do nome, do email, das notas (e os dígitos do
+# telefone) é quebrada em TRIGRAMAS: pedaços de 3 letras.
+#
+#   " jose " → " jo", "jos", "ose", "se "
+#
+# O índice guarda, para cada trigrama, a lista dos ids dos contatos
+# que o contêm. Para buscar, pegamos os trigramas do termo e
+# "votamos" nos contatos das listas MAIS RARAS (as mais curtas e as
+# que mais dizem algo). Mesmo com uma letra errada, quase todos os
+# trigramas ainda batem.
+#
+# Os mais votados são CONFERIDOS com os dados atuais do contato e
+# recebem uma nota: o nome vale mais que o email e o telefone, que
+# valem mais que as notas. Também comparamos uma "chave fonética" de
+# cada palavra do nome (Thiago → tiagu, Luíza/Luisa → luisa).
+#
+# Palavras curtas com letras trocadas ("jsoe") não têm nenhum
+# trigrama em comum com a certa ("jose"). Para elas, comparamos as
+# chaves fonéticas "apagando uma letra": jsui → jui, jsi...;
+# jusi → jui, jsi... Se sobra algo igual, as palavras são PARECIDAS.
+#
+# As listas só crescem (append): editar um contato acrescenta os
+# trigramas novos e excluir não apaga nada. Quem já não vale é
+# descartado na conferência. Quando sobra lixo demais, o índice é
+# montado de novo.
+#
+# O índice é gravado ao lado da fotografia (agenda_contatos.json.busca)
+# e lido ao abrir a agenda. Sem esse arquivo, ele é montado na
+# primeira busca.
+# ============================================================
+
+import functools
+import heapq
+import operator
+import re
+import struct
+from array import array
+from collections import Counter, defaultdict
+
+from agenda_binario import bytes_de_inteiros, gravar_blocos, inteiros_de_bytes, ler_blocos
+from agenda_texto import normalizar
+
+MAGICO = b"AGENDAI\0"
+VERSAO_INDICE = 1
+# mágico, versão, tamanho e data da fotografia, indexados, obsoletos
+CABECALHO = struct.Struct("<8sHqqQQ")
+
+# Peso de cada campo na nota final (o nome vale mais)
+PESOS = {"nome": 1.0, "email": 0.9, "telefone": 0.9, "notas": 0.7}
+CAMPOS_BUSCA = tuple(PESOS)
+
+TRIGRAMAS_POR_BUSCA = 8     # quantas listas (as mais raras) votam
+CANDIDATOS_POR_BUSCA = 500  # quantos dos mais votados são conferidos
+NOTA_MINIMA = 0.5
+LETRAS_PARECIDAS = 4        # chaves menores que isso só valem iguais
+
+_NAO_DIGITO = re.compile(r"\D")
+
+
+def _lista_de_ids():
+    return array("I")
+
+
+_SEPARADOR = re.compile(r"[\W_]+")
+
+
+@functools.lru_cache(maxsize=50_000)
+def _trigramas_palavra(palavra):
+    """'jose' → {' jo', 'jos', 'ose', 'se '}"""
+    palavra = f" {palavra} "
+    return frozenset(palavra[i:i + 3] for i in range(len(palavra) - 2))
+
+
+def _trigramas(texto):
+    """Trigramas de cada palavra do texto ('ana@gmail.com' → ana, gmail, com)"""
+    palavras = filter(None, _SEPARADOR.split(texto))
+    return frozenset().union(*map(_trigramas_palavra, palavras))
+
+
+def _campos(contato):
+    """Contato → {campo: texto normalizado}, só dos campos preenchidos"""
+    campos = {"nome": normalizar(contato["nome"])}
+    if contato["email"]:
+        campos["email"] = normalizar(contato["email"])
+    if contato["telefone"]:
+        campos["telefone"] = _NAO_DIGITO.sub("", contato["telefone"])
+    if contato["notas"]:
+        campos["notas"] = normalizar(contato["notas"])
+    return campos
+
+
+# ============================================================
+# CHAVE FONÉTICA (bem simples, pensada para nomes em português)
+# ============================================================
+# Troca grafias diferentes do mesmo som pela mesma letra. A palavra
+# já chega sem acentos e em minúsculas.
+
+_REGRAS_FONETICAS = [(re.compile(padrao), troca) for padrao, troca in [
+    (r"ph", "f"),
+    (r"[cs]h", "x"),
+    (r"lh", "l"),
+    (r"nh", "n"),
+    (r"h", ""),                  # h mudo: Thiago → Tiago
+    (r"qu(?=[ei])", "k"),
+    (r"gu(?=[ei])", "g"),
+    (r"c(?=[ei])", "s"),         # Cecília → Sesília
+    (r"[cqk]", "k"),
+    (r"z", "s"),                 # Souza → Sousa
+    (r"w", "v"),
+    (r"y", "i"),
+    (r"e", "i"),                 # Felipe → Filipi, Filipe → Filipi
+    (r"o", "u"),
+    (r"(.)\1+", r"\1"),          # letras dobradas: Rafaella → Rafaela
+]]
+
+
+@functools.lru_cache(maxsize=100_000)
+def chave_fonetica(palavra):
+    """'thiago' → 'tiagu', 'luiza' → 'luisa' (palavra já normalizada)"""
+    for padrao, troca in _REGRAS_FONETICAS:
+        palavra = padrao.sub(troca, palavra)
+    return palavra
+
+
+def _chaves_foneticas(nome):
+    return {chave_fonetica(palavra) for palavra in nome.split() if len(palavra) > 1}
+
+
+def _apagando_uma_letra(chave):
+    """'jusi' → {'usi', 'jsi', 'jui', 'jus'}"""
+    return {chave[:i] + chave[i + 1:] for i in range(len(chave))}
+
+
+# ============================================================
+# NOTA DE UM CONTATO PARA UMA BUSCA
+# ============================================================
+
+def _nota_texto(consulta, trigramas_consulta, texto):
+    """De 0 a 1: quanto do termo aparece no texto"""
+    if texto.startswith(consulta) or f" {consulta}" in texto:
+        return 1.0   # começo de alguma palavra
+    if consulta in texto:
+        return 0.9   # no meio de uma palavra
+    if not trigramas_consulta:
+        return 0.0
+    return len(trigramas_consulta & _trigramas(texto)) / len(trigramas_consulta)
+
+
+def _nota(busca, contato):
+    consulta, digitos, trigramas_consulta, trigramas_digitos, parecidas = busca
+    campos = _campos(contato)
+    melhor = 0.0
+    for campo, texto in campos.items():
+        if campo == "telefone":
+            if not digitos:
+                continue
+            nota = _nota_texto(digitos, trigramas_digitos, texto)
+        else:
+            nota = _nota_texto(consulta, trigramas_consulta, texto)
+        melhor = max(melhor, nota * PESOS[campo])
+
+    if parecidas:
+        # Quanto das palavras buscadas SOA como alguma palavra do nome:
+        # mesma chave vale 1, chave parecida (letra trocada) vale 0.8
+        chaves_nome = _chaves_foneticas(campos["nome"])
+        soma = 0.0
+        for chave, vizinhas in parecidas.items():
+            if chave in chaves_nome:
+                soma += 1.0
+            elif vizinhas & chaves_nome:
+                soma += 0.8
+        melhor = max(melhor, 0.85 * soma / len(parecidas))
+    return melhor
+
+
+# ============================================================
+# O ÍNDICE
+# ============================================================
+
+class IndiceBusca:
+    """Índice de trigramas e de chaves fonéticas para a busca aproximada"""
+
+    def __init__(self):
+        self._trigramas = defaultdict(_lista_de_ids)  # trigrama → ids
+        self._fonetico = defaultdict(_lista_de_ids)   # chave fonética → ids
+        self._vizinhas = None  # chave sem uma letra → chaves; montado na 1ª busca
+        self.indexados = 0  # quantas vezes um contato entrou no índice
+        self.obsoletos = 0  # quantas dessas entradas já não valem
+        self.mudou = True   # False logo depois de gravado ou lido do arquivo
+
+    @classmethod
+    def construir(cls, contatos):
+        """Monta o índice a partir de todos os contatos"""
+        # Listas comuns crescem mais rápido; no fim viram array("I"),
+        # que ocupa metade da memória
+        trigramas = defaultdict(list)
+        fonetico = defaultdict(list)
+        indexados = 0
+        for contato in contatos:
+            id_contato = contato["id"]
+            campos = _campos(contato)
+            for trigrama in frozenset().union(*map(_trigramas, campos.values())):
+                trigramas[trigrama].append(id_contato)
+            for chave in _chaves_foneticas(campos["nome"]):
+                fonetico[chave].append(id_contato)
+            indexados += 1
+
+        indice = cls()
+        indice.indexados = indexados
+        for listas, destino in ((trigramas, indice._trigramas), (fonetico, indice._fonetico)):
+            for chave, ids in listas.items():
+                destino[chave] = array("I", ids)
+        return indice
+
+    @property
+    def precisa_reconstruir(self):
+        """True quando mais da metade das entradas já não vale"""
+        return self.obsoletos > 1000 and self.obsoletos * 2 > self.indexados
+
+    # ---------- Mudanças (só acrescentam) ----------
+
+    def adicionar(self, contato):
+        id_contato = contato["id"]
+        campos = _campos(contato)
+        for trigrama in frozenset().union(*map(_trigramas, campos.values())):
+            self._trigramas[trigrama].append(id_contato)
+        for chave in _chaves_foneticas(campos["nome"]):
+            if self._vizinhas is not None and chave not in self._fonetico:
+                self._registrar_vizinha(chave)
+            self._fonetico[chave].append(id_contato)
+        self.indexados += 1
+        self.mudou = True
+
+    def remover(self, contato):
+        """A entrada antiga fica no índice e é descartada na conferência"""
+        self.obsoletos += 1
+        self.mudou = True
+
+    # ---------- Chaves parecidas ----------
+    # Cada chave fonética (de 4 letras ou mais) é registrada com ela
+    # mesma e com cada versão sem uma letra. Duas chaves que dividem
+    # um registro diferem em no máximo uma letra trocada, faltando
+    # ou sobrando. São poucas chaves (uma por palavra diferente dos
+    # nomes), então montar isso na primeira busca é rápido.
+
+    def _registrar_vizinha(self, chave):
+        if len(chave) < LETRAS_PARECIDAS:
+            return
+        for variante in _apagando_uma_letra(chave) | {chave}:
+            self._vizinhas[variante].add(chave)
+
+    def _chaves_parecidas(self, chave):
+        """Chaves do índice parecidas com esta (inclusive ela mesma)"""
+        if self._vizinhas is None:
+            self._vizinhas = defaultdict(set)
+            for existente in self._fonetico:
+                self._registrar_vizinha(existente)
+        parecidas = {chave}
+        if len(chave) >= LETRAS_PARECIDAS:
+            for variante in _apagando_uma_letra(chave) | {chave}:
+                parecidas.update(self._vizinhas.get(variante, ()))
+        return parecidas
+
+    # ---------- Busca ----------
+
+    def buscar(self, termo, por_id, limite=20):
+        """
+        Os `limite` contatos que mais combinam com o termo, do melhor
+        para o pior. por_id: dicionário {id: contato} com os dados atuais.
+        """
+        consulta = normalizar(termo)
+        if not consulta:
+            return []
+        digitos = _NAO_DIGITO.sub("", termo)
+        if len(digitos) < 3:
+            digitos = ""
+        trigramas_consulta = _trigramas(consulta)
+        trigramas_digitos = _trigramas(digitos) if digitos else set()
+        parecidas = {chave: self._chaves_parecidas(chave)
+                     for chave in _chaves_foneticas(consulta)}
+
+        # Votação: só as listas mais raras (as mais curtas) votam
+        listas = [self._trigramas[trigrama]
+                  for trigrama in trigramas_consulta | trigramas_digitos
+                  if trigrama in self._trigramas]
+        listas.sort(key=len)
+        votos = Counter()
+        for lista in listas[:TRIGRAMAS_POR_BUSCA]:
+            votos.update(lista)
+        for chave in set().union(*parecidas.values()):
+            if chave in self._fonetico:
+                votos.update(self._fonetico[chave])
+
+        # Conferência com os dados atuais de cada candidato
+        busca = (consulta, digitos, trigramas_consulta, trigramas_digitos, parecidas)
+        notas = []
+        for id_contato, _ in votos.most_common(CANDIDATOS_POR_BUSCA):
+            contato = por_id.get(id_contato)
+            if contato is None:
+                continue  # excluído depois de entrar no índice
+            nota = _nota(busca, contato)
+            if nota >= NOTA_MINIMA:
+                notas.append((nota, contato))
+        melhores = heapq.nlargest(limite, notas, key=operator.itemgetter(0))
+        return [contato for _, contato in melhores]
+
+    # ---------- Arquivo ----------
+    # Para cada dicionário (trigramas e fonético), três blocos: as
+    # chaves separadas por \0, o tamanho de cada lista e todas as
+    # listas de ids emendadas numa só.
+
+    def gravar(self, arquivo, assinatura):
+        """Grava o índice (arquivo aberto em "wb"); assinatura da fotografia"""
+        tamanho, modificado = assinatura
+        arquivo.write(CABECALHO.pack(MAGICO, VERSAO_INDICE, tamanho, modificado,
+                                     self.indexados, self.obsoletos))
+        blocos = []
+        for listas in (self._trigramas, self._fonetico):
+            listas = {chave: ids for chave, ids in listas.items() if "\0" not in chave}
+            todos = array("I")
+            for lista in listas.values():
+                todos.extend(lista)
+            blocos.append("\0".join(listas).encode("utf-8"))
+            blocos.append(bytes_de_inteiros(array("I", map(len, listas.values()))))
+            blocos.append(bytes_de_inteiros(todos))
+        gravar_blocos(arquivo, blocos)
+        self.mudou = False
+
+    @classmethod
+    def ler(cls, caminho, assinatura):
+        """Lê o índice gravado; None se não existe ou é de outra fotografia"""
+        try:
+            with open(caminho, "rb") as arquivo:
+                dados = memoryview(arquivo.read())
+        except OSError:
+            return None
+        if len(dados) < CABECALHO.size:
+            return None
+        magico, versao, tamanho, modificado, indexados, obsoletos = (
+            CABECALHO.unpack_from(dados, 0))
+        if (magico, versao) != (MAGICO, VERSAO_INDICE):
+            return None
+        if [tamanho, modificado] != list(assinatura):
+            return None
+
+        indice = cls()
+        indice.indexados = indexados
+        indice.obsoletos = obsoletos
+        blocos = ler_blocos(dados, CABECALHO.size)
+        for listas, (chaves, tamanhos, todos) in zip(
+                (indice._trigramas, indice._fonetico), (blocos[0:3], blocos[3:6])):
+            chaves = str(chaves, "utf-8").split("\0") if len(chaves) else []
+            todos = inteiros_de_bytes("I", todos)
+            inicio = 0
+            for chave, tamanho in zip(chaves, inteiros_de_bytes("I", tamanhos)):
+                listas[chave] = todos[inicio:inicio + tamanho]
+                inicio += tamanho
+        indice.mudou = False
+        return indice
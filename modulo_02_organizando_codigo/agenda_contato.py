@@ -0,0 +1,85 @@
+# ============================================================
+# CONTATO COMPACTO: MENOS MEMÓRIA POR CONTATO
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py):
+#
+#   contato = Contato(id=1, nome="Ana", categoria="Amigos")
+#   contato["nome"]            → "Ana"  (igual a um dicionário)
+#   contato.get("email")       → None
+#   contato.para_dict()        → {"id": 1, "nome": "Ana", ...}
+#
+# Um dicionário é flexível: aceita qualquer chave a qualquer momento.
+# Essa flexibilidade custa memória: cada contato guardado como dict
+# tem sua própria tabela de chaves (centenas de bytes), e a mesma
+# categoria "Amigos" lida do arquivo vira uma string nova em cada
+# contato.
+#
+# A classe Contato usa __slots__: os campos são fixos e ficam numa
+# estrutura enxuta, sem tabela de chaves. A categoria passa por
+# sys.intern(), que faz todos os contatos da mesma categoria
+# apontarem para UMA única string.
+#
+# Para o resto da agenda nada muda: contato["nome"], contato.get()
+# e contato["email"] = ... funcionam como antes.
+# ============================================================
+
+import sys
+
+CAMPOS = ("id", "nome", "telefone", "email", "categoria", "notas", "criado_em")
+
+
+class Contato:
+    """Um contato da agenda, com campos fixos e pouca memória"""
+
+    __slots__ = CAMPOS
+
+    def __init__(self, id=None, nome="", telefone=None, email=None,
+                 categoria="Geral", notas=None, criado_em=None):
+        self.id = id
+        self.nome = nome
+        self.telefone = telefone
+        self.email = email
+        self.categoria = sys.intern(categoria) if categoria else categoria
+        self.notas = notas
+        self.criado_em = criado_em
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Dicionário (como vem do JSON) → Contato"""
+        return cls(
+            dados.get("id"), dados.get("nome", ""), dados.get("telefone"),
+            dados.get("email"), dados.get("categoria", "Geral"),
+            dados.get("notas"), dados.get("criado_em"),
+        )
+
+    def para_dict(self):
+        """Contato → dicionário (para gravar em JSON)"""
+        return {campo: getattr(self, campo) for campo in CAMPOS}
+
+    def __repr__(self):
+        return f"<Contato {self.id}: {self.nome}>"
+
+    # ---------- Funciona como um dicionário ----------
+
+    def __getitem__(self, campo):
+        try:
+            return getattr(self, campo)
+        except AttributeError:
+            raise KeyError(campo) from None
+
+    def __setitem__(self, campo, valor):
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        if campo == "categoria" and valor:
+            valor = sys.intern(valor)
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo):
+        return campo in CAMPOS
+
+    def get(self, campo, padrao=None):
+        return getattr(self, campo) if campo in CAMPOS else padrao
+
+    def update(self, alteracoes):
+        for campo, valor in alteracoes.items():
+            self[campo] = valor
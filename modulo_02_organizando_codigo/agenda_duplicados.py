@@ -0,0 +1,299 @@
+# ============================================================
+# CONTATOS DUPLICADOS: ACHAR E JUNTAR
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py) e pela
+# importação em lote (agenda_importacao.py):
+#
+#   python 6_projeto_agenda.py duplicados            → só mostra
+#   python 6_projeto_agenda.py duplicados --fundir   → junta os certos
+#
+#   procurar_duplicados(contatos) → [(automatico, motivo, [contatos])]
+#   fundir_duplicados(contatos, sugestoes) → (grupos, removidos)
+#
+# Comparar cada contato com todos os outros dá n × n comparações:
+# com 1 milhão de contatos, 500 BILHÕES de pares. Em vez disso, cada
+# contato ganha algumas CHAVES padronizadas:
+#   - o email em minúsculas
+#   - o telefone só com dígitos, no padrão E.164 (agenda_validacao.py)
+#   - o nome "dobrado": sem acentos, minúsculas, palavras em ordem
+#     ("Silva, JOSÉ" → "jose silva")
+# e os contatos com a mesma chave caem no mesmo BLOCO (um dicionário
+# {chave: contatos}). Só os contatos de um mesmo bloco são comparados:
+# uma passada pela agenda, quase tempo linear.
+#
+# Os blocos são ligados com "union-find" (conjuntos que se juntam):
+# se A e B têm o mesmo email e B e C o mesmo telefone, A, B e C são
+# o mesmo grupo.
+#
+# Cuidado com nomes: há muitas "Ana Silva" diferentes. Por isso:
+#   - mesmo email ou telefone E mesmo nome   → duplicado certo
+#     (pode ser juntado automaticamente), a não ser que tenham dois
+#     telefones ou dois emails diferentes: aí é só uma sugestão, para
+#     nenhum deles se perder
+#   - mesmo email ou telefone, nomes diferentes → só uma sugestão
+#   - o nome sozinho também é só uma sugestão, e só liga contatos sem
+#     email e sem telefone (ou um deles ao único contato completo com
+#     aquele nome)
+#
+# Ao juntar um grupo, fica o contato MAIS ANTIGO (o menor criado_em),
+# com o id dele; campos vazios são completados pelos outros e as
+# notas de todos são mantidas. Nada é jogado fora: um telefone ou
+# email diferente do que ficou vai para as notas.
+# ============================================================
+
+import collections
+import re
+
+from agenda_texto import normalizar
+from agenda_validacao import telefone_e164
+
+_NAO_DIGITO = re.compile(r"\D")
+_PONTUACAO = re.compile(r"[^\w ]")
+
+# Separador das notas de contatos juntados
+SEPARADOR_NOTAS = " | "
+
+
+def nome_dobrado(nome):
+    """'Silva,  JOSÉ' → 'jose silva' (sem acentos, sem pontuação, palavras em ordem)"""
+    return _dobrar(normalizar(nome))
+
+
+def _dobrar(normalizado):
+    """Nome já normalizado → nome dobrado"""
+    return " ".join(sorted(_PONTUACAO.sub(" ", normalizado).split()))
+
+
+def _chave(campo, valor):
+    """Email ou telefone → forma padronizada, para comparar"""
+    if campo == "email":
+        return valor.strip().lower()
+    return telefone_e164(valor) or _NAO_DIGITO.sub("", valor)
+
+
+def chaves_do_contato(contato):
+    """
+    Chaves padronizadas [(tipo, chave)] de um contato: email e telefone;
+    o nome dobrado só para quem não tem nenhum dos dois.
+    """
+    chaves = [(campo, _chave(campo, contato[campo]))
+              for campo in ("email", "telefone") if contato[campo]]
+    if not chaves:
+        chaves.append(("nome", nome_dobrado(contato["nome"])))
+    return chaves
+
+
+def _idade(contato):
+    """Chave para ordenar do mais antigo para o mais novo (sem data = mais novo)"""
+    criado_em = contato["criado_em"] or ""
+    if len(criado_em) < 10:
+        return ("9999", contato["id"])
+    # "25/12/2024 14:30" → "20241225 14:30", que dá para comparar como texto
+    return (criado_em[6:10] + criado_em[3:5] + criado_em[0:2] + criado_em[10:],
+            contato["id"])
+
+
+class _Grupos:
+    """Union-find: cada id aponta para outro do mesmo grupo, até a "raiz" """
+
+    def __init__(self):
+        self._pai = {}
+
+    def raiz(self, id_contato):
+        pai = self._pai
+        while pai.get(id_contato, id_contato) != id_contato:
+            # Encurta o caminho pelo meio (as próximas buscas ficam curtas)
+            pai[id_contato] = pai.get(pai[id_contato], pai[id_contato])
+            id_contato = pai[id_contato]
+        return id_contato
+
+    def juntar(self, a, b):
+        raiz_a, raiz_b = self.raiz(a), self.raiz(b)
+        if raiz_a != raiz_b:
+            self._pai.setdefault(min(raiz_a, raiz_b), min(raiz_a, raiz_b))
+            self._pai[max(raiz_a, raiz_b)] = min(raiz_a, raiz_b)
+
+    def __iter__(self):
+        """Todos os ids que foram juntados com algum outro"""
+        return iter(self._pai)
+
+
+# ============================================================
+# PROCURAR
+# ============================================================
+
+def _blocos(contatos):
+    """
+    {tipo: {chave: [ids]}} só com as chaves que apareceram mais de uma
+    vez, e {nome dobrado: id} dos contatos sem email e sem telefone.
+    O id de cada chave nova fica num dicionário simples; só na
+    repetição vira uma lista (a maioria das chaves aparece uma vez só).
+    """
+    primeiros = {"email": {}, "telefone": {}, "nome": {}}
+    repetidos = {"email": {}, "telefone": {}, "nome": {}}
+    for contato in contatos:
+        id_contato = contato["id"]
+        for tipo, chave in chaves_do_contato(contato):
+            primeiro = primeiros[tipo].setdefault(chave, id_contato)
+            if primeiro != id_contato:
+                repetidos[tipo].setdefault(chave, [primeiro]).append(id_contato)
+    return repetidos, primeiros["nome"]
+
+
+def procurar_duplicados(contatos):
+    """
+    Procura contatos repetidos num ContactStore.
+
+    Retorna sugestões (automatico, motivo, grupo), com o grupo do
+    contato mais antigo para o mais novo. automatico=True quando é
+    certo que são a mesma pessoa (fundir_duplicados() só junta esses).
+    """
+    blocos, sem_dados = _blocos(contatos)
+    certos, parecidos = _Grupos(), _Grupos()
+
+    def ligar(a, b, certo):
+        parecidos.juntar(a, b)
+        if certo:
+            certos.juntar(a, b)
+
+    # Mesmo email ou telefone: certo só entre os de mesmo nome
+    for tipo in ("email", "telefone"):
+        for ids in blocos[tipo].values():
+            por_nome = {}
+            for id_contato in ids:
+                nome = nome_dobrado(contatos.por_id(id_contato)["nome"])
+                ligar(por_nome.setdefault(nome, id_contato), id_contato, True)
+            primeiro, *outros = por_nome.values()
+            for outro in outros:
+                ligar(primeiro, outro, False)
+
+    # Só o nome: contatos sem email e sem telefone
+    for ids in blocos["nome"].values():
+        for outro in ids[1:]:
+            ligar(ids[0], outro, False)
+
+    # Um contato sem email e sem telefone vai para o contato completo
+    # com o mesmo nome, se houver UM só (senão não dá para saber qual)
+    # (o índice de nomes do ContactStore já tem os nomes normalizados,
+    # em ordem: nomes iguais vêm juntos e são dobrados uma vez só)
+    completos = collections.defaultdict(set)
+    anterior = dobrado = None
+    for normalizado, id_contato in (contatos.nomes_normalizados() if sem_dados else ()):
+        if normalizado != anterior:
+            anterior, dobrado = normalizado, _dobrar(normalizado)
+        if dobrado not in sem_dados:
+            continue
+        contato = contatos.por_id(id_contato)
+        if contato["email"] or contato["telefone"]:
+            completos[dobrado].add(certos.raiz(id_contato))
+    for nome, raizes in completos.items():
+        if len(raizes) == 1:
+            ligar(raizes.pop(), sem_dados[nome], False)
+
+    # Monta os grupos: cada grupo "parecido" pode ter vários grupos certos
+    grupos = collections.defaultdict(lambda: collections.defaultdict(list))
+    for id_contato in list(parecidos):
+        grupos[parecidos.raiz(id_contato)][certos.raiz(id_contato)].append(id_contato)
+
+    sugestoes = []
+    for partes in grupos.values():
+        todos = []
+        for ids in partes.values():
+            grupo = sorted(map(contatos.por_id, ids), key=_idade)
+            todos.extend(grupo)
+            if len(grupo) > 1:
+                diferentes = _diferentes(grupo)
+                motivo = _motivo(grupo) + "".join(f", {campo}s diferentes"
+                                                  for campo in diferentes)
+                sugestoes.append((not diferentes, motivo, grupo))
+        if len(partes) > 1:
+            todos.sort(key=_idade)
+            motivo = _motivo(todos)
+            if motivo != "mesmo nome":
+                motivo += ", nomes diferentes"
+            sugestoes.append((False, motivo, todos))
+    sugestoes.sort(key=lambda sugestao: _idade(sugestao[2][0]))
+    return sugestoes
+
+
+def _motivo(grupo):
+    """'mesmo email, mesmo telefone': as chaves que se repetem no grupo"""
+    vistas = collections.Counter(chave for contato in grupo
+                                 for chave in chaves_do_contato(contato))
+    tipos = {tipo for (tipo, _), quantos in vistas.items() if quantos > 1}
+    if not tipos:
+        return "mesmo nome"
+    return ", ".join(f"mesmo {tipo}" for tipo in ("email", "telefone", "nome") if tipo in tipos)
+
+
+def _diferentes(grupo):
+    """Campos ("email", "telefone") preenchidos com valores diferentes no grupo"""
+    return [campo for campo in ("email", "telefone")
+            if len({_chave(campo, contato[campo]) for contato in grupo if contato[campo]}) > 1]
+
+
+# ============================================================
+# JUNTAR
+# ============================================================
+
+def fundir(grupo):
+    """
+    Junta um grupo de contatos repetidos (do mais antigo para o mais novo).
+
+    Fica o mais antigo, com o id e o criado_em dele. Telefone e email
+    vazios são completados pelos outros, "Geral" dá lugar à categoria
+    de outro e as notas de todos são mantidas (sem repetir). Um
+    telefone ou email diferente do que ficou não se perde: vai para
+    as notas ("outro telefone: ...").
+    Retorna (contato que fica, alterações nele, contatos que saem).
+    """
+    fica, *saem = grupo
+    alteracoes = {}
+    for campo in ("telefone", "email"):
+        if not fica[campo]:
+            valor = next((contato[campo] for contato in saem if contato[campo]), None)
+            if valor:
+                alteracoes[campo] = valor
+    if fica["categoria"] in (None, "Geral"):
+        categoria = next((contato["categoria"] for contato in saem
+                          if contato["categoria"] not in (None, "Geral")), None)
+        if categoria:
+            alteracoes["categoria"] = categoria
+
+    notas = []
+    for contato in grupo:
+        nota = (contato["notas"] or "").strip()
+        if nota and nota not in notas:
+            notas.append(nota)
+    for campo in ("telefone", "email"):
+        ficou = alteracoes.get(campo) or fica[campo]
+        guardados = {_chave(campo, ficou)} if ficou else set()
+        for contato in saem:
+            valor = contato[campo]
+            if valor and _chave(campo, valor) not in guardados:
+                guardados.add(_chave(campo, valor))
+                notas.append(f"outro {campo}: {valor}")
+    if notas and SEPARADOR_NOTAS.join(notas) != fica["notas"]:
+        alteracoes["notas"] = SEPARADOR_NOTAS.join(notas)
+    return fica, alteracoes, saem
+
+
+def fundir_duplicados(contatos, sugestoes):
+    """
+    Junta no ContactStore os grupos com automatico=True.
+    NÃO grava a agenda: quem chama salva uma vez no final.
+    Retorna (grupos juntados, contatos removidos).
+    """
+    grupos = 0
+    removidos = []
+    for automatico, _, grupo in sugestoes:
+        if not automatico:
+            continue
+        fica, alteracoes, saem = fundir(grupo)
+        if alteracoes:
+            contatos.editar(fica, alteracoes)
+        removidos.extend(saem)
+        grupos += 1
+    # Todos de uma vez: o índice de nomes é refeito uma vez só
+    contatos.remover_varios(removidos)
+    return grupos, len(removidos)
@@ -0,0 +1,169 @@
+# ============================================================
+# ESTATÍSTICAS DA AGENDA, SEMPRE EM DIA
+# ============================================================
+# Usado pelo ContactStore (agenda_indice.py) e pela tela de
+# estatísticas do projeto da agenda (6_projeto_agenda.py):
+#
+#   contatos.estatisticas.por_categoria   → {"Amigos": 120, ...}
+#   contatos.estatisticas.com_email       → 450
+#   contatos.estatisticas.top_dominios(5) → [("gmail.com", 300), ...]
+#
+# Antes, cada vez que a tela de estatísticas abria, a agenda
+# INTEIRA era percorrida três vezes (categorias, emails, telefones).
+#
+# Agora os números são atualizados a cada adição, edição e exclusão:
+# somar 1 num contador é instantâneo, e a tela só lê os números
+# prontos, tenha a agenda 10 ou 1 milhão de contatos.
+#
+# Os contadores também são gravados num arquivo ao lado da
+# fotografia (agenda_contatos.json.stats.json). Ao abrir a agenda,
+# eles são lidos de lá em vez de recontados, e só as mudanças do
+# diário são somadas por cima.
+#
+# Telefones repetidos precisam de um contador com TODOS os telefones
+# (quase um por contato): gravar e ler isso custaria o mesmo que
+# contar de novo. Esse contador é montado na primeira vez que alguém
+# pede os repetidos e, a partir daí, também é atualizado a cada mudança.
+# ============================================================
+
+import heapq
+import re
+from collections import Counter
+
+VERSAO_ESTATISTICAS = 1
+
+_NAO_DIGITO = re.compile(r"\D")
+
+
+def _telefone(contato):
+    """'(11) 99999-8888' → '11999998888' (None se não tiver telefone)"""
+    telefone = contato["telefone"]
+    return _NAO_DIGITO.sub("", telefone) if telefone else None
+
+
+def _dominio(contato):
+    """'Ana@Gmail.com' → 'gmail.com' (None se não tiver email)"""
+    email = contato["email"]
+    return email.rpartition("@")[2].lower() if email else None
+
+
+def _dia(contato):
+    """'25/12/2024 14:30' → '25/12/2024' (None se não tiver data)"""
+    criado_em = contato["criado_em"]
+    return criado_em[:10] if criado_em else None
+
+
+def _data_ordenavel(dia):
+    """'25/12/2024' → '2024/12/25', que dá para comparar como texto"""
+    return "/".join(reversed(dia.split("/")))
+
+
+def _somar(contador, chave, sinal):
+    """Soma +1 ou -1 e apaga a chave quando chega a zero"""
+    if chave is None:
+        return
+    contador[chave] += sinal
+    if contador[chave] <= 0:
+        del contador[chave]
+
+
+class EstatisticasAgenda:
+    """Contadores da agenda, atualizados a cada mudança"""
+
+    def __init__(self):
+        self.por_categoria = Counter()
+        self.com_email = 0
+        self.com_telefone = 0
+        self.por_dia = Counter()       # "25/12/2024" → contatos criados no dia
+        self.por_dominio = Counter()   # "gmail.com" → contatos com esse domínio
+        self._por_telefone = None      # montado só quando alguém pede
+        self._repetidos = set()        # telefones com 2 ou mais contatos
+
+    # ---------- Atualização ----------
+
+    def adicionar(self, contato):
+        self._contar(contato, +1)
+
+    def remover(self, contato):
+        self._contar(contato, -1)
+
+    def _contar(self, contato, sinal):
+        _somar(self.por_categoria, contato["categoria"], sinal)
+        if contato["email"]:
+            self.com_email += sinal
+        if contato["telefone"]:
+            self.com_telefone += sinal
+        _somar(self.por_dia, _dia(contato), sinal)
+        _somar(self.por_dominio, _dominio(contato), sinal)
+
+        if self._por_telefone is not None:
+            telefone = _telefone(contato)
+            _somar(self._por_telefone, telefone, sinal)
+            if self._por_telefone.get(telefone, 0) > 1:
+                self._repetidos.add(telefone)
+            else:
+                self._repetidos.discard(telefone)
+
+    def contar_todos(self, contatos):
+        """Soma muitos contatos de uma vez (Counter.update faz o laço em C)"""
+        contatos = list(contatos)
+        self.por_categoria.update(contato["categoria"] for contato in contatos)
+        self.com_email += sum(1 for contato in contatos if contato["email"])
+        self.com_telefone += sum(1 for contato in contatos if contato["telefone"])
+        self.por_dia.update(filter(None, map(_dia, contatos)))
+        self.por_dominio.update(filter(None, map(_dominio, contatos)))
+        if self._por_telefone is not None:
+            self._contar_telefones(contatos)
+
+    def _contar_telefones(self, contatos):
+        self._por_telefone.update(filter(None, map(_telefone, contatos)))
+        self._repetidos = {telefone for telefone, quantos
+                           in self._por_telefone.items() if quantos > 1}
+
+    # ---------- Consultas ----------
+
+    def top_dominios(self, quantos=5):
+        """Os domínios de email mais comuns: [("gmail.com", 300), ...]"""
+        return self.por_dominio.most_common(quantos)
+
+    def dias_recentes(self, quantos=7):
+        """Os últimos dias com contatos criados: [("25/12/2024", 4), ...]"""
+        dias = heapq.nlargest(quantos, self.por_dia, key=_data_ordenavel)
+        return [(dia, self.por_dia[dia]) for dia in dias]
+
+    def telefones_repetidos(self, contatos):
+        """
+        {telefone (só dígitos): quantos contatos têm esse telefone}
+
+        contatos: todos os contatos da agenda, usados só na primeira
+        chamada para montar o contador de telefones
+        """
+        if self._por_telefone is None:
+            self._por_telefone = Counter()
+            self._contar_telefones(contatos)
+        return {telefone: self._por_telefone[telefone] for telefone in self._repetidos}
+
+    # ---------- Arquivo ----------
+
+    def para_dict(self):
+        return {
+            "versao": VERSAO_ESTATISTICAS,
+            "por_categoria": self.por_categoria,
+            "com_email": self.com_email,
+            "com_telefone": self.com_telefone,
+            "por_dia": self.por_dia,
+            "por_dominio": self.por_dominio,
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Dicionário gravado por para_dict() → EstatisticasAgenda (ou None)"""
+        if dados.get("versao") != VERSAO_ESTATISTICAS:
+            return None
+        estatisticas = cls()
+        estatisticas.por_categoria.update(dados["por_categoria"])
+        estatisticas.com_email = dados["com_email"]
+        estatisticas.com_telefone = dados["com_telefone"]
+        estatisticas.por_dia.update(dados["por_dia"])
+        estatisticas.por_dominio.update(dados["por_dominio"])
+        return estatisticas
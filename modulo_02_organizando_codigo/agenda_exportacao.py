@@ -0,0 +1,260 @@
+# ============================================================
+# EXPORTAÇÃO DA AGENDA: TXT, CSV, VCARD E JSON LINES
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py):
+#
+#   exportar(contatos, "contatos.csv")           → formato pela extensão
+#   exportar(contatos, "contatos.vcf.gz")        → vCard comprimido (gzip)
+#   exportar(armazenamento.ler(), "todos.jsonl") → direto do arquivo
+#
+# A exportação antiga montava uma lista ordenada com TODOS os
+# contatos e fazia vários f.write() pequenos para cada um.
+#
+# Aqui os contatos passam por um "fluxo" (stream), um de cada vez:
+#   - o texto é juntado em LOTES de ~1000 contatos e gravado com
+#     um único write() por lote
+#   - se os contatos já vêm em ordem (o ContactStore sabe listar
+#     em ordem alfabética), nada é ordenado de novo
+#   - se não vêm (por exemplo, lidos direto do arquivo), usamos uma
+#     ORDENAÇÃO EXTERNA: ordena pedaços que cabem na memória, grava
+#     cada pedaço ordenado num arquivo temporário e depois junta
+#     todos com heapq.merge(), que só olha o primeiro de cada pedaço
+#   - terminando em ".gz", o arquivo sai comprimido com gzip
+#
+# Assim exportar 1 milhão de contatos usa memória limitada, seja
+# qual for o tamanho da agenda.
+# ============================================================
+
+import csv
+import gzip
+import heapq
+import io
+import itertools
+import operator
+import os
+import pickle
+import tempfile
+from datetime import datetime
+
+from agenda_armazenamento import para_json
+from agenda_contato import CAMPOS
+from agenda_texto import normalizar
+
+# Quantos contatos juntar antes de cada write()
+CONTATOS_POR_ESCRITA = 1000
+
+# Quantos contatos ordenar na memória de cada vez (ordenação externa)
+CONTATOS_POR_PEDACO = 100_000
+
+# Dentro da exportação cada contato viaja como uma tupla simples com
+# os valores dos campos, na ordem de CAMPOS: (id, nome, telefone, ...).
+# Tuplas são baratas de criar, comparar e gravar em arquivo temporário.
+_valores = operator.itemgetter(*CAMPOS)
+
+
+def _ordem(valores):
+    """Mesma ordem do ContactStore: nome sem acento, depois id"""
+    return normalizar(valores[1]), valores[0]
+
+
+# ============================================================
+# FORMATOS
+# ============================================================
+# Cada formato tem três partes: o início do arquivo, o texto de um
+# LOTE de contatos e o final do arquivo (que recebe o total).
+
+def _inicio_txt():
+    return ("=" * 50 + "\n"
+            "        AGENDA DE CONTATOS\n"
+            f"        Exportado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
+            + "=" * 50 + "\n\n")
+
+
+def _contato_txt(valores):
+    _, nome, telefone, email, categoria, notas, _ = valores
+    linhas = [f"Nome: {nome}\n"]
+    if telefone:
+        linhas.append(f"Telefone: {telefone}\n")
+    if email:
+        linhas.append(f"Email: {email}\n")
+    linhas.append(f"Categoria: {categoria or 'Geral'}\n")
+    if notas:
+        linhas.append(f"Notas: {notas}\n")
+    linhas.append("-" * 30 + "\n\n")
+    return "".join(linhas)
+
+
+def _lote_txt(lote):
+    return "".join(map(_contato_txt, lote))
+
+
+def _fim_txt(total):
+    return f"\nTotal: {total} contato(s)\n"
+
+
+def _inicio_csv():
+    return ",".join(CAMPOS) + "\n"
+
+
+def _lote_csv(lote):
+    # O módulo csv cuida das aspas e vírgulas dentro dos valores
+    texto = io.StringIO()
+    csv.writer(texto, lineterminator="\n").writerows(lote)
+    return texto.getvalue()
+
+
+def _escapar_vcard(valor):
+    return (valor.replace("\\", "\\\\").replace(",", "\\,")
+            .replace(";", "\\;").replace("\n", "\\n"))
+
+
+def _contato_vcard(valores):
+    _, nome, telefone, email, categoria, notas, _ = valores
+    nome = _escapar_vcard(nome)
+    linhas = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{nome}", f"N:{nome};;;;"]
+    if telefone:
+        linhas.append(f"TEL;TYPE=CELL:{_escapar_vcard(telefone)}")
+    if email:
+        linhas.append(f"EMAIL:{_escapar_vcard(email)}")
+    if categoria:
+        linhas.append(f"CATEGORIES:{_escapar_vcard(categoria)}")
+    if notas:
+        linhas.append(f"NOTE:{_escapar_vcard(notas)}")
+    linhas.append("END:VCARD")
+    return "\r\n".join(linhas) + "\r\n"  # o padrão vCard usa \r\n
+
+
+def _lote_vcard(lote):
+    return "".join(map(_contato_vcard, lote))
+
+
+def _lote_jsonl(lote):
+    return "".join(para_json(dict(zip(CAMPOS, valores))) + "\n" for valores in lote)
+
+
+def _nada(*_):
+    return ""
+
+
+# extensão → (início, lote, fim)
+FORMATOS = {
+    ".txt": (_inicio_txt, _lote_txt, _fim_txt),
+    ".csv": (_inicio_csv, _lote_csv, _nada),
+    ".vcf": (_nada, _lote_vcard, _nada),
+    ".jsonl": (_nada, _lote_jsonl, _nada),
+}
+
+
+def formato_do_arquivo(caminho):
+    """'contatos.vcf.gz' → '.vcf' (levanta ValueError se não conhece)"""
+    if caminho.endswith(".gz"):
+        caminho = caminho[:-3]
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: '{extensao}' "
+                         f"(use {', '.join(FORMATOS)})")
+    return extensao
+
+
+# ============================================================
+# ORDENAÇÃO EXTERNA
+# ============================================================
+
+def ordenar_externo(itens, chave, por_pedaco=CONTATOS_POR_PEDACO):
+    """
+    Entrega os itens em ordem, com no máximo `por_pedaco` deles na
+    memória ao mesmo tempo (mais um lote de cada pedaço, na junção).
+
+    Se tudo couber em um pedaço, ordena na memória e pronto.
+    """
+    itens = iter(itens)
+    primeiro = _pedaco_ordenado(itens, chave, por_pedaco)
+    if len(primeiro) < por_pedaco:
+        yield from map(operator.itemgetter(1), primeiro)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="agenda_exportacao_") as pasta:
+        pedacos = []
+        pedaco = primeiro
+        del primeiro
+        while pedaco:
+            caminho = os.path.join(pasta, f"pedaco_{len(pedacos)}.pickle")
+            _gravar_pedaco(caminho, pedaco)
+            pedacos.append(caminho)
+            del pedaco  # libera este pedaço ANTES de montar o próximo
+            pedaco = _pedaco_ordenado(itens, chave, por_pedaco)
+
+        juntos = heapq.merge(*map(_ler_pedaco, pedacos), key=operator.itemgetter(0))
+        yield from map(operator.itemgetter(1), juntos)
+
+
+def _pedaco_ordenado(itens, chave, por_pedaco):
+    """Próximos `por_pedaco` itens, como pares (chave, item) ordenados"""
+    pares = [(chave(item), item) for item in itertools.islice(itens, por_pedaco)]
+    pares.sort(key=operator.itemgetter(0))
+    return pares
+
+
+# Os pedaços temporários usam pickle: é o jeito mais rápido de guardar
+# e reler tuplas Python, e a chave já calculada vai junto. (Só leia
+# com pickle arquivos que o próprio programa gravou!)
+
+def _gravar_pedaco(caminho, pares):
+    with open(caminho, "wb") as arquivo:
+        for inicio in range(0, len(pares), CONTATOS_POR_ESCRITA):
+            pickle.dump(pares[inicio:inicio + CONTATOS_POR_ESCRITA], arquivo,
+                        pickle.HIGHEST_PROTOCOL)
+
+
+def _ler_pedaco(caminho):
+    """Relê um pedaço lote a lote (só um lote de cada pedaço na memória)"""
+    with open(caminho, "rb") as arquivo:
+        while True:
+            try:
+                lote = pickle.load(arquivo)
+            except EOFError:
+                return
+            yield from lote
+
+
+# ============================================================
+# EXPORTAR
+# ============================================================
+
+def exportar(contatos, caminho, ja_ordenados=False, por_escrita=CONTATOS_POR_ESCRITA,
+             por_pedaco=CONTATOS_POR_PEDACO):
+    """
+    Grava os contatos em `caminho`, em ordem alfabética.
+
+    O formato vem da extensão (.txt, .csv, .vcf, .jsonl), com ".gz"
+    opcional no fim para comprimir. Um ContactStore já entrega os
+    contatos em ordem; qualquer outro iterável passa pela ordenação
+    externa (ja_ordenados=True pula essa etapa).
+
+    Retorna quantos contatos foram exportados.
+    """
+    inicio, lote_em_texto, fim = FORMATOS[formato_do_arquivo(caminho)]
+
+    if hasattr(contatos, "ordenados_por_nome"):
+        contatos = contatos.ordenados_por_nome()
+        ja_ordenados = True
+    valores = map(_valores, contatos)
+    if not ja_ordenados:
+        valores = ordenar_externo(valores, _ordem, por_pedaco)
+
+    if caminho.endswith(".gz"):
+        arquivo = gzip.open(caminho, "wt", encoding="utf-8", newline="")
+    else:
+        arquivo = open(caminho, "w", encoding="utf-8", newline="")
+
+    total = 0
+    with arquivo:
+        arquivo.write(inicio())
+        while True:
+            lote = list(itertools.islice(valores, por_escrita))
+            if not lote:
+                break
+            arquivo.write(lote_em_texto(lote))  # um write() por lote
+            total += len(lote)
+        arquivo.write(fim(total))
+    return total
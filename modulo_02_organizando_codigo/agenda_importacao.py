@@ -0,0 +1,302 @@
+# ============================================================
+# IMPORTAÇÃO EM LOTE: CSV, VCARD E JSON LINES
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py):
+#
+#   python 6_projeto_agenda.py importar contatos.csv
+#   python 6_projeto_agenda.py importar contatos.vcf.gz --processos 4
+#
+#   importar(contatos, "contatos.csv", relatorio="rejeitados.csv")
+#       → (importados, rejeitados)
+#
+# Pelo menu, cada contato é digitado campo a campo e cada um é
+# salvo no arquivo na hora. Para trazer milhares de contatos de
+# outro programa, isso não serve.
+#
+# Aqui o arquivo passa em fluxo (stream), em LOTES de ~1000 registros:
+#   - cada lote é validado de uma vez (agenda_validacao.py), se
+#     quiser em vários processos ao mesmo tempo
+#   - contatos repetidos são recusados: um índice com os emails e
+#     telefones que já estão na agenda (e os já importados) responde
+#     na hora se o contato é novo, sem percorrer a agenda (quem não
+#     tem email nem telefone é comparado pelo nome)
+#   - cada recusa vai para um relatório CSV, com o motivo
+#   - os aceitos entram na agenda de UMA vez no final (o índice de
+#     nomes é ordenado uma vez só) e quem chamou grava a agenda uma
+#     vez só, em vez de uma gravação por contato
+# ============================================================
+
+import collections
+import csv
+import gzip
+import itertools
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from agenda_contato import Contato
+from agenda_duplicados import chaves_do_contato
+from agenda_validacao import validar_lote
+
+# Quantos registros validar de cada vez
+REGISTROS_POR_LOTE = 1000
+
+# Campos que a importação aproveita (o id é sempre novo)
+CAMPOS_IMPORTADOS = ("nome", "telefone", "email", "categoria", "notas", "criado_em")
+
+
+def _abrir(caminho):
+    """Abre para leitura de texto; ".gz" no fim → descomprime com gzip"""
+    # utf-8-sig ignora a marca (BOM) que o Excel põe no começo do CSV
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt", encoding="utf-8-sig", newline="")
+    return open(caminho, "r", encoding="utf-8-sig", newline="")
+
+
+def _limpar(registro):
+    """{campo: valor qualquer} → {campo: texto sem espaços nas pontas ou None}"""
+    limpo = {}
+    for campo in CAMPOS_IMPORTADOS:
+        valor = registro.get(campo)
+        if valor is not None:
+            valor = str(valor).strip() or None
+        limpo[campo] = valor
+    return limpo
+
+
+# ============================================================
+# LEITORES (um registro por vez)
+# ============================================================
+# Cada leitor entrega dicionários {campo: texto}, ou None para um
+# registro que não deu para ler (ele vai para o relatório).
+
+def ler_csv(caminho):
+    """CSV com cabeçalho (nome,telefone,email,...), como o da exportação"""
+    with _abrir(caminho) as arquivo:
+        for linha in csv.DictReader(arquivo):
+            linha = {(campo or "").strip().lower(): valor for campo, valor in linha.items()}
+            yield _limpar(linha)
+
+
+def ler_jsonl(caminho):
+    """Um objeto JSON por linha, como o da exportação"""
+    with _abrir(caminho) as arquivo:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+            except json.JSONDecodeError:
+                yield None
+                continue
+            yield _limpar(dados) if isinstance(dados, dict) else None
+
+
+_ESCAPE_VCARD = re.compile(r"\\(.)")
+
+
+def _desescapar_vcard(valor):
+    r"""'Rua A\, 10\nApto 2' → 'Rua A, 10' + quebra de linha + 'Apto 2'"""
+    return _ESCAPE_VCARD.sub(
+        lambda achado: "\n" if achado.group(1) in "nN" else achado.group(1), valor)
+
+
+# Propriedade do vCard → campo da agenda (só a primeira de cada uma vale)
+_PROPRIEDADES_VCARD = {"FN": "nome", "TEL": "telefone", "EMAIL": "email",
+                       "CATEGORIES": "categoria", "NOTE": "notas"}
+
+
+def _linhas_vcard(arquivo):
+    """Junta as linhas "dobradas" (que continuam começando com espaço)"""
+    anterior = None
+    for linha in arquivo:
+        linha = linha.rstrip("\r\n")
+        if linha[:1] in (" ", "\t") and anterior is not None:
+            anterior += linha[1:]
+            continue
+        if anterior is not None:
+            yield anterior
+        anterior = linha
+    if anterior is not None:
+        yield anterior
+
+
+def ler_vcard(caminho):
+    """Arquivo .vcf com um ou mais cartões BEGIN:VCARD ... END:VCARD"""
+    with _abrir(caminho) as arquivo:
+        cartao = None
+        for linha in _linhas_vcard(arquivo):
+            nome, _, valor = linha.partition(":")
+            # "item1.EMAIL;TYPE=work" → "EMAIL"
+            propriedade = nome.split(";")[0].rpartition(".")[2].upper()
+            if propriedade == "BEGIN":
+                cartao = {}
+            elif cartao is None:
+                continue  # linha fora de um cartão
+            elif propriedade == "END":
+                yield _limpar(cartao)
+                cartao = None
+            elif propriedade == "N":
+                # "Silva;José;;;" → "José Silva" (vale só se não houver FN)
+                sobrenome, _, resto = valor.partition(";")
+                primeiro = resto.partition(";")[0]
+                nome_completo = f"{_desescapar_vcard(primeiro)} {_desescapar_vcard(sobrenome)}"
+                cartao.setdefault("nome", nome_completo.strip())
+            elif propriedade in _PROPRIEDADES_VCARD:
+                if propriedade == "CATEGORIES":
+                    valor = re.split(r"(?<!\\),", valor)[0]
+                campo = _PROPRIEDADES_VCARD[propriedade]
+                if propriedade == "FN" or campo not in cartao:
+                    cartao[campo] = _desescapar_vcard(valor)
+
+
+# extensão → leitor
+LEITORES = {
+    ".csv": ler_csv,
+    ".vcf": ler_vcard,
+    ".jsonl": ler_jsonl,
+}
+
+
+def leitor_do_arquivo(caminho):
+    """'contatos.vcf.gz' → ler_vcard (levanta ValueError se não conhece)"""
+    nome = caminho[:-3] if caminho.endswith(".gz") else caminho
+    extensao = os.path.splitext(nome)[1].lower()
+    if extensao not in LEITORES:
+        raise ValueError(f"Formato desconhecido: '{extensao}' "
+                         f"(use {', '.join(LEITORES)})")
+    return LEITORES[extensao]
+
+
+# ============================================================
+# VALIDAÇÃO EM LOTES
+# ============================================================
+
+def _lotes(registros, por_lote):
+    registros = iter(registros)
+    while True:
+        lote = list(itertools.islice(registros, por_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def _validar_lotes(lotes, processos):
+    """
+    (lote, motivos) de cada lote, na ordem original.
+
+    Com processos > 1, os lotes são validados em paralelo. Só alguns
+    lotes ficam "em voo" ao mesmo tempo, para não ler o arquivo
+    inteiro para a memória enquanto os processos trabalham.
+    """
+    if processos <= 1:
+        for lote in lotes:
+            yield lote, validar_lote(lote)
+        return
+
+    with ProcessPoolExecutor(processos) as processos_validando:
+        em_voo = collections.deque()
+        for lote in lotes:
+            em_voo.append((lote, processos_validando.submit(validar_lote, lote)))
+            if len(em_voo) > processos * 2:
+                lote, resultado = em_voo.popleft()
+                yield lote, resultado.result()
+        while em_voo:
+            lote, resultado = em_voo.popleft()
+            yield lote, resultado.result()
+
+
+# ============================================================
+# REPETIDOS
+# ============================================================
+# O índice de repetidos é um dicionário {chave: origem}. As chaves
+# são as mesmas da procura de duplicados (agenda_duplicados.py): o
+# email em minúsculas e o telefone no padrão E.164 (assim
+# "(11) 99999-8888" e "+55 11 99999-8888" são o mesmo); para quem
+# não tem nenhum dos dois, o nome sem acentos. A origem diz onde a
+# chave apareceu antes: "a agenda" ou "o registro 12".
+
+def _indice_de_repetidos(contatos):
+    return {chave: "a agenda" for contato in contatos for chave in chaves_do_contato(contato)}
+
+
+def _repetido(indice, registro):
+    """Motivo de recusa se o email ou o telefone já apareceram, senão None"""
+    for chave in chaves_do_contato(registro):
+        origem = indice.get(chave)
+        if origem is not None:
+            return f"{chave[0]} repetido (já está n{origem})"
+    return None
+
+
+# ============================================================
+# IMPORTAR
+# ============================================================
+
+def importar(contatos, caminho, relatorio=None, processos=0,
+             por_lote=REGISTROS_POR_LOTE):
+    """
+    Importa os contatos de `caminho` (.csv, .vcf ou .jsonl, com ".gz"
+    opcional) para o ContactStore `contatos`.
+
+    Registros inválidos ou repetidos são recusados e, se `relatorio`
+    for dado, listados nesse arquivo CSV (criado só se houver recusa).
+    processos > 1 valida os lotes em paralelo.
+
+    NÃO grava a agenda: quem chama salva uma vez no final.
+    Retorna (importados, rejeitados).
+    """
+    registros = leitor_do_arquivo(caminho)(caminho)
+    repetidos = _indice_de_repetidos(contatos)
+    agora = datetime.now().strftime("%d/%m/%Y %H:%M")
+    proximo_id = contatos.proximo_id
+    aceitos = []
+    rejeitados = []  # (número do registro, motivo, registro) do lote atual
+    total_rejeitados = 0
+    numero = 0
+    arquivo_relatorio = escritor = None
+
+    try:
+        for lote, motivos in _validar_lotes(_lotes(registros, por_lote), processos):
+            for registro, motivo in zip(lote, motivos):
+                numero += 1
+                if motivo is None:
+                    motivo = _repetido(repetidos, registro)
+                if motivo is not None:
+                    rejeitados.append((numero, motivo, registro or {}))
+                    continue
+
+                for chave in chaves_do_contato(registro):
+                    repetidos[chave] = f"o registro {numero}"
+                aceitos.append(Contato(
+                    id=proximo_id,
+                    nome=registro["nome"],
+                    telefone=registro["telefone"],
+                    email=registro["email"].lower() if registro["email"] else None,
+                    categoria=(registro["categoria"] or "Geral").title(),
+                    notas=registro["notas"],
+                    criado_em=registro["criado_em"] or agora,
+                ))
+                proximo_id += 1
+
+            # O relatório é gravado lote a lote, com um writerows() por lote
+            if rejeitados and relatorio:
+                if escritor is None:
+                    arquivo_relatorio = open(relatorio, "w", encoding="utf-8", newline="")
+                    escritor = csv.writer(arquivo_relatorio)
+                    escritor.writerow(["registro", "motivo", "nome", "telefone", "email"])
+                escritor.writerows(
+                    (numero_registro, motivo, registro.get("nome"),
+                     registro.get("telefone"), registro.get("email"))
+                    for numero_registro, motivo, registro in rejeitados)
+            total_rejeitados += len(rejeitados)
+            rejeitados = []
+    finally:
+        if arquivo_relatorio is not None:
+            arquivo_relatorio.close()
+
+    # Todos de uma vez: o índice de nomes é ordenado uma vez só
+    contatos.carregar(aceitos)
+    return len(aceitos), total_rejeitados
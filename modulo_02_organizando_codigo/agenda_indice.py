@@ -0,0 +1,234 @@
+# ============================================================
+# ÍNDICES DA AGENDA: ACHAR CONTATOS SEM OLHAR UM POR UM
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py):
+#
+#   contatos = ContactStore(lista_de_contatos)
+#   contatos.por_id(7)
+#   contatos.buscar_nome("jose")     → "José Silva", "Josefa Lima"...
+#   contatos.buscar("jsoe silva")    → "José Silva" (aceita erros)
+#
+# Com uma lista simples, buscar_por_id() e buscar_por_nome()
+# percorrem TODOS os contatos, e gerar_id() calcula max() da lista
+# inteira a cada contato novo. Importar 1 milhão de contatos assim
+# faria 1 milhão de max() sobre 1 milhão de itens!
+#
+# O ContactStore guarda os mesmos contatos com três "atalhos":
+#   - um dicionário {id: contato}     → por_id() na hora
+#   - um contador com o próximo id    → sem max()
+#   - uma lista ORDENADA de nomes normalizados (sem acento e em
+#     minúsculas), com os ids ao lado: a busca por começo do nome usa bisect (busca
+#     binária, como procurar uma palavra no dicionário de papel),
+#     e a listagem em ordem alfabética não precisa de sorted()
+#   - as estatísticas (agenda_estatisticas.py), sempre em dia
+#   - o índice da busca aproximada (agenda_busca.py), montado na
+#     primeira busca (ou lido do arquivo)
+#
+# Todas as mudanças passam pelos métodos adicionar(), editar() e
+# remover(), que mantêm os atalhos em dia.
+# ============================================================
+
+import bisect
+import itertools
+import operator
+
+from agenda_busca import CAMPOS_BUSCA, IndiceBusca
+from agenda_estatisticas import EstatisticasAgenda
+from agenda_texto import normalizar
+
+
+def _em_ordem(lista):
+    """True se a lista já está em ordem crescente"""
+    return all(map(operator.le, lista, itertools.islice(lista, 1, None)))
+
+
+class ContactStore:
+    """Contatos da agenda em memória, com índice por id e por nome"""
+
+    def __init__(self, contatos=()):
+        self._por_id = {}
+        # Duas listas "paralelas": _nomes[i] é o nome normalizado do
+        # contato _ids[i]. _nomes fica sempre em ordem alfabética.
+        self._nomes = []
+        self._ids = []
+        self._proximo_id = 1
+        self.estatisticas = EstatisticasAgenda()
+        self.busca = None  # IndiceBusca, montado na primeira busca
+        self.carregar(contatos)
+
+    def carregar(self, contatos, nomes=None, ids=None, estatisticas=None):
+        """
+        Acrescenta muitos contatos de uma vez (ordena os nomes uma vez só).
+
+        nomes, ids: opcionais, os nomes já normalizados e os ids na mesma
+                    ordem dos contatos (a fotografia .bin guarda o índice pronto)
+        estatisticas: opcional, as estatísticas já contadas desses
+                      contatos (lidas do arquivo, só para um ContactStore vazio)
+        """
+        vazio = not self._por_id
+        # Cada contato entra no dicionário assim que chega: com a carga em
+        # segundo plano, len() já mostra o progresso enquanto o arquivo é lido
+        recebidos = []
+        por_id = self._por_id
+        for contato in contatos:
+            por_id[contato["id"]] = contato
+            recebidos.append(contato)
+        contatos = recebidos
+
+        if estatisticas is not None and vazio:
+            self.estatisticas = estatisticas
+        else:
+            self.estatisticas.contar_todos(contatos)
+        if self.busca is not None:
+            for contato in contatos:
+                self.busca.adicionar(contato)
+        if ids is None:
+            ids = [contato["id"] for contato in contatos]
+        if nomes is None:
+            nomes = [normalizar(contato["nome"]) for contato in contatos]
+
+        if ids:
+            self._proximo_id = max(self._proximo_id, max(ids) + 1)
+
+        if not self._nomes and _em_ordem(nomes):
+            # Índice pronto e já ordenado: só guardar
+            self._nomes = list(nomes)
+            self._ids = ids
+            return
+
+        pares = list(zip(self._nomes, self._ids))
+        pares.extend(zip(nomes, ids))
+        pares.sort()
+        self._nomes = [nome for nome, _ in pares]
+        self._ids = [id_contato for _, id_contato in pares]
+
+    # ---------- Leitura ----------
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __iter__(self):
+        """Contatos na ordem em que foram adicionados"""
+        return iter(self._por_id.values())
+
+    @property
+    def proximo_id(self):
+        """Id que o próximo contato adicionado vai receber"""
+        return self._proximo_id
+
+    def por_id(self, id_contato):
+        """Contato com esse id, ou None"""
+        return self._por_id.get(id_contato)
+
+    def ordenados_por_nome(self):
+        """Contatos em ordem alfabética (ignorando acentos e maiúsculas)"""
+        return map(self._por_id.__getitem__, self._ids)
+
+    def nomes_normalizados(self):
+        """(nome normalizado, id) de todos os contatos, em ordem alfabética"""
+        return zip(self._nomes, self._ids)
+
+    def buscar_prefixo(self, termo):
+        """Contatos cujo nome COMEÇA com o termo, em ordem alfabética"""
+        termo = normalizar(termo)
+        inicio = fim = bisect.bisect_left(self._nomes, termo)
+        while fim < len(self._nomes) and self._nomes[fim].startswith(termo):
+            fim += 1
+        return [self._por_id[id_contato] for id_contato in self._ids[inicio:fim]]
+
+    def buscar_nome(self, termo):
+        """Contatos com o termo em QUALQUER parte do nome, em ordem alfabética"""
+        termo = normalizar(termo)
+        achou = [termo in nome for nome in self._nomes]
+        return [self._por_id[id_contato]
+                for id_contato in itertools.compress(self._ids, achou)]
+
+    def buscar(self, termo, limite=20):
+        """
+        Busca aproximada no nome, email, telefone e notas: aceita erros
+        de digitação e nomes que soam igual. Os melhores primeiro.
+        """
+        if self.busca is None or self.busca.precisa_reconstruir:
+            self.busca = IndiceBusca.construir(self._por_id.values())
+        return self.busca.buscar(termo, self._por_id, limite)
+
+    def telefones_repetidos(self):
+        """{telefone (só dígitos): quantos contatos usam} dos telefones repetidos"""
+        return self.estatisticas.telefones_repetidos(self)
+
+    # ---------- Mudanças ----------
+
+    def limpar(self):
+        """Esvazia a agenda (por exemplo, depois de um erro na leitura)"""
+        self._por_id = {}
+        self._nomes = []
+        self._ids = []
+        self._proximo_id = 1
+        self.estatisticas = EstatisticasAgenda()
+        self.busca = None
+
+    def adicionar(self, contato):
+        """Adiciona um contato (se não tiver id, recebe o próximo)"""
+        if contato.get("id") is None:
+            contato["id"] = self._proximo_id
+        self._por_id[contato["id"]] = contato
+        self._guardar_nome(contato)
+        self.estatisticas.adicionar(contato)
+        if self.busca is not None:
+            self.busca.adicionar(contato)
+        self._proximo_id = max(self._proximo_id, contato["id"] + 1)
+        return contato
+
+    def editar(self, contato, alteracoes):
+        """Aplica {campo: novo_valor} no contato e atualiza os índices"""
+        if "nome" in alteracoes:
+            self._tirar_nome(contato)
+        reindexar = self.busca is not None and not alteracoes.keys().isdisjoint(CAMPOS_BUSCA)
+        self.estatisticas.remover(contato)
+        if reindexar:
+            self.busca.remover(contato)
+        contato.update(alteracoes)
+        self.estatisticas.adicionar(contato)
+        if reindexar:
+            self.busca.adicionar(contato)
+        if "nome" in alteracoes:
+            self._guardar_nome(contato)
+        return contato
+
+    def remover(self, contato):
+        """Tira o contato da agenda"""
+        self._tirar_nome(contato)
+        self.estatisticas.remover(contato)
+        if self.busca is not None:
+            self.busca.remover(contato)
+        del self._por_id[contato["id"]]
+
+    def remover_varios(self, contatos):
+        """Tira muitos contatos de uma vez (refaz o índice de nomes uma vez só)"""
+        ids = set()
+        for contato in contatos:
+            self.estatisticas.remover(contato)
+            if self.busca is not None:
+                self.busca.remover(contato)
+            del self._por_id[contato["id"]]
+            ids.add(contato["id"])
+        if ids:
+            pares = [(nome, id_contato) for nome, id_contato in zip(self._nomes, self._ids)
+                     if id_contato not in ids]
+            self._nomes = [nome for nome, _ in pares]
+            self._ids = [id_contato for _, id_contato in pares]
+
+    def _guardar_nome(self, contato):
+        nome = normalizar(contato["nome"])
+        posicao = bisect.bisect_right(self._nomes, nome)
+        self._nomes.insert(posicao, nome)
+        self._ids.insert(posicao, contato["id"])
+
+    def _tirar_nome(self, contato):
+        nome = normalizar(contato["nome"])
+        inicio = bisect.bisect_left(self._nomes, nome)
+        fim = bisect.bisect_right(self._nomes, nome, lo=inicio)
+        # Vários contatos podem ter o mesmo nome: procura pelo id
+        posicao = self._ids.index(contato["id"], inicio, fim)
+        del self._nomes[posicao]
+        del self._ids[posicao]
@@ -0,0 +1,40 @@
+# ============================================================
+# TEXTO SEM ACENTOS: "José" E "jose" SÃO A MESMA COISA
+# ============================================================
+# Usado pelos índices da agenda (agenda_indice.py, agenda_busca.py)
+# e pela fotografia binária (agenda_binario.py):
+#
+#   normalizar("  José  da SILVA") → "jose da silva"
+#
+# Quem digita numa busca nem sempre põe acentos ou maiúsculas. Por
+# isso os índices guardam os textos "normalizados": sem acento, em
+# minúsculas e com um espaço só entre as palavras.
+# ============================================================
+
+import functools
+import unicodedata
+
+
+# Letras acentuadas do português (e vizinhas) → letra sem acento.
+# str.translate() troca todas de uma vez, em C: bem mais rápido que
+# analisar letra por letra com unicodedata
+_SEM_ACENTO = str.maketrans(
+    "áàâãäåéèêëíìîïóòôõöúùûüçñýÿÁÀÂÃÄÅÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑÝ",
+    "aaaaaaeeeeiiiiooooouuuucnyyaaaaaaeeeeiiiiooooouuuucny",
+)
+
+
+@functools.lru_cache(maxsize=100_000)
+def _normalizar_palavra(palavra):
+    sem_acento = unicodedata.normalize("NFKD", palavra)
+    return "".join(c for c in sem_acento if not unicodedata.combining(c)).casefold()
+
+
+def normalizar(texto):
+    """'  José  da SILVA' → 'jose da silva' (sem acentos, minúsculas)"""
+    texto = texto.translate(_SEM_ACENTO)
+    if texto.isascii():
+        return " ".join(texto.lower().split())
+    # Sobrou algum caractere fora da tabela (ex.: "ł", "ø"): usa o
+    # unicodedata, palavra por palavra (cada palavra só uma vez, com cache)
+    return " ".join(_normalizar_palavra(palavra) for palavra in texto.split())
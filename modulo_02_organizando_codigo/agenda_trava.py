@@ -0,0 +1,141 @@
+# ============================================================
+# VÁRIAS SESSÕES NA MESMA AGENDA: TRAVA E MESCLAGEM
+# ============================================================
+# Usado pelo armazenamento da agenda (agenda_armazenamento.py):
+#
+#   trava = TravaArquivo("agenda_contatos.json.lock")
+#   with trava:
+#       ...  # só uma sessão por vez mexe nos arquivos da agenda
+#
+#   mesclar_alteracoes(como_eu_vi, como_esta_agora, {"email": "a@b.com"})
+#       → alterações a gravar + conflitos
+#
+# Quando duas agendas (dois processos) abrem o mesmo arquivo, cada
+# uma tem sua cópia dos contatos na memória. Sem cuidado, a que
+# grava por último apaga o que a outra gravou.
+#
+# A TRAVA (lock) é um aviso combinado entre os processos: antes de
+# mexer nos arquivos, cada um pede a trava ao sistema operacional,
+# que só a entrega para um de cada vez; os outros esperam. Ela fica
+# num arquivo separado (.lock) e é "consultiva" (advisory): só
+# funciona entre programas que também pedem a trava, como a agenda.
+#   - Linux/macOS: fcntl.flock()
+#   - Windows:     msvcrt.locking()
+#
+# A MESCLAGEM resolve edições feitas em cima de dados velhos: eu
+# abri o contato, outra sessão mudou o telefone enquanto eu digitava
+# o email. Comparando três versões (como eu vi, como está agora e o
+# que eu digitei), cada campo fica com quem o mudou. Se os dois
+# mudaram o MESMO campo, vale o que acabei de digitar e o conflito
+# é avisado.
+# ============================================================
+
+import threading
+
+try:
+    import fcntl  # Linux, macOS
+except ImportError:
+    fcntl = None
+    import msvcrt  # Windows
+
+
+def _travar(arquivo, esperar):
+    """Pede a trava do arquivo; False se esperar=False e ela está ocupada"""
+    try:
+        if fcntl is not None:
+            modo = fcntl.LOCK_EX if esperar else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(arquivo.fileno(), modo)
+        else:
+            arquivo.seek(0)
+            if esperar:
+                # LK_LOCK desiste depois de ~10 segundos: tenta de novo
+                while True:
+                    try:
+                        msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:  # ocupada (só acontece com esperar=False)
+        if esperar:
+            raise
+        return False
+    return True
+
+
+def _destravar(arquivo):
+    if fcntl is not None:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+    else:
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TravaArquivo:
+    """
+    Trava entre processos (arquivo .lock) e entre threads.
+
+    Pode ser usada dentro dela mesma (reentrante): um método que trava
+    pode chamar outro que também trava, sem ficar esperando por si.
+    """
+
+    def __init__(self, caminho, ao_esperar=None):
+        self.caminho = caminho
+        self.ao_esperar = ao_esperar  # chamada se outra sessão está com a trava
+        self._threads = threading.RLock()
+        self._nivel = 0
+        self._arquivo = None
+
+    def __enter__(self):
+        self._threads.acquire()
+        if self._nivel == 0:
+            try:
+                self._arquivo = open(self.caminho, "a+b")
+                if not _travar(self._arquivo, esperar=False):
+                    if self.ao_esperar is not None:
+                        self.ao_esperar()
+                    _travar(self._arquivo, esperar=True)
+            except BaseException:
+                if self._arquivo is not None:
+                    self._arquivo.close()
+                    self._arquivo = None
+                self._threads.release()
+                raise
+        self._nivel += 1
+        return self
+
+    def __exit__(self, *_):
+        self._nivel -= 1
+        if self._nivel == 0:
+            try:
+                _destravar(self._arquivo)
+            finally:
+                self._arquivo.close()
+                self._arquivo = None
+        self._threads.release()
+
+
+def mesclar_alteracoes(como_vi, atual, alteracoes):
+    """
+    Mesclagem de três versões de um contato, campo a campo.
+
+    como_vi:    o contato como estava quando o usuário começou a editar
+    atual:      o contato agora, com o que outras sessões gravaram
+    alteracoes: {campo: valor} que o usuário digitou
+
+    Campos que o usuário não mexeu ficam como estão agora (e guardam
+    as mudanças das outras sessões). Retorna (alterações a aplicar,
+    conflitos), com conflitos = [(campo, valor da outra sessão,
+    valor que vale)] para os campos que os dois mudaram.
+    """
+    aplicar = {}
+    conflitos = []
+    for campo, meu in alteracoes.items():
+        original, deles = como_vi[campo], atual[campo]
+        if deles == meu:
+            continue  # a outra sessão já gravou o mesmo valor
+        if deles != original:
+            conflitos.append((campo, deles, meu))
+        aplicar[campo] = meu
+    return aplicar, conflitos
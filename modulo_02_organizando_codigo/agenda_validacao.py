@@ -0,0 +1,215 @@
+# ============================================================
+# VALIDAÇÃO DOS DADOS DE UM CONTATO
+# ============================================================
+# Usado pelo projeto da agenda (6_projeto_agenda.py) e pela
+# importação em lote (agenda_importacao.py):
+#
+#   validar_email("ana@gmail.com")      → True
+#   validar_telefone("abc")             → False
+#   validar_telefones(["9999-8888 11", "abc"]) → [True, False]
+#   telefone_e164("(11) 99999-8888")    → "+5511999998888"
+#   email_normalizado("Ana@Gmail.COM")  → "Ana@gmail.com"
+#   validar_lote(registros)             → [None, "email inválido", ...]
+#
+# As três funções validar_...() respondem True ou False para um
+# valor digitado. Na importação, cada registro precisa de um MOTIVO
+# quando é recusado (vai para o relatório), e os registros chegam
+# aos milhões: validar_lote() confere um lote inteiro de uma vez,
+# COLUNA por coluna (todos os nomes, depois todos os telefones...).
+# Por ser uma função comum, no nível do módulo, ela também pode ser
+# enviada para outros processos (multiprocessing).
+#
+# Antes, validar_telefone() olhava o texto letra por letra num laço
+# Python, e depois percorria tudo de novo contando os dígitos. Agora
+# a regra é uma EXPRESSÃO REGULAR compilada uma vez só, no início do
+# módulo: a conferência inteira roda de uma vez, dentro do motor de
+# regex (escrito em C). O email continua com "in" e split(): eles
+# também rodam em C e, medindo, foram mais rápidos que uma regex.
+# ============================================================
+
+import re
+
+# Código do país usado quando o telefone não tem um (Brasil)
+DDI_PADRAO = "55"
+
+# Só números, espaços, parênteses, "+" e hífen, com pelo menos 8
+# dígitos (ou nada: telefone vazio é permitido). O texto chega SEM
+# espaços nas pontas (strip()): assim cada separador só pode ser de
+# um lugar da regex, e um texto inválido é recusado numa passada só,
+# sem a regex voltar atrás testando outras divisões (backtracking)
+_TELEFONE = re.compile(r"(?:[ ()+\-]*(?:[0-9][ ()+\-]*){8,})?")
+
+
+def _texto(valor):
+    """None ou texto → texto sem espaços nas pontas"""
+    return valor.strip() if valor else ""
+
+
+def _so_digitos(telefone):
+    """'(11) 9999-8888' → '1199998888' (telefone já validado)"""
+    # Cinco replace() seguidos mediram o dobro da velocidade de
+    # str.translate() ou de uma regex para telefones curtos
+    return (telefone.replace(" ", "").replace("-", "").replace("(", "")
+            .replace(")", "").replace("+", ""))
+
+
+def validar_email(email):
+    """
+    Valida formato básico de email.
+    Retorna True se válido, False se inválido.
+    """
+    email = email.strip()
+    if not email:  # Email vazio é permitido
+        return True
+    if "@" not in email:
+        return False
+    if "." not in email.split("@")[1]:
+        return False
+    return True
+
+
+def validar_telefone(telefone):
+    """
+    Valida formato básico de telefone.
+    Aceita apenas números, espaços, parênteses e hífen, com pelo
+    menos 8 dígitos (vazio é permitido).
+    """
+    return _TELEFONE.fullmatch(telefone.strip()) is not None
+
+
+def validar_nome(nome):
+    """
+    Valida o nome do contato.
+    Retorna True se válido, False se inválido.
+    """
+    nome = nome.strip()
+    if len(nome) < 2:
+        return False
+    return True
+
+
+# ============================================================
+# COLUNAS INTEIRAS DE UMA VEZ
+# ============================================================
+# Recebem uma coluna (lista de textos, None = vazio) e devolvem uma
+# lista do mesmo tamanho. Cada valor só passa por funções em C (a
+# regex, split()...), sem laço Python letra por letra.
+
+def validar_nomes(nomes):
+    return [nome is not None and len(nome.strip()) >= 2 for nome in nomes]
+
+
+def validar_telefones(telefones):
+    """Vazio é permitido, como em validar_telefone()"""
+    validar = _TELEFONE.fullmatch
+    return [telefone is None or validar(telefone.strip()) is not None for telefone in telefones]
+
+
+def validar_emails(emails):
+    """Vazio é permitido, como em validar_email()"""
+    # Aqui "in" e split() (também em C) foram mais rápidos que uma regex
+    return [email is None or not email.strip()
+            or ("@" in email and "." in email.split("@", 2)[1])
+            for email in emails]
+
+
+# ============================================================
+# FORMAS PADRONIZADAS
+# ============================================================
+# Para comparar contatos vindos de lugares diferentes: o mesmo
+# telefone escrito de vários jeitos vira um texto só.
+
+def telefone_e164(telefone, ddi=DDI_PADRAO):
+    """
+    Telefone no padrão internacional E.164: "+" e só dígitos.
+
+        "(11) 99999-8888"     → "+5511999998888"
+        "+1 (212) 555-0100"   → "+12125550100"
+        "0 11 99999-8888"     → "+5511999998888"
+
+    None se o telefone é inválido ou não tem DDD (não dá para saber
+    de que cidade é).
+    """
+    telefone = _texto(telefone)
+    if not telefone or _TELEFONE.fullmatch(telefone) is None:
+        return None
+    digitos = _so_digitos(telefone)
+
+    if telefone.startswith("+"):
+        pass  # já vem com o código do país
+    elif digitos.startswith("00"):
+        digitos = digitos[2:]  # "00" é a saída para ligação internacional
+    else:
+        digitos = digitos.lstrip("0")  # "0" de longa distância: 011 → 11
+        if digitos.startswith(ddi) and len(digitos) - len(ddi) in (10, 11):
+            pass  # "55 11 99999-8888": já tem o código do país
+        elif len(digitos) in (10, 11):
+            digitos = ddi + digitos  # DDD + número
+        else:
+            return None
+    if not 8 <= len(digitos) <= 15:  # o E.164 tem no máximo 15 dígitos
+        return None
+    return "+" + digitos
+
+
+def telefones_e164(telefones, ddi=DDI_PADRAO):
+    return [telefone_e164(telefone, ddi) for telefone in telefones]
+
+
+def email_normalizado(email):
+    """
+    "Ana@Gmail.COM" → "Ana@gmail.com": o domínio não diferencia
+    maiúsculas, então vai para minúsculas. None se vazio ou inválido.
+    """
+    email = _texto(email)
+    if not email or not validar_email(email):
+        return None
+    usuario, _, dominio = email.rpartition("@")
+    return f"{usuario}@{dominio.lower()}"
+
+
+def emails_normalizados(emails):
+    return [email_normalizado(email) for email in emails]
+
+
+# ============================================================
+# VALIDAÇÃO EM LOTE (importação)
+# ============================================================
+
+def motivo_rejeicao(registro):
+    """
+    Confere um registro {campo: texto} lido de um arquivo.
+    Retorna None se está tudo certo, ou o motivo da recusa.
+    """
+    if not validar_nome(registro.get("nome") or ""):
+        return "nome inválido"
+    if not validar_telefone(registro.get("telefone") or ""):
+        return "telefone inválido"
+    if not validar_email(registro.get("email") or ""):
+        return "email inválido"
+    return None
+
+
+def validar_lote(registros):
+    """
+    Motivo de recusa (ou None) de cada registro, na mesma ordem.
+    Um registro None (que não deu para ler do arquivo) é recusado.
+    """
+    legiveis = [registro or {} for registro in registros]
+    nomes = validar_nomes([registro.get("nome") for registro in legiveis])
+    telefones = validar_telefones([registro.get("telefone") for registro in legiveis])
+    emails = validar_emails([registro.get("email") for registro in legiveis])
+
+    motivos = []
+    for registro, nome_ok, telefone_ok, email_ok in zip(registros, nomes, telefones, emails):
+        if registro is None:
+            motivos.append("registro ilegível")
+        elif not nome_ok:
+            motivos.append("nome inválido")
+        elif not telefone_ok:
+            motivos.append("telefone inválido")
+        elif not email_ok:
+            motivos.append("email inválido")
+        else:
+            motivos.append(None)
+    return motivos
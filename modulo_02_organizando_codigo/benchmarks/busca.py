@@ -0,0 +1,92 @@
+# ============================================================
+# BENCHMARK: BUSCA POR TRECHO DO NOME x BUSCA APROXIMADA
+# ============================================================
+# Com uma agenda grande na memória, compara para vários termos:
+#
+#   trecho      → buscar_nome(): procura o termo em TODOS os nomes
+#                 (a busca que a agenda tinha; só acha o texto exato)
+#   aproximada  → buscar(): índice de trigramas + chave fonética
+#                 (acha erros de digitação e nomes que soam igual)
+#
+# Mede também o custo do índice: montar do zero, gravar e ler do
+# arquivo .busca (o que acontece ao abrir a agenda), e o tamanho
+# desse arquivo.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/busca.py
+#   python benchmarks/busca.py --contatos 200000
+# ============================================================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from agenda_busca import IndiceBusca  # noqa: E402
+from agenda_indice import ContactStore  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+# (termo, o que ele testa)
+TERMOS = [
+    ("jose", "sem acento"),
+    ("jsoe", "letras trocadas"),
+    ("tiago olivera", "letra faltando"),
+    ("thiago", "mesmo som"),
+    ("conceicao", "sobrenome raro"),
+    ("gmail", "email"),
+]
+
+
+def cronometrar(funcao, repeticoes=1):
+    """Melhor tempo (segundos) de algumas repetições"""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        segundos = time.perf_counter() - inicio
+        melhor = segundos if melhor is None else min(melhor, segundos)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca por trecho x busca aproximada")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    contatos = ContactStore(gerar_contatos(args.contatos))
+
+    s_montar, indice = cronometrar(lambda: IndiceBusca.construir(contatos))
+    contatos.busca = indice
+
+    print(f"{args.contatos} contatos\n")
+    print(f"{'termo':<15} {'testa':<16} {'trecho ms':>10} {'achou':>7}"
+          f" {'aproximada ms':>14} {'melhor resultado':<30}")
+    for termo, testa in TERMOS:
+        s_trecho, achados = cronometrar(lambda: contatos.buscar_nome(termo), args.repeticoes)
+        s_aprox, melhores = cronometrar(lambda: contatos.buscar(termo), args.repeticoes)
+        primeiro = melhores[0]["nome"] if melhores else "-"
+        print(f"{termo:<15} {testa:<16} {s_trecho * 1000:>10.1f} {len(achados):>7}"
+              f" {s_aprox * 1000:>14.1f} {primeiro:<30}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoAgenda(os.path.join(pasta, "agenda.bin"))
+        armazenamento.compactar(contatos)  # grava fotografia + .busca
+        tamanho = os.path.getsize(armazenamento.arquivo_busca) / 1024 / 1024
+        s_gravar, _ = cronometrar(lambda: armazenamento.gravar_busca(indice))
+        s_ler, _ = cronometrar(lambda: IndiceBusca.ler(
+            armazenamento.arquivo_busca, armazenamento._assinatura_fotografia()))
+
+    print(f"\nmontar o índice do zero:  {s_montar:8.2f} s  (só sem o arquivo .busca)")
+    print(f"gravar o arquivo .busca:  {s_gravar:8.2f} s  ({tamanho:.0f} MB)")
+    print(f"ler o arquivo .busca:     {s_ler:8.2f} s  (ao abrir a agenda)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# ============================================================
+# BENCHMARK: json.load() x LEITURA AOS POUCOS
+# ============================================================
+# Para uma agenda grande, compara três jeitos de ler a fotografia:
+#
+#   json.load     → lê o texto inteiro e só então monta a lista
+#   lista .json   → ler_lista_json(): pedaços de 64 KB + raw_decode
+#   linhas .jsonl → ler_linhas_json(): um contato por linha
+#
+# Mede o tempo até o PRIMEIRO contato (quando o menu já pode usar
+# alguma coisa), o tempo total e o pico de memória da leitura
+# (tracemalloc, contando os contatos sem guardá-los).
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/carga.py
+#   python benchmarks/carga.py --contatos 200000
+# ============================================================
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import (  # noqa: E402
+    ArmazenamentoAgenda, ler_linhas_json, ler_lista_json,
+)
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def ler_com_json_load(caminho):
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        yield from json.load(arquivo)
+
+
+def medir_tempo(leitor, caminho):
+    """(segundos até o primeiro contato, segundos no total)"""
+    inicio = time.perf_counter()
+    primeiro = None
+    for _ in leitor(caminho):
+        if primeiro is None:
+            primeiro = time.perf_counter() - inicio
+    return primeiro, time.perf_counter() - inicio
+
+
+def medir_memoria(leitor, caminho):
+    """Pico de memória (MB) lendo sem guardar os contatos"""
+    tracemalloc.start()
+    for _ in leitor(caminho):
+        pass
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="json.load x leitura aos poucos")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivos = {}
+        for extensao in (".json", ".jsonl"):
+            caminho = os.path.join(pasta, "agenda" + extensao)
+            ArmazenamentoAgenda(caminho).compactar(gerar_contatos(args.contatos))
+            arquivos[extensao] = caminho
+        tamanho_mb = os.path.getsize(arquivos[".json"]) / 1024 / 1024
+
+        leitores = [
+            ("json.load", ler_com_json_load, arquivos[".json"]),
+            ("lista .json", ler_lista_json, arquivos[".json"]),
+            ("linhas .jsonl", ler_linhas_json, arquivos[".jsonl"]),
+        ]
+
+        print(f"{args.contatos} contatos, arquivo de {tamanho_mb:.0f} MB\n")
+        print(f"{'leitor':<15} {'1º contato ms':>14} {'total s':>9} {'pico MB':>9}")
+        for nome, leitor, caminho in leitores:
+            primeiro, total = medir_tempo(leitor, caminho)
+            pico = medir_memoria(leitor, caminho)
+            print(f"{nome:<15} {primeiro * 1000:>14.1f} {total:>9.2f} {pico:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# ============================================================
+# BENCHMARK: DUAS SESSÕES NA MESMA AGENDA
+# ============================================================
+# Duas sessões (A e B) abrem a mesma agenda. A grava edições e B
+# precisa ficar em dia. Compara o que B pode fazer:
+#
+#   ler de novo    → carregar_em() num ContactStore novo: fotografia
+#                    inteira + diário (o jeito antes da trava)
+#   sincronizar    → sincronizar(): só o final do diário
+#   depois de uma  → sincronizar() logo depois de A compactar: final
+#   compactação      do diário anterior + diário novo
+#
+# Mede também quanto custa salvar uma edição só gravando no diário
+# (registrar) e com trava + sincronizar antes (salvar_mudanca).
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/concorrencia.py
+#   python benchmarks/concorrencia.py --contatos 200000 --edicoes 50
+# ============================================================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from agenda_contato import Contato  # noqa: E402
+from agenda_indice import ContactStore  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def editar_varios(armazenamento, contatos, edicoes, inicio=0):
+    """A muda a nota de `edicoes` contatos, um por vez"""
+    for numero in range(inicio, inicio + edicoes):
+        contato = contatos.por_id(numero % len(contatos) + 1)
+        armazenamento.salvar_mudanca(contatos, "editar", contato, {"notas": f"nota {numero}"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duas sessões na mesma agenda")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    parser.add_argument("--edicoes", type=int, default=100,
+                        help="edições de A entre duas leituras de B")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "agenda.json")
+        ArmazenamentoAgenda(arquivo).compactar(list(map(Contato.de_dict,
+                                                        gerar_contatos(args.contatos))))
+
+        sessao_a, sessao_b = ArmazenamentoAgenda(arquivo), ArmazenamentoAgenda(arquivo)
+        # Compactação só quando o benchmark pedir
+        sessao_a.compactar_a_cada = sessao_b.compactar_a_cada = float("inf")
+        contatos_a, contatos_b = ContactStore(), ContactStore()
+        sessao_a.carregar_em(contatos_a)
+        sessao_b.carregar_em(contatos_b)
+
+        print(f"{args.contatos} contatos, {args.edicoes} edições de A\n")
+
+        editar_varios(sessao_a, contatos_a, args.edicoes)
+        releitura, _ = cronometrar(
+            lambda: ArmazenamentoAgenda(arquivo).carregar_em(ContactStore()))
+        sincronizar, chegaram = cronometrar(lambda: sessao_b.sincronizar(contatos_b))
+        print(f"{'B lê a agenda de novo:':<34}{releitura * 1000:>9.1f} ms")
+        print(f"{f'B sincroniza ({chegaram} mudanças):':<34}{sincronizar * 1000:>9.1f} ms"
+              f"   ({releitura / sincronizar:.0f}x)")
+        nada, _ = cronometrar(lambda: sessao_b.sincronizar(contatos_b))
+        print(f"{'B sincroniza sem mudanças:':<34}{nada * 1000:>9.3f} ms")
+
+        editar_varios(sessao_a, contatos_a, args.edicoes, args.edicoes)
+        sessao_a.compactar(contatos_a)
+        depois, chegaram = cronometrar(lambda: sessao_b.sincronizar(contatos_b))
+        print(f"{'B sincroniza após compactação:':<34}{depois * 1000:>9.1f} ms"
+              f"   ({chegaram} mudanças, sem ler a fotografia)")
+
+        # Gravar uma edição: só o diário x trava + sincronizar + diário
+        contato = contatos_a.por_id(1)
+        so_diario, _ = cronometrar(
+            lambda: [sessao_a.registrar("editar", contato) for _ in range(args.edicoes)])
+        completo, _ = cronometrar(
+            lambda: editar_varios(sessao_a, contatos_a, args.edicoes))
+        print(f"\n{'salvar uma edição, só diário:':<34}{so_diario / args.edicoes * 1000:>9.3f} ms")
+        print(f"{'salvar uma edição, trava + sinc.:':<34}{completo / args.edicoes * 1000:>9.3f} ms")
+
+        # B em dia tem os mesmos contatos que quem lê a agenda do zero
+        sessao_b.sincronizar(contatos_b)
+        do_zero = ContactStore()
+        ArmazenamentoAgenda(arquivo).carregar_em(do_zero)
+        assert ({c["id"]: c.para_dict() for c in contatos_b}
+                == {c["id"]: c.para_dict() for c in do_zero})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# ============================================================
+# CONTATOS FALSOS PARA OS BENCHMARKS DA AGENDA
+# ============================================================
+# Gera contatos no mesmo formato do 6_projeto_agenda.py, sempre
+# iguais para a mesma semente (assim dá para comparar execuções).
+#
+#   from contatos_falsos import gerar_contatos
+#   contatos = list(gerar_contatos(500_000))
+# ============================================================
+
+import random
+from datetime import datetime, timedelta
+
+PRIMEIROS_NOMES = [
+    "Ana", "João", "José", "Maria", "Antônio", "Francisco", "Carlos", "Paulo",
+    "Pedro", "Lucas", "Luíza", "Márcia", "Sebastião", "Letícia", "Júlia",
+    "Fábio", "Cláudia", "Rafael", "Beatriz", "Gabriel", "Camila", "Tiago",
+    "Patrícia", "Rodrigo", "Fernanda", "Mônica", "Vinícius", "Débora",
+]
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho",
+    "Araújo", "Melo", "Barbosa", "Conceição", "Assunção", "Gonçalves",
+]
+CATEGORIAS = ["Geral", "Família", "Amigos", "Trabalho", "Outros"]
+DOMINIOS = ["gmail.com", "hotmail.com", "outlook.com", "yahoo.com.br", "empresa.com.br"]
+NOTAS = ["Aniversário em março", "Conheci no curso", "Cliente antigo", "Vizinho"]
+
+
+def gerar_contatos(total, semente=42, primeiro_id=1):
+    """Gera `total` contatos (dicionários) com ids a partir de primeiro_id"""
+    aleatorio = random.Random(semente)
+    inicio = datetime(2024, 1, 1)
+
+    for numero in range(total):
+        nome = (f"{aleatorio.choice(PRIMEIROS_NOMES)} {aleatorio.choice(SOBRENOMES)} "
+                f"{aleatorio.choice(SOBRENOMES)}")
+        usuario = nome.split()[0].lower() + str(aleatorio.randint(1, 99_999))
+        yield {
+            "id": primeiro_id + numero,
+            "nome": nome,
+            "telefone": (f"({aleatorio.randint(11, 99)}) 9{aleatorio.randint(1000, 9999)}-"
+                         f"{aleatorio.randint(1000, 9999)}") if aleatorio.random() < 0.9 else None,
+            "email": (f"{usuario}@{aleatorio.choice(DOMINIOS)}"
+                      if aleatorio.random() < 0.7 else None),
+            "categoria": aleatorio.choice(CATEGORIAS),
+            "notas": aleatorio.choice(NOTAS) if aleatorio.random() < 0.2 else None,
+            "criado_em": (inicio + timedelta(minutes=numero)).strftime("%d/%m/%Y %H:%M"),
+        }
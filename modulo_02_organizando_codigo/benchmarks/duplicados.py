@@ -0,0 +1,120 @@
+# ============================================================
+# BENCHMARK: TODOS OS PARES x BLOCOS POR CHAVE
+# ============================================================
+# Gera uma agenda grande e coloca cópias de alguns contatos, escritas
+# de outro jeito (nome sem acento ou "Sobrenome, Nome", telefone com
+# +55, email em maiúsculas, às vezes sem telefone ou sem email).
+# Depois compara:
+#
+#   todos os pares → cada contato comparado com todos os outros
+#                    (medido numa amostra e estimado para a agenda
+#                    inteira: o tempo cresce com n × n)
+#   blocos         → procurar_duplicados(): só os contatos com a
+#                    mesma chave são comparados
+#
+# Mostra também quantas cópias foram achadas e quanto leva juntar.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/duplicados.py
+#   python benchmarks/duplicados.py --contatos 200000 --copias 0.05
+# ============================================================
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_contato import Contato  # noqa: E402
+from agenda_duplicados import (  # noqa: E402
+    chaves_do_contato, fundir_duplicados, nome_dobrado, procurar_duplicados,
+)
+from agenda_indice import ContactStore  # noqa: E402
+from agenda_texto import normalizar  # noqa: E402
+from contatos_falsos import NOTAS, gerar_contatos  # noqa: E402
+
+
+def copia_escrita_diferente(contato, novo_id, aleatorio):
+    """O mesmo contato, digitado de novo por outra pessoa"""
+    copia = dict(contato, id=novo_id, criado_em="01/01/2026 12:00")
+    primeiro, *resto = contato["nome"].split()
+    copia["nome"] = (normalizar(contato["nome"]).upper() if aleatorio.random() < 0.5
+                     else f"{' '.join(resto)}, {primeiro}")
+    if copia["telefone"]:
+        digitos = "".join(c for c in copia["telefone"] if c.isdigit())
+        copia["telefone"] = f"+55 {digitos[:2]} {digitos[2:]}"
+    if copia["email"]:
+        copia["email"] = copia["email"].upper()
+    # Às vezes falta um dos dois (mas nunca os dois)
+    if copia["telefone"] and copia["email"] and aleatorio.random() < 0.3:
+        copia["telefone" if aleatorio.random() < 0.5 else "email"] = None
+    copia["notas"] = aleatorio.choice(NOTAS) if aleatorio.random() < 0.3 else None
+    return copia
+
+
+def duplicados_por_pares(contatos):
+    """Cada contato com todos os outros: mesma chave e mesmo nome"""
+    pares = 0
+    chaves = [(set(chaves_do_contato(contato)), nome_dobrado(contato["nome"]))
+              for contato in contatos]
+    for (chaves_a, nome_a), (chaves_b, nome_b) in itertools.combinations(chaves, 2):
+        if nome_a == nome_b and not chaves_a.isdisjoint(chaves_b):
+            pares += 1
+    return pares
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Todos os pares x blocos por chave")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    parser.add_argument("--copias", type=float, default=0.02,
+                        help="fração dos contatos que ganha uma cópia")
+    parser.add_argument("--amostra", type=int, default=3000,
+                        help="contatos comparados par a par (é lento!)")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(7)
+    originais = list(gerar_contatos(args.contatos))
+    copiados = aleatorio.sample(originais, int(args.contatos * args.copias))
+    copias = [copia_escrita_diferente(contato, args.contatos + numero + 1, aleatorio)
+              for numero, contato in enumerate(copiados)]
+    contatos = ContactStore(map(Contato.de_dict, originais + copias))
+    print(f"{len(contatos)} contatos ({len(copias)} cópias escritas de outro jeito)\n")
+
+    amostra = list(itertools.islice(contatos, args.amostra))
+    pares, _ = cronometrar(lambda: duplicados_por_pares(amostra))
+    estimado = pares * (len(contatos) / len(amostra)) ** 2
+    print(f"todos os pares, {len(amostra)} contatos:   {pares:>10.2f} s")
+    print(f"todos os pares, agenda inteira: {estimado / 60:>10.0f} min (estimado)")
+
+    blocos, sugestoes = cronometrar(lambda: procurar_duplicados(contatos))
+    print(f"blocos, agenda inteira:         {blocos:>10.2f} s")
+
+    # Quantas cópias caíram num grupo automático junto com o original?
+    grupo_de = {contato["id"]: numero
+                for numero, (automatico, _, grupo) in enumerate(sugestoes) if automatico
+                for contato in grupo}
+    achadas = sum(1 for original, copia in zip(copiados, copias)
+                  if copia["id"] in grupo_de
+                  and grupo_de.get(original["id"]) == grupo_de[copia["id"]])
+    automaticas = sum(1 for automatico, _, _ in sugestoes if automatico)
+    print(f"\nsugestões: {len(sugestoes)} ({automaticas} automáticas)")
+    print(f"cópias achadas junto do original: {achadas} de {len(copias)} "
+          f"({achadas / len(copias):.1%})")
+
+    juntar, (grupos, removidos) = cronometrar(lambda: fundir_duplicados(contatos, sugestoes))
+    print(f"juntar {grupos} grupos ({removidos} removidos):  {juntar:>6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# ============================================================
+# BENCHMARK: ESTATÍSTICAS RECONTADAS x SEMPRE EM DIA
+# ============================================================
+# Com uma agenda grande na memória, compara a tela de estatísticas:
+#
+#   recontar → três passadas pela agenda inteira a cada vez
+#              (como mostrar_estatisticas() fazia)
+#   em dia   → só lê os contadores do ContactStore
+#
+# Mede também o custo de abrir a agenda com e sem o arquivo de
+# estatísticas gravado ao lado da fotografia (.stats.json), e a
+# primeira consulta de telefones repetidos (que monta o contador).
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/estatisticas.py
+#   python benchmarks/estatisticas.py --contatos 200000
+# ============================================================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from agenda_indice import ContactStore  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def recontar(contatos):
+    """As três passadas da tela de estatísticas antiga"""
+    categorias = {}
+    for c in contatos:
+        cat = c.get("categoria", "Geral")
+        categorias[cat] = categorias.get(cat, 0) + 1
+    com_email = sum(1 for c in contatos if c.get("email"))
+    com_telefone = sum(1 for c in contatos if c.get("telefone"))
+    return categorias, com_email, com_telefone
+
+
+def ler_contadores(contatos):
+    estatisticas = contatos.estatisticas
+    return (dict(estatisticas.por_categoria), estatisticas.com_email,
+            estatisticas.com_telefone, estatisticas.top_dominios(5),
+            estatisticas.dias_recentes(7))
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def abrir(armazenamento):
+    contatos = ContactStore()
+    armazenamento.carregar_em(contatos)
+    return contatos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estatísticas recontadas x em dia")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoAgenda(os.path.join(pasta, "agenda.bin"))
+        armazenamento.compactar(gerar_contatos(args.contatos))
+
+        # Sem .stats.json (a fotografia foi gravada a partir de uma lista)
+        s_sem, contatos = cronometrar(lambda: abrir(armazenamento))
+        armazenamento.compactar(contatos)  # grava fotografia + .stats.json
+        del contatos
+        s_com, contatos = cronometrar(lambda: abrir(armazenamento))
+
+        s_recontar, antigo = cronometrar(lambda: recontar(contatos))
+        s_em_dia, novo = cronometrar(lambda: ler_contadores(contatos))
+        assert antigo == novo[:3]
+        s_primeira, repetidos = cronometrar(contatos.telefones_repetidos)
+        s_depois, _ = cronometrar(contatos.telefones_repetidos)
+
+    print(f"{args.contatos} contatos\n")
+    print(f"abrir a agenda recontando:       {s_sem:8.2f} s")
+    print(f"abrir a agenda com .stats.json:  {s_com:8.2f} s")
+    print(f"\ntela antiga (três passadas):     {s_recontar * 1000:8.1f} ms")
+    print(f"tela nova (contadores prontos):  {s_em_dia * 1000:8.3f} ms")
+    print(f"  ganho: {s_recontar / s_em_dia:.0f}x")
+    print(f"\ntelefones repetidos, 1ª vez:     {s_primeira * 1000:8.1f} ms "
+          f"({len(repetidos)} repetidos)")
+    print(f"telefones repetidos, depois:     {s_depois * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# ============================================================
+# BENCHMARK: EXPORTAÇÃO ANTIGA x EXPORTAÇÃO EM FLUXO
+# ============================================================
+# Para uma agenda grande gravada em disco, compara:
+#
+#   antiga        → lista com todos os contatos + sorted() + vários
+#                   f.write() pequenos por contato (a exportação que
+#                   a agenda tinha)
+#   fluxo .txt... → exportar() lendo direto do arquivo, com
+#                   ordenação externa e um write() por lote
+#   ContactStore  → exportar() com a agenda já na memória (os
+#                   contatos já saem em ordem, sem ordenar nada)
+#
+# Mede o tempo de cada um e o pico de memória (tracemalloc) da
+# exportação antiga e da exportação em fluxo para .txt.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/exportacao.py
+#   python benchmarks/exportacao.py --contatos 200000 --por-pedaco 50000
+# ============================================================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from agenda_exportacao import exportar  # noqa: E402
+from agenda_indice import ContactStore  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def exportar_antigo(armazenamento, nome_arquivo):
+    """A exportação de antes, lendo a agenda inteira para uma lista"""
+    contatos = list(armazenamento.ler())
+    with open(nome_arquivo, "w", encoding="utf-8") as f:
+        f.write("=" * 50 + "\n")
+        f.write("        AGENDA DE CONTATOS\n")
+        f.write(f"        Exportado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+        f.write("=" * 50 + "\n\n")
+
+        for c in sorted(contatos, key=lambda x: x["nome"]):
+            f.write(f"Nome: {c['nome']}\n")
+            if c.get("telefone"):
+                f.write(f"Telefone: {c['telefone']}\n")
+            if c.get("email"):
+                f.write(f"Email: {c['email']}\n")
+            f.write(f"Categoria: {c.get('categoria', 'Geral')}\n")
+            if c.get("notas"):
+                f.write(f"Notas: {c['notas']}\n")
+            f.write("-" * 30 + "\n\n")
+
+        f.write(f"\nTotal: {len(contatos)} contato(s)\n")
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def pico_de_memoria(funcao):
+    """Pico de memória (MB) durante a função"""
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportação antiga x em fluxo")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    parser.add_argument("--por-pedaco", type=int, default=100_000,
+                        help="contatos ordenados na memória de cada vez")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoAgenda(os.path.join(pasta, "agenda.jsonl"))
+        armazenamento.compactar(gerar_contatos(args.contatos))
+
+        def destino(nome):
+            return os.path.join(pasta, nome)
+
+        def fluxo(arquivo):
+            return lambda: exportar(armazenamento.ler(), destino(arquivo),
+                                    por_pedaco=args.por_pedaco)
+
+        # (nome, arquivo gerado, função)
+        variantes = [
+            ("antiga .txt", "antiga.txt",
+             lambda: exportar_antigo(armazenamento, destino("antiga.txt"))),
+        ]
+        for extensao in (".txt", ".csv", ".vcf", ".jsonl", ".txt.gz"):
+            variantes.append((f"fluxo {extensao}", "fluxo" + extensao, fluxo("fluxo" + extensao)))
+
+        print(f"{args.contatos} contatos, {args.por_pedaco} por pedaço\n")
+        print(f"{'exportação':<16} {'segundos':>9} {'MB gerados':>11}")
+        for nome, arquivo, funcao in variantes:
+            segundos = cronometrar(funcao)
+            tamanho = os.path.getsize(destino(arquivo)) / 1024 / 1024
+            print(f"{nome:<16} {segundos:>9.2f} {tamanho:>11.0f}")
+
+        contatos = ContactStore()
+        armazenamento.carregar_em(contatos)
+        segundos = cronometrar(lambda: exportar(contatos, destino("store.txt")))
+        print(f"{'ContactStore':<16} {segundos:>9.2f}")
+        del contatos
+
+        print("\nPico de memória da exportação .txt (tracemalloc):")
+        print(f"  antiga: {pico_de_memoria(variantes[0][2]):.0f} MB")
+        print(f"  fluxo:  {pico_de_memoria(variantes[1][2]):.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
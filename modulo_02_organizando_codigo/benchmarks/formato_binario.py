@@ -0,0 +1,80 @@
+# ============================================================
+# BENCHMARK: ABRIR A AGENDA COM .json x .jsonl x .bin
+# ============================================================
+# Grava a mesma agenda nos três formatos da fotografia e mede a
+# "partida a frio" (cold start) de cada um:
+#
+#   ler       → arquivo → lista de Contato (ArmazenamentoAgenda.carregar)
+#   pronta    → arquivo → ContactStore montado, como a agenda faz
+#               (ArmazenamentoAgenda.carregar_em)
+#
+# Também mostra o tamanho de cada arquivo e quanto leva para gravar.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/formato_binario.py
+#   python benchmarks/formato_binario.py --contatos 200000
+# ============================================================
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from agenda_contato import Contato  # noqa: E402
+from agenda_indice import ContactStore  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def cronometrar(funcao):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def carregar_store(armazenamento):
+    contatos = ContactStore()
+    armazenamento.carregar_em(contatos)
+    return contatos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partida a frio: JSON x binário")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    contatos = [Contato.de_dict(dados) for dados in gerar_contatos(args.contatos)]
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for extensao in (".json", ".jsonl", ".bin"):
+            armazenamento = ArmazenamentoAgenda(os.path.join(pasta, "agenda" + extensao))
+            s_gravar, _ = cronometrar(lambda: armazenamento.compactar(contatos))
+            s_ler, lidos = cronometrar(armazenamento.carregar)
+            assert len(lidos) == args.contatos
+            del lidos
+            s_pronta, store = cronometrar(lambda: carregar_store(armazenamento))
+            assert len(store) == args.contatos
+            del store
+            resultados[extensao] = (
+                os.path.getsize(armazenamento.arquivo) / 1024 / 1024,
+                s_gravar, s_ler, s_pronta,
+            )
+
+    print(f"{args.contatos} contatos\n")
+    print(f"{'formato':<8} {'MB':>7} {'gravar s':>9} {'ler s':>8} {'pronta s':>9} {'ganho':>7}")
+    base = resultados[".json"][3]
+    for extensao, (mb, s_gravar, s_ler, s_pronta) in resultados.items():
+        print(f"{extensao:<8} {mb:>7.0f} {s_gravar:>9.2f} {s_ler:>8.2f} {s_pronta:>9.2f} "
+              f"{base / s_pronta:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
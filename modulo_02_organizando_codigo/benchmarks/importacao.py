@@ -0,0 +1,114 @@
+# ============================================================
+# BENCHMARK: UM CONTATO POR VEZ x IMPORTAÇÃO EM LOTE
+# ============================================================
+# A partir de um arquivo CSV grande, compara:
+#
+#   um por vez → valida, adiciona e registra no diário cada contato,
+#                como a opção "Adicionar contato" do menu (com a
+#                compactação a cada 1000 mudanças)
+#   em lote    → importar() + uma única gravação no fim, validando
+#                no próprio processo ou em vários processos
+#
+# "Um por vez" reescreve a agenda inteira a cada 1000 contatos, então
+# fica cada vez mais lento: ele roda com menos contatos (--um-por-vez)
+# e a comparação é feita em contatos por segundo.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/importacao.py
+#   python benchmarks/importacao.py --contatos 200000 --processos 4
+# ============================================================
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from agenda_contato import Contato  # noqa: E402
+from agenda_exportacao import exportar  # noqa: E402
+from agenda_importacao import importar  # noqa: E402
+from agenda_indice import ContactStore  # noqa: E402
+from agenda_validacao import validar_email, validar_nome, validar_telefone  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def importar_um_por_vez(caminho, armazenamento, quantos):
+    """Como o menu: cada contato validado, adicionado e salvo na hora"""
+    contatos = ContactStore()
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        for linha in itertools.islice(csv.DictReader(arquivo), quantos):
+            if not (validar_nome(linha["nome"]) and validar_telefone(linha["telefone"])
+                    and validar_email(linha["email"])):
+                continue
+            contato = Contato(
+                id=contatos.proximo_id,
+                nome=linha["nome"],
+                telefone=linha["telefone"] or None,
+                email=linha["email"].lower() or None,
+                categoria=linha["categoria"] or "Geral",
+                notas=linha["notas"] or None,
+                criado_em=datetime.now().strftime("%d/%m/%Y %H:%M"),
+            )
+            contatos.adicionar(contato)
+            if armazenamento.registrar("adicionar", contato):
+                armazenamento.compactar(contatos)
+    return len(contatos)
+
+
+def importar_em_lote(caminho, armazenamento, processos):
+    contatos = ContactStore()
+    importados, _ = importar(contatos, caminho, processos=processos)
+    armazenamento.compactar(contatos)
+    return importados
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Um contato por vez x importação em lote")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    parser.add_argument("--um-por-vez", type=int, default=50_000,
+                        help="quantos contatos importar um por vez (é lento!)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "entrada.csv")
+        exportar(map(Contato.de_dict, gerar_contatos(args.contatos)), entrada,
+                 ja_ordenados=True)
+
+        def agenda(nome):
+            return ArmazenamentoAgenda(os.path.join(pasta, nome))
+
+        # (nome, contatos lidos, função)
+        variantes = [
+            ("um por vez", args.um_por_vez,
+             lambda: importar_um_por_vez(entrada, agenda("um.json"), args.um_por_vez)),
+            ("em lote", args.contatos,
+             lambda: importar_em_lote(entrada, agenda("lote.json"), 0)),
+            (f"em lote, {args.processos} proc.", args.contatos,
+             lambda: importar_em_lote(entrada, agenda("lote_proc.json"), args.processos)),
+        ]
+
+        print(f"arquivo com {args.contatos} contatos\n")
+        print(f"{'importação':<22} {'lidos':>9} {'aceitos':>9} {'segundos':>9} {'contatos/s':>11}")
+        for nome, lidos, funcao in variantes:
+            segundos, aceitos = cronometrar(funcao)
+            print(f"{nome:<22} {lidos:>9} {aceitos:>9} {segundos:>9.2f} "
+                  f"{lidos / segundos:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
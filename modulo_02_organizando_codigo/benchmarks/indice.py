@@ -0,0 +1,117 @@
+# ============================================================
+# BENCHMARK: LISTA SIMPLES x CONTACTSTORE
+# ============================================================
+# Mede, numa agenda com 1 milhão de contatos, as operações que a
+# agenda faz o tempo todo:
+#
+#   lista        → as funções antigas: um for por todos os contatos
+#                  (buscar_por_id, buscar_por_nome) e max() no gerar_id
+#   ContactStore → dicionário por id, contador de ids e lista
+#                  ordenada de nomes normalizados (agenda_indice.py)
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/indice.py
+#   python benchmarks/indice.py --contatos 200000 --adicoes 500
+# ============================================================
+
+import argparse
+import os
+import random
+import sys
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_indice import ContactStore  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+# ---------- As funções antigas da agenda (com lista) ----------
+
+def buscar_por_id_lista(contatos, id_contato):
+    for contato in contatos:
+        if contato["id"] == id_contato:
+            return contato
+    return None
+
+
+def buscar_por_nome_lista(contatos, termo):
+    termo = termo.lower().strip()
+    return [c for c in contatos if termo in c["nome"].lower()]
+
+
+def gerar_id_lista(contatos):
+    if len(contatos) == 0:
+        return 1
+    return max(c["id"] for c in contatos) + 1
+
+
+def cronometrar(funcao, repeticoes):
+    """Tempo médio de uma chamada, em ms"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lista simples x ContactStore")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    parser.add_argument("--adicoes", type=int, default=200, help="contatos novos adicionados")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    lista = list(gerar_contatos(args.contatos))
+    aleatorio = random.Random(7)
+    ids = [aleatorio.randint(1, args.contatos) for _ in range(args.repeticoes)]
+
+    inicio = time.perf_counter()
+    store = ContactStore(lista)
+    s_montar = time.perf_counter() - inicio
+
+    novos_lista = list(gerar_contatos(args.adicoes, semente=1))
+    novos_store = [dict(c) for c in novos_lista]
+
+    def adicionar_lista():
+        for contato in novos_lista:
+            contato["id"] = gerar_id_lista(lista)
+            lista.append(contato)
+
+    def adicionar_store():
+        for contato in novos_store:
+            contato["id"] = None
+            store.adicionar(contato)
+
+    medidas = [
+        ("buscar por id", lambda: buscar_por_id_lista(lista, ids[0]),
+         lambda: store.por_id(ids[0])),
+        ("buscar 'jose' no nome", lambda: buscar_por_nome_lista(lista, "jose"),
+         lambda: store.buscar_nome("jose")),
+        ("nome começa com 'jose s'", lambda: buscar_por_nome_lista(lista, "jose s"),
+         lambda: store.buscar_prefixo("jose s")),
+        ("listar em ordem de nome", lambda: sorted(lista, key=lambda c: c["nome"]),
+         lambda: list(store.ordenados_por_nome())),
+    ]
+
+    print(f"{args.contatos} contatos (ContactStore montado em {s_montar:.2f}s)\n")
+    print(f"{'operação':<28} {'lista ms':>12} {'store ms':>12} {'ganho':>9}")
+    for nome, com_lista, com_store in medidas:
+        ms_lista = cronometrar(com_lista, args.repeticoes)
+        ms_store = cronometrar(com_store, args.repeticoes)
+        print(f"{nome:<28} {ms_lista:>12.3f} {ms_store:>12.3f} "
+              f"{ms_lista / max(ms_store, 0.0001):>8.0f}x")
+
+    ms_lista = cronometrar(adicionar_lista, 1)
+    ms_store = cronometrar(adicionar_store, 1)
+    print(f"{f'adicionar {args.adicoes} contatos':<28} {ms_lista:>12.3f} {ms_store:>12.3f} "
+          f"{ms_lista / max(ms_store, 0.0001):>8.0f}x")
+
+    # Note: "jose" na lista antiga NÃO acha "José"; no ContactStore acha
+    print(f"\n'jose' encontrou: lista={len(buscar_por_nome_lista(lista, 'jose'))}, "
+          f"store={len(store.buscar_nome('jose'))}")
+
+
+if __name__ == "__main__":
+    main()
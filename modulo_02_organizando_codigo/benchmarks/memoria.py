@@ -0,0 +1,67 @@
+# ============================================================
+# BENCHMARK: BYTES POR CONTATO (dict x Contato)
+# ============================================================
+# Lê a mesma fotografia de duas formas e mede, com tracemalloc,
+# quanta memória cada contato ocupa depois de carregado:
+#
+#   dict    → como a agenda guardava antes (o que o JSON devolve)
+#   Contato → classe com __slots__ e categoria "internada"
+#             (agenda_contato.py)
+#
+# Os contatos são lidos do arquivo, como na agenda de verdade:
+# assim cada texto é uma string nova, e a economia das categorias
+# repetidas aparece.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/memoria.py
+#   python benchmarks/memoria.py --contatos 100000
+# ============================================================
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda, ler_linhas_json  # noqa: E402
+from agenda_contato import Contato  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def bytes_por_contato(caminho, converter, total):
+    """Memória ocupada pelos contatos carregados, dividida pelo total"""
+    gc.collect()
+    tracemalloc.start()
+    contatos = [converter(dados) for dados in ler_linhas_json(caminho)]
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(contatos) == total
+    return memoria / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por contato: dict x Contato")
+    parser.add_argument("--contatos", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "agenda.jsonl")
+        ArmazenamentoAgenda(caminho).compactar(gerar_contatos(args.contatos))
+
+        com_dict = bytes_por_contato(caminho, lambda dados: dados, args.contatos)
+        com_contato = bytes_por_contato(caminho, Contato.de_dict, args.contatos)
+
+    print(f"{args.contatos} contatos\n")
+    print(f"dict:    {com_dict:>7.0f} bytes/contato  ({com_dict * args.contatos / 1024**2:.0f} MB)")
+    print(f"Contato: {com_contato:>7.0f} bytes/contato  "
+          f"({com_contato * args.contatos / 1024**2:.0f} MB)")
+    print(f"Economia: {1 - com_contato / com_dict:.0%}")
+
+
+if __name__ == "__main__":
+    main()
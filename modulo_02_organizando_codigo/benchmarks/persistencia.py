@@ -0,0 +1,78 @@
+# ============================================================
+# BENCHMARK: REESCREVER O JSON x DIÁRIO DE OPERAÇÕES
+# ============================================================
+# Compara o custo de salvar UMA edição numa agenda grande:
+#
+#   antigo → json.dump(todos os contatos, indent=2) a cada mudança
+#   diário → ArmazenamentoAgenda.registrar(): uma linha no .log
+#
+# E mostra quanto custam a compactação e o carregamento
+# (fotografia + diário reaplicado).
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/persistencia.py
+#   python benchmarks/persistencia.py --contatos 100000 --edicoes 50
+# ============================================================
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_armazenamento import ArmazenamentoAgenda  # noqa: E402
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Salvar a agenda: JSON inteiro x diário")
+    parser.add_argument("--contatos", type=int, default=500_000)
+    parser.add_argument("--edicoes", type=int, default=20, help="edições medidas em cada modo")
+    args = parser.parse_args()
+
+    contatos = list(gerar_contatos(args.contatos))
+    aleatorio = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Antigo: reescreve o arquivo inteiro a cada edição
+        antigo = os.path.join(pasta, "antigo.json")
+        inicio = time.perf_counter()
+        for _ in range(args.edicoes):
+            aleatorio.choice(contatos)["notas"] = "Editado"
+            with open(antigo, "w", encoding="utf-8") as arquivo:
+                json.dump(contatos, arquivo, indent=2, ensure_ascii=False)
+        ms_antigo = (time.perf_counter() - inicio) / args.edicoes * 1000
+
+        # Novo: uma linha no diário por edição
+        armazenamento = ArmazenamentoAgenda(os.path.join(pasta, "agenda.json"))
+        inicio = time.perf_counter()
+        armazenamento.compactar(contatos)
+        s_compactar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(args.edicoes):
+            contato = aleatorio.choice(contatos)
+            contato["notas"] = "Editado de novo"
+            armazenamento.registrar("editar", contato)
+        ms_diario = (time.perf_counter() - inicio) / args.edicoes * 1000
+
+        inicio = time.perf_counter()
+        carregados = armazenamento.carregar()
+        s_carregar = time.perf_counter() - inicio
+        assert len(carregados) == len(contatos)
+
+    print(f"{args.contatos} contatos, {args.edicoes} edições\n")
+    print(f"Salvar uma edição (JSON inteiro, indent=2): {ms_antigo:>10.1f} ms")
+    print(f"Salvar uma edição (linha no diário + fsync): {ms_diario:>9.3f} ms")
+    print(f"Compactar (fotografia nova, atômica):       {s_compactar:>10.2f} s")
+    print(f"Carregar (fotografia + diário):             {s_carregar:>10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# ============================================================
+# BENCHMARK: VALIDAÇÃO ANTIGA x VALIDAÇÃO POR COLUNAS
+# ============================================================
+# Com colunas de telefones e emails de uma agenda grande (mais alguns
+# valores inválidos), compara:
+#
+#   antiga   → validar_telefone()/validar_email() de antes: laço
+#              Python letra por letra e split() repetidos
+#   um a um  → as funções de agora (telefone com regex compilada),
+#              chamadas uma vez por valor
+#   coluna   → validar_telefones()/validar_emails(): a coluna inteira
+#
+# Mede também validar_lote() (por registro x por coluna) e quanto
+# custa padronizar os telefones (E.164) e os emails.
+#
+# Uso (dentro de modulo_02_organizando_codigo):
+#   python benchmarks/validacao.py
+#   python benchmarks/validacao.py --valores 200000
+# ============================================================
+
+import argparse
+import os
+import sys
+import time
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_BENCHMARKS))
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from agenda_validacao import (  # noqa: E402
+    emails_normalizados, telefones_e164, validar_email, validar_emails, validar_lote,
+    validar_nome, validar_telefone, validar_telefones,
+)
+from contatos_falsos import gerar_contatos  # noqa: E402
+
+INVALIDOS = ["abc", "12-34", "ana.gmail.com", "ana@gmail", "(11) 9999-888x", "@."]
+
+
+# ---------- Como era antes ----------
+
+def validar_email_antigo(email):
+    email = email.strip()
+    if not email:
+        return True
+    if "@" not in email:
+        return False
+    if "." not in email.split("@")[1]:
+        return False
+    return True
+
+
+def validar_telefone_antigo(telefone):
+    telefone = telefone.strip()
+    if not telefone:
+        return True
+    caracteres_validos = "0123456789 ()-+"
+    for char in telefone:
+        if char not in caracteres_validos:
+            return False
+    digitos = sum(1 for c in telefone if c.isdigit())
+    return digitos >= 8
+
+
+def validar_lote_antigo(registros):
+    """Um registro por vez, com as funções antigas"""
+    motivos = []
+    for registro in registros:
+        if not validar_nome(registro["nome"] or ""):
+            motivos.append("nome inválido")
+        elif not validar_telefone_antigo(registro["telefone"] or ""):
+            motivos.append("telefone inválido")
+        elif not validar_email_antigo(registro["email"] or ""):
+            motivos.append("email inválido")
+        else:
+            motivos.append(None)
+    return motivos
+
+
+def cronometrar(funcao, repeticoes):
+    """Melhor tempo (segundos) de algumas repetições"""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        segundos = time.perf_counter() - inicio
+        melhor = segundos if melhor is None else min(melhor, segundos)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validação antiga x por colunas")
+    parser.add_argument("--valores", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    registros = [{campo: contato[campo] for campo in ("nome", "telefone", "email")}
+                 for contato in gerar_contatos(args.valores)]
+    for numero, registro in enumerate(registros[::50]):
+        registro["telefone" if numero % 2 else "email"] = INVALIDOS[numero % len(INVALIDOS)]
+    telefones = [registro["telefone"] or "" for registro in registros]
+    emails = [registro["email"] or "" for registro in registros]
+
+    def medir(nome, funcao, base=None):
+        segundos, resultado = cronometrar(funcao, args.repeticoes)
+        ganho = f"{base / segundos:6.1f}x" if base else ""
+        print(f"{nome:<30} {segundos * 1000:>9.0f} ms {ganho}")
+        return segundos, resultado
+
+    print(f"{args.valores} valores, melhor de {args.repeticoes}\n")
+    for coluna, antiga, uma, inteira in (
+            ("telefones", validar_telefone_antigo, validar_telefone, validar_telefones),
+            ("emails", validar_email_antigo, validar_email, validar_emails)):
+        valores = telefones if coluna == "telefones" else emails
+        print(f"-- {coluna} --")
+        base, esperado = medir("antiga", lambda: list(map(antiga, valores)))
+        _, um_a_um = medir("nova, um a um", lambda: list(map(uma, valores)), base)
+        _, coluna_inteira = medir("nova, coluna inteira", lambda: inteira(valores), base)
+        assert esperado == um_a_um == coluna_inteira
+        print()
+
+    print("-- validar_lote (nome, telefone, email) --")
+    base, esperado = medir("antiga, registro por registro",
+                           lambda: validar_lote_antigo(registros))
+    _, novo = medir("coluna por coluna", lambda: validar_lote(registros), base)
+    assert esperado == novo
+
+    print("\n-- padronizar --")
+    medir("telefones → E.164", lambda: telefones_e164(telefones))
+    medir("emails → domínio minúsculo", lambda: emails_normalizados(emails))
+
+
+if __name__ == "__main__":
+    main()
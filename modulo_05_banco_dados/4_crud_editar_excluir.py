@@ -20,11 +20,20 @@
 from flask import Flask, render_template, request, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from configuracao_sqlite import aplicar_perfil_sqlite
+from instrumentacao import instrumentar
 
 app = Flask(__name__)
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///blog_crud.db"
 db = SQLAlchemy(app)
 
+# SQLite ajustado para servidor (WAL, cache, mmap...): veja configuracao_sqlite.py
+app.config["SQLITE_PERFIL"] = "producao"
+aplicar_perfil_sqlite(app, db)
+
+# Conta consultas SQL por requisição (Server-Timing e /metrics): veja instrumentacao.py
+instrumentar(app, db)
+
 
 # ============================================================
 # MODELO (mesmo da lição 5.3)
@@ -23,14 +23,33 @@
 # O banco sabe que "SP" = "São Paulo" pela tabela de cidades.
 # ============================================================
 
+import os
 from flask import Flask, render_template, request, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from carregamento import com_categoria
+from configuracao_sqlite import aplicar_perfil_sqlite
+from instrumentacao import instrumentar
+from migracoes import aplicar_migracoes
 
 app = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///blog_categorias.db"
+# BLOG_CATEGORIAS_DATABASE_URI permite usar outro banco (ex.: nos testes)
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
+    "BLOG_CATEGORIAS_DATABASE_URI", "sqlite:///blog_categorias.db"
+)
 db = SQLAlchemy(app)
 
+# SQLite ajustado para servidor (WAL, cache, mmap...): veja configuracao_sqlite.py
+app.config["SQLITE_PERFIL"] = "producao"
+aplicar_perfil_sqlite(app, db)
+
+# Conta consultas SQL por requisição (Server-Timing e /metrics): veja instrumentacao.py
+instrumentar(app, db)
+
+# Como carregar post.categoria nas listagens: "joined", "selectin" ou "lazy"
+# (evita uma consulta por post: veja carregamento.py)
+app.config["CARREGAR_CATEGORIA"] = "joined"
+
 
 # ============================================================
 # MODELO: CATEGORIA
@@ -69,6 +88,15 @@ class Post(db.Model):
     # CHAVE ESTRANGEIRA: conecta o post a uma categoria
     categoria_id = db.Column(db.Integer, db.ForeignKey("categoria.id"))
 
+    # ÍNDICES: o "sumário" que evita ler a tabela inteira
+    # - criado_em → a lista já sai em ordem, sem ordenar tudo
+    # - (categoria_id, criado_em) → os posts de uma categoria ficam
+    #   juntos e já em ordem de data
+    __table_args__ = (
+        db.Index("ix_post_criado_em", "criado_em"),
+        db.Index("ix_post_categoria_criado_em", "categoria_id", "criado_em"),
+    )
+
     def __repr__(self):
         return f"<Post {self.id}: {self.titulo}>"
 
@@ -92,9 +120,21 @@ class Post(db.Model):
 # ============================================================
 
 
+# Bancos criados antes dos índices: acrescenta no próprio arquivo
+# (veja migracoes.py)
+MIGRACOES = [
+    ("Índices das listagens", [
+        "CREATE INDEX IF NOT EXISTS ix_post_criado_em ON post (criado_em)",
+        "CREATE INDEX IF NOT EXISTS ix_post_categoria_criado_em "
+        "ON post (categoria_id, criado_em)",
+    ]),
+]
+
+
 # Criar banco e dados iniciais
 with app.app_context():
     db.create_all()
+    aplicar_migracoes(app, db, MIGRACOES)
 
     if Categoria.query.count() == 0:
         categorias = [
@@ -163,7 +203,7 @@ with app.app_context():
 def lista_posts():
     """Lista todos os posts"""
     mensagem = request.args.get("msg")
-    posts = Post.query.order_by(Post.criado_em.desc()).all()
+    posts = com_categoria(Post.query).order_by(Post.criado_em.desc()).all()
     categorias = Categoria.query.order_by(Categoria.nome).all()
     return render_template(
         "categorias_lista.html",
@@ -182,7 +222,7 @@ def posts_por_categoria(cat_id):
     # Duas formas de buscar posts de uma categoria:
     # 1. categoria.posts (usando o relationship)
     # 2. Post.query.filter_by(categoria_id=cat_id).all()
-    posts = Post.query.filter_by(categoria_id=cat_id).order_by(
+    posts = com_categoria(Post.query).filter_by(categoria_id=cat_id).order_by(
         Post.criado_em.desc()
     ).all()
 
@@ -20,14 +20,33 @@
 # - Query parameters: ?q=busca&page=2
 # ============================================================
 
+import os
 from flask import Flask, render_template, request, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from carregamento import com_categoria
+from configuracao_sqlite import aplicar_perfil_sqlite
+from instrumentacao import instrumentar
+from migracoes import aplicar_migracoes
 
 app = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///blog_busca.db"
+# BLOG_BUSCA_DATABASE_URI permite usar outro banco (ex.: nos testes)
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
+    "BLOG_BUSCA_DATABASE_URI", "sqlite:///blog_busca.db"
+)
 db = SQLAlchemy(app)
 
+# SQLite ajustado para servidor (WAL, cache, mmap...): veja configuracao_sqlite.py
+app.config["SQLITE_PERFIL"] = "producao"
+aplicar_perfil_sqlite(app, db)
+
+# Conta consultas SQL por requisição (Server-Timing e /metrics): veja instrumentacao.py
+instrumentar(app, db)
+
+# Como carregar post.categoria nas listagens: "joined", "selectin" ou "lazy"
+# (evita uma consulta por post: veja carregamento.py)
+app.config["CARREGAR_CATEGORIA"] = "joined"
+
 
 # ============================================================
 # MODELOS
@@ -49,13 +68,31 @@ class Post(db.Model):
     criado_em = db.Column(db.DateTime, default=datetime.now)
     categoria_id = db.Column(db.Integer, db.ForeignKey("categoria.id"))
 
+    # Índices na ordem das listagens (veja 5_relacionamentos.py)
+    __table_args__ = (
+        db.Index("ix_post_criado_em", "criado_em"),
+        db.Index("ix_post_categoria_criado_em", "categoria_id", "criado_em"),
+    )
+
     def __repr__(self):
         return f"<Post {self.id}: {self.titulo}>"
 
 
+# Bancos criados antes dos índices: acrescenta no próprio arquivo
+# (veja migracoes.py)
+MIGRACOES = [
+    ("Índices das listagens", [
+        "CREATE INDEX IF NOT EXISTS ix_post_criado_em ON post (criado_em)",
+        "CREATE INDEX IF NOT EXISTS ix_post_categoria_criado_em "
+        "ON post (categoria_id, criado_em)",
+    ]),
+]
+
+
 # Criar banco e dados iniciais (mais posts para testar paginação)
 with app.app_context():
     db.create_all()
+    aplicar_migracoes(app, db, MIGRACOES)
 
     if Post.query.count() == 0:
         categorias = [
@@ -152,7 +189,7 @@ def lista_posts():
     #   paginacao.next_num → número da próxima página
     #   paginacao.total    → total de itens em todas as páginas
 
-    paginacao = Post.query.order_by(Post.criado_em.desc()).paginate(
+    paginacao = com_categoria(Post.query).order_by(Post.criado_em.desc()).paginate(
         page=pagina,
         per_page=POSTS_POR_PAGINA,
         error_out=False,  # Não dá erro se a página não existir
@@ -176,7 +213,7 @@ def posts_por_categoria(cat_id):
     categoria = Categoria.query.get_or_404(cat_id)
     pagina = request.args.get("page", 1, type=int)
 
-    paginacao = Post.query.filter_by(categoria_id=cat_id).order_by(
+    paginacao = com_categoria(Post.query).filter_by(categoria_id=cat_id).order_by(
         Post.criado_em.desc()
     ).paginate(page=pagina, per_page=POSTS_POR_PAGINA, error_out=False)
 
@@ -216,7 +253,7 @@ def buscar():
     if termo:
         # Buscar no título OU no conteúdo
         busca = f"%{termo}%"
-        paginacao = Post.query.filter(
+        paginacao = com_categoria(Post.query).filter(
             db.or_(
                 Post.titulo.like(busca),
                 Post.conteudo.like(busca),
@@ -226,7 +263,7 @@ def buscar():
         )
     else:
         # Se não digitou nada, mostra todos
-        paginacao = Post.query.order_by(Post.criado_em.desc()).paginate(
+        paginacao = com_categoria(Post.query).order_by(Post.criado_em.desc()).paginate(
             page=pagina, per_page=POSTS_POR_PAGINA, error_out=False
         )
 
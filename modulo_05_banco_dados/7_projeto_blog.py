@@ -22,16 +22,59 @@
 # - templates/blog/sobre.html        → página sobre
 # ============================================================
 
-from flask import Flask, render_template, request, redirect, url_for
+import functools
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+import click
+from flask import Flask, render_template, request, redirect, url_for, make_response
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+from carregamento import com_categoria
+from configuracao_sqlite import aplicar_perfil_sqlite
+from instrumentacao import instrumentar
+from migracoes import aplicar_migracoes
 
 app = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///blogpy.db"
+# BLOGPY_DATABASE_URI permite usar outro banco (ex.: nos benchmarks)
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
+    "BLOGPY_DATABASE_URI", "sqlite:///blogpy.db"
+)
 db = SQLAlchemy(app)
 
+# SQLite ajustado para servidor (WAL, cache, mmap...): veja configuracao_sqlite.py
+app.config["SQLITE_PERFIL"] = "producao"
+aplicar_perfil_sqlite(app, db)
+
 POSTS_POR_PAGINA = 5
 
+# True → todas as listagens usam paginação por cursor (?after=...)
+# False → paginação por número de página, a não ser que a URL
+#         já traga ?after= ou ?before=
+app.config["PAGINACAO_POR_CURSOR"] = False
+
+# Como carregar post.categoria nas listagens: "joined", "selectin" ou "lazy"
+# (evita uma consulta por post: veja carregamento.py)
+app.config["CARREGAR_CATEGORIA"] = "joined"
+
+# Por quantos segundos a lista de categorias fica guardada em memória
+CACHE_CATEGORIAS_SEGUNDOS = 300
+
+# Quantas páginas prontas (HTML) podem ficar guardadas em memória
+CACHE_PAGINAS_MAXIMO = 500
+
+# Por quantos segundos, no máximo, uma página pronta é reaproveitada
+CACHE_PAGINAS_SEGUNDOS = 30
+
+# Quantos totais de busca podem ficar guardados em memória
+TOTAIS_DE_BUSCA_MAXIMO = 1000
+
 
 # ============================================================
 # MODELOS
@@ -53,16 +96,291 @@ class Post(db.Model):
     criado_em = db.Column(db.DateTime, default=datetime.now)
     categoria_id = db.Column(db.Integer, db.ForeignKey("categoria.id"))
 
+    # Índices na mesma ordem das listagens: o SQLite lê os posts já
+    # ordenados, sem precisar ordenar a tabela inteira a cada página
+    __table_args__ = (
+        db.Index("ix_post_criado_em_id", "criado_em", "id"),
+        db.Index("ix_post_categoria_criado_em_id", "categoria_id", "criado_em", "id"),
+    )
+
     def __repr__(self):
         return f"<Post {self.id}: {self.titulo}>"
 
 
+class Contador(db.Model):
+    """
+    Totais prontos, mantidos pelas rotas de escrita.
+
+    nome = "posts", "categorias" ou "categoria:3"
+    """
+    nome = db.Column(db.String(250), primary_key=True)
+    valor = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<Contador {self.nome}={self.valor}>"
+
+
+# ============================================================
+# BUSCA DE TEXTO COMPLETO (SQLite FTS5)
+# ============================================================
+# O LIKE '%termo%' obriga o SQLite a ler o conteúdo de TODOS os
+# posts a cada busca. Com milhares de posts isso fica lento.
+#
+# O FTS5 é um "índice remissivo" embutido no SQLite: ele guarda,
+# para cada palavra, a lista de posts onde ela aparece.
+#
+# - post_busca é uma tabela virtual que indexa titulo e conteudo
+# - content="post" → o texto continua só na tabela post
+#   (o índice guarda apenas as palavras)
+# - remove_diacritics 2 → "programação" e "programacao" casam
+# - gatilhos (triggers) mantêm o índice em dia a cada
+#   INSERT, UPDATE e DELETE em post
+# - rank usa BM25: o título pesa 10x mais que o conteúdo
+
+busca_fts = db.table("post_busca", db.column("rowid"), db.column("rank"))
+
+# Comandos que montam a busca hoje: popular_banco() os usa para
+# recriar os gatilhos depois de uma carga em massa. A migração 2 tem
+# a SUA cópia (congelada): se a busca mudar, mude esta lista E
+# acrescente uma migração nova que leve os bancos antigos até ela.
+SQL_INDICE_BUSCA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS post_busca USING fts5(
+        titulo, conteudo,
+        content='post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_busca_insert AFTER INSERT ON post BEGIN
+        INSERT INTO post_busca(rowid, titulo, conteudo)
+        VALUES (new.id, new.titulo, new.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_busca_delete AFTER DELETE ON post BEGIN
+        INSERT INTO post_busca(post_busca, rowid, titulo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.conteudo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_busca_update AFTER UPDATE ON post BEGIN
+        INSERT INTO post_busca(post_busca, rowid, titulo, conteudo)
+        VALUES ('delete', old.id, old.titulo, old.conteudo);
+        INSERT INTO post_busca(rowid, titulo, conteudo)
+        VALUES (new.id, new.titulo, new.conteudo);
+    END
+    """,
+    "INSERT INTO post_busca(post_busca, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+]
+
+
+def reconstruir_indice_busca():
+    """Refaz o índice FTS5 inteiro a partir da tabela post"""
+    db.session.execute(db.text(
+        "INSERT INTO post_busca(post_busca) VALUES ('rebuild')"
+    ))
+
+
+def expressao_busca(termo):
+    """
+    Converte o texto digitado em uma consulta FTS5 segura.
+
+    "flask banco" → '"flask"* "banco"*'
+    (posts com as DUAS palavras, aceitando prefixos: "banco" acha "bancos")
+    Pontuação e operadores do FTS5 digitados pelo usuário são ignorados.
+    """
+    palavras = re.findall(r"\w+", termo)
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+@app.cli.command("reindexar-busca")
+def comando_reindexar_busca():
+    """Reconstrói o índice de busca (uso: flask --app 7_projeto_blog reindexar-busca)"""
+    reconstruir_indice_busca()
+    db.session.commit()
+    print(f"Índice de busca reconstruído ({Post.query.count()} posts).")
+
+
+# ============================================================
+# CONTADORES (totais sem COUNT(*))
+# ============================================================
+# O .paginate() roda um SELECT COUNT(*) a cada página só para saber
+# quantas páginas existem, e a página "Sobre" conta posts e
+# categorias a cada visita. Num banco grande, contar é caro.
+#
+# A tabela contador guarda os totais prontos. As rotas de escrita
+# somam/subtraem 1 NA MESMA TRANSAÇÃO do post: ou os dois mudam,
+# ou nenhum muda — o total nunca fica diferente da tabela post.
+#
+# Totais de busca NÃO vão para o banco: uma busca é só leitura e
+# não grava nada. Eles ficam na memória (totais_de_busca, abaixo).
+
+def ler_contador(nome):
+    """Valor de um contador (0 se ainda não existir)"""
+    contador = db.session.get(Contador, nome)
+    return contador.valor if contador else 0
+
+
+def ajustar_contador(nome, quantidade):
+    """Soma `quantidade` ao contador (cria se não existir); não faz commit"""
+    db.session.execute(
+        sqlite_insert(Contador)
+        .values(nome=nome, valor=quantidade)
+        .on_conflict_do_update(
+            index_elements=["nome"],
+            set_={"valor": Contador.valor + quantidade},
+        )
+    )
+
+
+def ajustar_contadores_de_post(categoria_id, quantidade):
+    """Um post entrou (+1) ou saiu (-1) do blog ou de uma categoria"""
+    ajustar_contador("posts", quantidade)
+    if categoria_id:
+        ajustar_contador(f"categoria:{categoria_id}", quantidade)
+
+
+class TotaisDeBusca:
+    """
+    Total de resultados de cada busca, contado só na primeira vez.
+
+    Fica na memória do processo e é apagado a cada escrita em posts
+    (invalidar_caches), até a que só muda o título: o texto mudou,
+    então qualquer busca pode ter mudado de total.
+    """
+
+    def __init__(self, maximo):
+        self.maximo = maximo
+        # Mesma ideia do cache de páginas: um total contado ANTES de
+        # uma escrita não pode ser guardado DEPOIS dela
+        self.geracao = 0
+        self._totais = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, expressao, contar):
+        with self._trava:
+            if expressao in self._totais:
+                self._totais.move_to_end(expressao)
+                return self._totais[expressao]
+            geracao = self.geracao
+        total = contar()
+        with self._trava:
+            if geracao == self.geracao:
+                self._totais[expressao] = total
+                if len(self._totais) > self.maximo:
+                    self._totais.popitem(last=False)  # descarta o mais antigo
+        return total
+
+    def invalidar(self):
+        with self._trava:
+            self.geracao += 1
+            self._totais.clear()
+
+
+totais_de_busca = TotaisDeBusca(TOTAIS_DE_BUSCA_MAXIMO)
+
+
+def total_da_busca(expressao, encontrados):
+    """Total de resultados de uma busca (sem gravar nada no banco)"""
+    return totais_de_busca.obter(expressao, lambda: encontrados.order_by(None).count())
+
+
+def recalcular_contadores():
+    """Refaz todos os contadores contando as tabelas de verdade"""
+    Contador.query.delete()
+    db.session.add(Contador(nome="posts", valor=Post.query.count()))
+    db.session.add(Contador(nome="categorias", valor=Categoria.query.count()))
+    por_categoria = db.session.query(
+        Post.categoria_id, db.func.count(Post.id)
+    ).filter(Post.categoria_id.isnot(None)).group_by(Post.categoria_id)
+    for categoria_id, total in por_categoria:
+        db.session.add(Contador(nome=f"categoria:{categoria_id}", valor=total))
+    db.session.commit()
+
+
+def categoria_valida(categoria_id):
+    """Sem categoria (None) ou o id de uma categoria que existe"""
+    return categoria_id is None or db.session.get(Categoria, categoria_id) is not None
+
+
+def paginar(query, pagina, total):
+    """Igual ao .paginate(), mas usando um total já conhecido"""
+    paginacao = query.paginate(
+        page=pagina, per_page=POSTS_POR_PAGINA, error_out=False, count=False
+    )
+    paginacao.total = total
+    return paginacao
+
+
+@app.cli.command("recalcular-contadores")
+def comando_recalcular_contadores():
+    """Recalcula os totais (uso: flask --app 7_projeto_blog recalcular-contadores)"""
+    recalcular_contadores()
+    print(f"Contadores recalculados: {ler_contador('posts')} posts.")
+
+
+# ============================================================
+# MIGRAÇÕES (veja migracoes.py)
+# ============================================================
+# Um blogpy.db antigo já tem a tabela post, então o create_all()
+# não acrescenta nela os índices nem a busca. As migrações fazem
+# isso no próprio arquivo, sem perder nenhum post.
+# Para mudar o banco: acrescente uma migração NO FINAL da lista.
+
+MIGRACOES = [
+    ("Índices das listagens (criado_em e categoria_id + criado_em)", [
+        "CREATE INDEX IF NOT EXISTS ix_post_criado_em_id ON post (criado_em, id)",
+        "CREATE INDEX IF NOT EXISTS ix_post_categoria_criado_em_id "
+        "ON post (categoria_id, criado_em, id)",
+    ]),
+    # Cópia congelada de SQL_INDICE_BUSCA: uma migração publicada
+    # roda sempre os mesmos comandos, mesmo que a lista mude depois
+    ("Busca de texto completo (FTS5)", [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS post_busca USING fts5(
+            titulo, conteudo,
+            content='post', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS post_busca_insert AFTER INSERT ON post BEGIN
+            INSERT INTO post_busca(rowid, titulo, conteudo)
+            VALUES (new.id, new.titulo, new.conteudo);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS post_busca_delete AFTER DELETE ON post BEGIN
+            INSERT INTO post_busca(post_busca, rowid, titulo, conteudo)
+            VALUES ('delete', old.id, old.titulo, old.conteudo);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS post_busca_update AFTER UPDATE ON post BEGIN
+            INSERT INTO post_busca(post_busca, rowid, titulo, conteudo)
+            VALUES ('delete', old.id, old.titulo, old.conteudo);
+            INSERT INTO post_busca(rowid, titulo, conteudo)
+            VALUES (new.id, new.titulo, new.conteudo);
+        END
+        """,
+        "INSERT INTO post_busca(post_busca, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+        # indexa os posts que já existiam antes da busca
+        "INSERT INTO post_busca(post_busca) VALUES ('rebuild')",
+    ]),
+    ("Totais de busca saem da tabela contador (ficam em memória)", [
+        "DELETE FROM contador WHERE nome LIKE 'busca:%'",
+    ]),
+]
+
+
 # ============================================================
 # CRIAR BANCO E DADOS INICIAIS
 # ============================================================
 
 with app.app_context():
     db.create_all()
+    aplicar_migracoes(app, db, MIGRACOES)
 
     if Categoria.query.count() == 0:
         categorias = [
@@ -73,13 +391,9 @@ with app.app_context():
             Categoria(nome="Projetos"),
         ]
         db.session.add_all(categorias)
-        db.session.commit()
+        db.session.flush()  # gera os ids sem precisar buscar cada categoria de volta
 
-        tech = Categoria.query.filter_by(nome="Tecnologia").first()
-        python = Categoria.query.filter_by(nome="Python").first()
-        dia = Categoria.query.filter_by(nome="Dia a Dia").first()
-        estudos = Categoria.query.filter_by(nome="Estudos").first()
-        projetos = Categoria.query.filter_by(nome="Projetos").first()
+        tech, python, dia, estudos, projetos = categorias
 
         posts = [
             Post(
@@ -197,22 +511,484 @@ with app.app_context():
         db.session.commit()
         print(f"Blog criado com {len(posts)} posts e {len(categorias)} categorias!")
 
+    # Banco novo ou criado antes dos contadores: calcula os totais
+    if Contador.query.first() is None:
+        recalcular_contadores()
+
+
+# ============================================================
+# POPULAR O BANCO EM MASSA (testes de carga)
+# ============================================================
+# Para testar o blog com 1 milhão de posts, criar um objeto Post
+# por vez e dar db.session.add() seria lento demais.
+#
+# popular_banco() usa o "Core" do SQLAlchemy:
+# - insert(...) com uma LISTA de linhas → executemany (um comando,
+#   milhares de linhas)
+# - lotes de N linhas, todos dentro de UMA transação (um commit só)
+# - opcionalmente desliga os índices e os gatilhos da busca durante
+#   a carga e recria tudo no final — montar o índice de uma vez é
+#   bem mais rápido do que atualizá-lo a cada linha
+# - random.Random(semente): a mesma semente gera sempre os mesmos
+#   posts, então dois testes de carga comparam a mesma coisa
+
+PALAVRAS = (
+    "python flask banco dados sqlite consulta índice página rota template "
+    "servidor cliente requisição resposta função classe modelo tabela coluna "
+    "categoria post blog busca paginação cache memória desempenho teste "
+    "programação código projeto estudo aula curso módulo lição exercício "
+    "internet navegador formulário usuário sessão arquivo texto lista "
+    "dicionário erro exceção variável laço condição"
+).split()
+
+
+def gerar_posts(total, semente, categoria_ids, inicio):
+    """Gera `total` posts falsos (como dicionários), sempre iguais para a mesma semente"""
+    aleatorio = random.Random(semente)
+    # Sortear palavra por palavra de cada post seria o passo mais lento
+    # da carga: sorteamos frases prontas e combinamos algumas por post
+    frases = [
+        " ".join(aleatorio.choices(PALAVRAS, k=aleatorio.randint(6, 12)))
+        for _ in range(2000)
+    ]
+    titulos = [frase.capitalize() for frase in frases]
+    categorias = categoria_ids or [None]
+    intervalo = timedelta(seconds=30)
+
+    for numero in range(total):
+        yield {
+            "titulo": aleatorio.choice(titulos),
+            "conteudo": ". ".join(aleatorio.choices(frases, k=5)).capitalize() + ".",
+            "criado_em": inicio + intervalo * numero,
+            "categoria_id": aleatorio.choice(categorias),
+        }
+
+
+def popular_banco(total, semente=42, tamanho_lote=10_000, adiar_indices=True):
+    """Insere `total` posts gerados em uma transação; retorna os segundos gastos"""
+    comeco = time.perf_counter()
+    categoria_ids = [id_ for (id_,) in db.session.query(Categoria.id).order_by(Categoria.id)]
+    tabela = Post.__table__
+    conexao = db.session.connection()
+
+    if adiar_indices:
+        for indice in tabela.indexes:
+            indice.drop(conexao)
+        for gatilho in ("post_busca_insert", "post_busca_update", "post_busca_delete"):
+            db.session.execute(db.text(f"DROP TRIGGER IF EXISTS {gatilho}"))
+
+    lote = []
+    for post in gerar_posts(total, semente, categoria_ids, datetime(2020, 1, 1)):
+        lote.append(post)
+        if len(lote) == tamanho_lote:
+            db.session.execute(tabela.insert(), lote)
+            lote = []
+    if lote:
+        db.session.execute(tabela.insert(), lote)
+
+    if adiar_indices:
+        for indice in tabela.indexes:
+            indice.create(conexao)
+        for sql in SQL_INDICE_BUSCA:
+            db.session.execute(db.text(sql))
+        reconstruir_indice_busca()
+
+    db.session.commit()
+    recalcular_contadores()
+    invalidar_caches()
+    return time.perf_counter() - comeco
+
+
+@app.cli.command("popular")
+@click.option("--posts", "total", default=100_000, show_default=True, help="Quantos posts criar")
+@click.option("--semente", default=42, show_default=True, help="Semente do gerador aleatório")
+@click.option("--lote", "tamanho_lote", default=10_000, show_default=True, help="Linhas por executemany")
+@click.option("--adiar-indices/--manter-indices", default=True, show_default=True,
+              help="Recriar índices e busca só no final da carga")
+def comando_popular(total, semente, tamanho_lote, adiar_indices):
+    """Cria muitos posts de teste (uso: flask --app 7_projeto_blog popular --posts 1000000)"""
+    segundos = popular_banco(total, semente, tamanho_lote, adiar_indices)
+    print(f"{total} posts criados em {segundos:.1f}s ({total / segundos:,.0f} posts/s).")
+
+
+# ============================================================
+# CATEGORIAS COM CONTAGEM DE POSTS
+# ============================================================
+# No template, {{ cat.posts|length }} carrega TODOS os posts de
+# cada categoria só para contá-los — uma consulta por categoria,
+# trazendo milhares de linhas para a memória.
+#
+# Aqui buscamos, em UMA consulta só, cada categoria junto com o seu
+# contador "categoria:<id>" (sem ler nenhum post):
+#   SELECT categoria.id, categoria.nome, contador.valor
+#   FROM categoria LEFT JOIN contador ON contador.nome = 'categoria:' || categoria.id
+#
+# O LEFT JOIN (outerjoin) mantém as categorias sem nenhum post.
+
+def consultar_categorias():
+    """Categorias em ordem alfabética com o total de posts de cada uma"""
+    return tuple(db.session.query(
+        Categoria.id,
+        Categoria.nome,
+        db.func.coalesce(Contador.valor, 0).label("total_posts"),
+    ).outerjoin(
+        Contador, Contador.nome == "categoria:" + db.cast(Categoria.id, db.String)
+    ).order_by(Categoria.nome).all())
+
+
+# ============================================================
+# CACHE EM MEMÓRIA DAS CATEGORIAS
+# ============================================================
+# Todas as páginas mostram as categorias na barra lateral, mas elas
+# quase nunca mudam. Em vez de perguntar ao banco a cada requisição,
+# guardamos o resultado em memória (um "cache") e reaproveitamos.
+#
+# - O cache é do processo inteiro: todas as requisições compartilham
+# - Validade (TTL): depois de N segundos, consulta o banco de novo
+# - Invalidação: quem muda posts ou categorias chama .invalidar()
+#   e a próxima requisição busca os dados atualizados
+# - acertos/falhas mostram se o cache está funcionando (/status/cache)
+
+class CacheComValidade:
+    """Guarda o resultado de uma função em memória por alguns segundos"""
+
+    def __init__(self, carregar, validade):
+        self.carregar = carregar
+        self.validade = validade
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+        self._valor = None
+        self._expira_em = 0.0
+        # O servidor atende várias requisições ao mesmo tempo (threads):
+        # a trava garante que só uma delas recarrega o valor
+        self._trava = threading.Lock()
+
+    def obter(self):
+        with self._trava:
+            if time.monotonic() < self._expira_em:
+                self.acertos += 1
+                return self._valor
+
+            self.falhas += 1
+            self._valor = self.carregar()
+            self._expira_em = time.monotonic() + self.validade
+            return self._valor
+
+    def invalidar(self):
+        with self._trava:
+            self._valor = None
+            self._expira_em = 0.0
+            self.invalidacoes += 1
+
+    def estatisticas(self):
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "invalidacoes": self.invalidacoes,
+        }
+
+
+cache_categorias = CacheComValidade(consultar_categorias, CACHE_CATEGORIAS_SEGUNDOS)
+
+
+def listar_categorias():
+    """Categorias com contagem de posts, vindas do cache"""
+    return cache_categorias.obter()
+
+
+# ============================================================
+# CACHE DE PÁGINAS PRONTAS
+# ============================================================
+# As páginas de leitura (início, post, categoria, sobre) só mudam
+# quando alguém cria, edita ou exclui um post. Então guardamos o
+# HTML já renderizado e servimos direto da memória — sem Jinja e
+# sem banco de dados.
+#
+# - Chave: caminho + os parâmetros que as rotas leem ("/?page=2",
+#   "/post/7"). Outros parâmetros (?x=123) são ignorados: não criam
+#   uma página nova no cache. Páginas com ?msg= (o aviso depois de
+#   criar ou excluir um post) não são guardadas.
+# - Cheio (CACHE_PAGINAS_MAXIMO), sai a página usada há MAIS tempo:
+#   cada acerto leva a página para o fim da fila, então as mais
+#   visitadas ("/") ficam.
+# - Etiquetas dizem do que a página depende:
+#     "post:7" → a página do post 7
+#     "listas" → listagens, contagens e barra lateral
+#   Editar o post 7 invalida só "post:7" e "listas"; as páginas
+#   dos outros posts continuam no cache.
+# - ETag e Last-Modified: o navegador pergunta "mudou desde a
+#   última vez?" (If-None-Match / If-Modified-Since) e, se não
+#   mudou, respondemos 304 Not Modified, sem reenviar o HTML.
+#
+# CUIDADO: o cache fica na memória de CADA processo. Com vários
+# processos (ex.: gunicorn -w 4), uma escrita só apaga o cache do
+# processo que a atendeu; os outros continuam com a página velha.
+# Por isso cada página vale no máximo CACHE_PAGINAS_SEGUNDOS: com
+# vários processos, uma mudança pode demorar esse tempo para aparecer.
+
+# Os únicos parâmetros da URL que as rotas em cache leem
+PARAMETROS_EM_CACHE = ("page", "after", "before", "q")
+
+
+class PaginaGuardada:
+    """Uma resposta HTML pronta para ser reenviada"""
+
+    def __init__(self, corpo, tipo, etiquetas, segundos):
+        self.corpo = corpo
+        self.tipo = tipo
+        self.etiquetas = etiquetas
+        self.etag = hashlib.md5(corpo).hexdigest()
+        self.modificada_em = datetime.now(timezone.utc).replace(microsecond=0)
+        self.expira_em = time.monotonic() + segundos
+
+
+class CachePaginas:
+    """Páginas guardadas por chave, invalidadas por etiqueta ou pelo tempo"""
+
+    def __init__(self, maximo, segundos):
+        self.maximo = maximo
+        self.segundos = segundos
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+        # Sobe a cada invalidação: uma página renderizada ANTES de uma
+        # escrita não pode entrar no cache DEPOIS dela (ficaria velha)
+        self.geracao = 0
+        self._paginas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        with self._trava:
+            pagina = self._paginas.get(chave)
+            if pagina is not None and pagina.expira_em <= time.monotonic():
+                del self._paginas[chave]  # venceu: monta de novo
+                pagina = None
+            if pagina is None:
+                self.falhas += 1
+            else:
+                self.acertos += 1
+                self._paginas.move_to_end(chave)  # usada agora: sai por último
+            return pagina
+
+    def guardar(self, chave, pagina, geracao):
+        with self._trava:
+            if geracao != self.geracao:
+                return
+            self._paginas[chave] = pagina
+            if len(self._paginas) > self.maximo:
+                self._paginas.popitem(last=False)  # descarta a usada há mais tempo
+
+    def invalidar(self, *etiquetas):
+        with self._trava:
+            self.geracao += 1
+            self.invalidacoes += 1
+            for chave in [
+                chave for chave, pagina in self._paginas.items()
+                if pagina.etiquetas & set(etiquetas)
+            ]:
+                del self._paginas[chave]
+
+    def estatisticas(self):
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "invalidacoes": self.invalidacoes,
+            "paginas": len(self._paginas),
+        }
+
+
+cache_paginas = CachePaginas(CACHE_PAGINAS_MAXIMO, CACHE_PAGINAS_SEGUNDOS)
+
+
+def pagina_em_cache(*etiquetas):
+    """
+    Decorador para rotas de leitura: serve a página do cache.
+
+    As etiquetas podem usar os parâmetros da rota:
+        @pagina_em_cache("post:{post_id}")
+    """
+    def decorador(rota):
+        @functools.wraps(rota)
+        def rota_com_cache(**parametros):
+            if "msg" in request.args:
+                return rota(**parametros)  # aviso de uma vez só: não guarda
+            chave = request.path + "?" + urlencode([
+                (nome, request.args[nome])
+                for nome in PARAMETROS_EM_CACHE if nome in request.args
+            ])
+            pagina = cache_paginas.obter(chave)
+
+            if pagina is None:
+                geracao = cache_paginas.geracao
+                resposta = make_response(rota(**parametros))
+                if resposta.status_code != 200:
+                    return resposta
+                pagina = PaginaGuardada(
+                    resposta.get_data(),
+                    resposta.mimetype,
+                    {etiqueta.format(**parametros) for etiqueta in etiquetas},
+                    cache_paginas.segundos,
+                )
+                cache_paginas.guardar(chave, pagina, geracao)
+                situacao = "MISS"
+            else:
+                situacao = "HIT"
+
+            resposta = app.response_class(pagina.corpo, mimetype=pagina.tipo)
+            resposta.set_etag(pagina.etag)
+            resposta.last_modified = pagina.modificada_em
+            # no-cache = "pode guardar, mas confirme comigo antes de usar"
+            resposta.cache_control.no_cache = True
+            resposta.headers["X-Cache"] = situacao
+            # Responde 304 se o navegador já tem esta versão
+            return resposta.make_conditional(request)
+
+        return rota_com_cache
+    return decorador
+
+
+def invalidar_caches(post_id=None):
+    """Chamada pelas rotas de escrita depois do commit"""
+    cache_categorias.invalidar()
+    totais_de_busca.invalidar()
+    if post_id is None:
+        cache_paginas.invalidar("listas")
+    else:
+        cache_paginas.invalidar("listas", f"post:{post_id}")
+
+
+# ============================================================
+# INSTRUMENTAÇÃO (Server-Timing e /metrics)
+# ============================================================
+# Cada resposta ganha o cabeçalho Server-Timing (consultas SQL, tempo
+# de SQL e de template) e /metrics junta tudo no formato do
+# Prometheus — incluindo acertos e falhas dos caches.
+
+# Tipo e ajuda de cada número de estatisticas(): acertos, falhas e
+# invalidações só sobem (counter); páginas guardadas sobe e desce (gauge)
+METRICAS_DOS_CACHES = {
+    "acertos": ("counter", "Leituras atendidas pelo cache"),
+    "falhas": ("counter", "Leituras que não estavam no cache"),
+    "invalidacoes": ("counter", "Vezes que o cache foi apagado"),
+    "paginas": ("gauge", "Páginas guardadas agora"),
+}
+
+
+def metricas_dos_caches():
+    metricas = {}
+    for nome, cache in (("categorias", cache_categorias), ("paginas", cache_paginas)):
+        for campo, valor in cache.estatisticas().items():
+            tipo, ajuda = METRICAS_DOS_CACHES[campo]
+            sufixo = "_total" if tipo == "counter" else ""
+            metricas[f"blog_cache_{nome}_{campo}{sufixo}"] = (tipo, f"{ajuda} ({nome})", valor)
+    return metricas
+
+
+instrumentar(app, db, extras=metricas_dos_caches)
+
+
+# ============================================================
+# PAGINAÇÃO POR CURSOR (keyset)
+# ============================================================
+# O .paginate() usa OFFSET: para mostrar a página 1000, o banco
+# lê e descarta 4995 posts — e ainda roda um COUNT(*) a cada página.
+#
+# Com cursor, o link "Próxima" leva o último post da página atual
+# (?after=<criado_em>,<id>) e o banco pula direto para ele pelo
+# índice (criado_em, id). A página 10.000 custa o mesmo que a 1.
+#
+# O id entra no cursor para desempatar posts criados no mesmo instante.
+
+class PaginaCursor:
+    """Uma página da paginação por cursor (mesma ideia do objeto do .paginate())"""
+
+    def __init__(self, items, has_prev, has_next):
+        self.items = items
+        self.has_prev = has_prev and bool(items)
+        self.has_next = has_next and bool(items)
+        self.prev_cursor = gerar_cursor(items[0]) if self.has_prev else None
+        self.next_cursor = gerar_cursor(items[-1]) if self.has_next else None
+        self.total = None  # sem COUNT(*): o total não é calculado
+
+
+def gerar_cursor(post):
+    """Post → texto do cursor, ex.: 2026-02-10T11:25:00,42"""
+    return f"{post.criado_em.isoformat()},{post.id}"
+
+
+def ler_cursor(texto):
+    """Texto do cursor → (criado_em, id), ou None se for inválido"""
+    if not texto:
+        return None
+    try:
+        data, post_id = texto.rsplit(",", 1)
+        return datetime.fromisoformat(data), int(post_id)
+    except ValueError:
+        return None
+
+
+def usar_cursor():
+    """Decide se esta requisição usa paginação por cursor"""
+    return (
+        app.config["PAGINACAO_POR_CURSOR"]
+        or "after" in request.args
+        or "before" in request.args
+    )
+
+
+def paginar_por_cursor(query):
+    """
+    Pagina uma consulta de posts do mais novo para o mais antigo.
+
+    ?after=<cursor>  → posts mais antigos que o cursor (próxima página)
+    ?before=<cursor> → posts mais novos que o cursor (página anterior)
+    """
+    chave = db.tuple_(Post.criado_em, Post.id)
+    depois = ler_cursor(request.args.get("after"))
+    antes = ler_cursor(request.args.get("before"))
+
+    if antes:
+        # Caminha "para trás" em ordem crescente e depois inverte
+        items = query.filter(chave > antes).order_by(
+            Post.criado_em.asc(), Post.id.asc()
+        ).limit(POSTS_POR_PAGINA + 1).all()
+        if len(items) > POSTS_POR_PAGINA:
+            return PaginaCursor(items[:POSTS_POR_PAGINA][::-1], True, True)
+        depois = None  # chegou ao começo: mostra a primeira página cheia
+
+    if depois:
+        query = query.filter(chave < depois)
+    items = query.order_by(
+        Post.criado_em.desc(), Post.id.desc()
+    ).limit(POSTS_POR_PAGINA + 1).all()
+    return PaginaCursor(
+        items[:POSTS_POR_PAGINA],
+        has_prev=depois is not None,
+        has_next=len(items) > POSTS_POR_PAGINA,
+    )
+
 
 # ============================================================
 # ROTAS: PÁGINAS HTML
 # ============================================================
 
 @app.route("/")
+@pagina_em_cache("listas")
 def inicio():
     """Página principal com posts paginados"""
     mensagem = request.args.get("msg")
     pagina = request.args.get("page", 1, type=int)
 
-    paginacao = Post.query.order_by(Post.criado_em.desc()).paginate(
-        page=pagina, per_page=POSTS_POR_PAGINA, error_out=False
-    )
+    posts = com_categoria(Post.query)
+    if usar_cursor():
+        paginacao = paginar_por_cursor(posts)
+    else:
+        paginacao = paginar(
+            posts.order_by(Post.criado_em.desc()), pagina, ler_contador("posts")
+        )
 
-    categorias = Categoria.query.order_by(Categoria.nome).all()
+    categorias = listar_categorias()
 
     return render_template(
         "blog/inicio.html",
@@ -224,6 +1000,7 @@ def inicio():
 
 
 @app.route("/post/<int:post_id>")
+@pagina_em_cache("post:{post_id}")
 def ver_post(post_id):
     """Mostra um post completo"""
     post = Post.query.get_or_404(post_id)
@@ -236,14 +1013,19 @@ def novo_post():
     if request.method == "POST":
         titulo = request.form["titulo"].strip()
         conteudo = request.form["conteudo"].strip()
-        categoria_id = request.form.get("categoria_id") or None
+        categoria_id = request.form.get("categoria_id", type=int)
 
+        erro = None
         if not titulo or not conteudo:
-            categorias = Categoria.query.order_by(Categoria.nome).all()
+            erro = "Título e conteúdo são obrigatórios!"
+        elif not categoria_valida(categoria_id):
+            erro = "Categoria inválida!"
+        if erro:
+            categorias = listar_categorias()
             return render_template(
                 "blog/novo_post.html",
                 categorias=categorias,
-                erro="Título e conteúdo são obrigatórios!",
+                erro=erro,
                 titulo=titulo,
                 conteudo=conteudo,
             )
@@ -254,10 +1036,12 @@ def novo_post():
             categoria_id=categoria_id,
         )
         db.session.add(post)
+        ajustar_contadores_de_post(categoria_id, +1)
         db.session.commit()
+        invalidar_caches()
         return redirect(url_for("inicio", msg="Post publicado com sucesso!"))
 
-    categorias = Categoria.query.order_by(Categoria.nome).all()
+    categorias = listar_categorias()
     return render_template("blog/novo_post.html", categorias=categorias)
 
 
@@ -269,23 +1053,34 @@ def editar_post(post_id):
     if request.method == "POST":
         titulo = request.form["titulo"].strip()
         conteudo = request.form["conteudo"].strip()
+        categoria_id = request.form.get("categoria_id", type=int)
 
+        erro = None
         if not titulo or not conteudo:
-            categorias = Categoria.query.order_by(Categoria.nome).all()
+            erro = "Título e conteúdo são obrigatórios!"
+        elif not categoria_valida(categoria_id):
+            erro = "Categoria inválida!"
+        if erro:
+            categorias = listar_categorias()
             return render_template(
                 "blog/editar_post.html",
                 post=post,
                 categorias=categorias,
-                erro="Título e conteúdo são obrigatórios!",
+                erro=erro,
             )
 
+        categoria_anterior = post.categoria_id
         post.titulo = titulo
         post.conteudo = conteudo
-        post.categoria_id = request.form.get("categoria_id") or None
+        post.categoria_id = categoria_id
+        if post.categoria_id != categoria_anterior:
+            ajustar_contadores_de_post(categoria_anterior, -1)
+            ajustar_contadores_de_post(post.categoria_id, +1)
         db.session.commit()
+        invalidar_caches(post.id)
         return redirect(url_for("ver_post", post_id=post.id))
 
-    categorias = Categoria.query.order_by(Categoria.nome).all()
+    categorias = listar_categorias()
     return render_template(
         "blog/editar_post.html", post=post, categorias=categorias
     )
@@ -297,21 +1092,30 @@ def excluir_post(post_id):
     post = Post.query.get_or_404(post_id)
     titulo = post.titulo
     db.session.delete(post)
+    ajustar_contadores_de_post(post.categoria_id, -1)
     db.session.commit()
+    invalidar_caches(post_id)
     return redirect(url_for("inicio", msg=f"'{titulo}' excluído com sucesso!"))
 
 
 @app.route("/categoria/<int:cat_id>")
+@pagina_em_cache("listas")
 def posts_por_categoria(cat_id):
     """Filtra posts por categoria"""
     categoria = Categoria.query.get_or_404(cat_id)
     pagina = request.args.get("page", 1, type=int)
 
-    paginacao = Post.query.filter_by(categoria_id=cat_id).order_by(
-        Post.criado_em.desc()
-    ).paginate(page=pagina, per_page=POSTS_POR_PAGINA, error_out=False)
+    posts_da_categoria = com_categoria(Post.query).filter_by(categoria_id=cat_id)
+    if usar_cursor():
+        paginacao = paginar_por_cursor(posts_da_categoria)
+    else:
+        paginacao = paginar(
+            posts_da_categoria.order_by(Post.criado_em.desc()),
+            pagina,
+            ler_contador(f"categoria:{cat_id}"),
+        )
 
-    categorias = Categoria.query.order_by(Categoria.nome).all()
+    categorias = listar_categorias()
 
     return render_template(
         "blog/inicio.html",
@@ -328,22 +1132,34 @@ def buscar():
     termo = request.args.get("q", "").strip()
     pagina = request.args.get("page", 1, type=int)
 
+    posts = com_categoria(Post.query)
+
     if termo:
-        busca = f"%{termo}%"
-        paginacao = Post.query.filter(
-            db.or_(
-                Post.titulo.like(busca),
-                Post.conteudo.like(busca),
-            )
-        ).order_by(Post.criado_em.desc()).paginate(
-            page=pagina, per_page=POSTS_POR_PAGINA, error_out=False
+        # Busca no índice FTS5
+        expressao = expressao_busca(termo) or '""'
+        encontrados = posts.join(
+            busca_fts, busca_fts.c.rowid == Post.id
+        ).filter(
+            db.text("post_busca MATCH :expressao").bindparams(expressao=expressao)
         )
+        if usar_cursor():
+            # Com cursor, os resultados vêm do mais novo para o mais antigo
+            paginacao = paginar_por_cursor(encontrados)
+        else:
+            # Com páginas numeradas, mais relevantes primeiro (BM25)
+            paginacao = paginar(
+                encontrados.order_by(busca_fts.c.rank),
+                pagina,
+                total_da_busca(expressao, encontrados),
+            )
+    elif usar_cursor():
+        paginacao = paginar_por_cursor(posts)
     else:
-        paginacao = Post.query.order_by(Post.criado_em.desc()).paginate(
-            page=pagina, per_page=POSTS_POR_PAGINA, error_out=False
+        paginacao = paginar(
+            posts.order_by(Post.criado_em.desc()), pagina, ler_contador("posts")
         )
 
-    categorias = Categoria.query.order_by(Categoria.nome).all()
+    categorias = listar_categorias()
 
     return render_template(
         "blog/busca.html",
@@ -355,17 +1171,19 @@ def buscar():
 
 
 @app.route("/categorias")
+@pagina_em_cache("listas")
 def lista_categorias():
     """Lista todas as categorias com contagem de posts"""
-    categorias = Categoria.query.order_by(Categoria.nome).all()
+    categorias = listar_categorias()
     return render_template("blog/categorias.html", categorias=categorias)
 
 
 @app.route("/sobre")
+@pagina_em_cache("listas")
 def sobre():
     """Página sobre o blog"""
-    total_posts = Post.query.count()
-    total_categorias = Categoria.query.count()
+    total_posts = ler_contador("posts")
+    total_categorias = ler_contador("categorias")
     return render_template(
         "blog/sobre.html",
         total_posts=total_posts,
@@ -373,6 +1191,15 @@ def sobre():
     )
 
 
+@app.route("/status/cache")
+def status_cache():
+    """Acertos e falhas do cache (JSON para ferramentas de monitoramento)"""
+    return {
+        "categorias": cache_categorias.estatisticas(),
+        "paginas": cache_paginas.estatisticas(),
+    }
+
+
 # ============================================================
 # O QUE ESTE PROJETO USA (tudo do Módulo 5):
 # ============================================================
@@ -415,6 +1242,8 @@ if __name__ == "__main__":
     print("    /categoria/1    → Posts de uma categoria")
     print("    /categorias     → Todas as categorias")
     print("    /sobre          → Sobre o blog")
+    print("    /status/cache   → Estatísticas do cache (JSON)")
+    print("    /metrics        → Métricas (formato Prometheus)")
     print("  ")
     print("  Para parar: aperte Ctrl+C")
     print("=" * 50)
@@ -0,0 +1,299 @@
+# ============================================================
+# TESTE DE CARGA DO BLOGPY
+# ============================================================
+# Mede latência (p50/p95/p99), requisições por segundo e consultas
+# SQL por requisição das rotas do BlogPy, em dois modos:
+#
+#   test_client → chama o Flask direto, uma requisição por vez
+#                 (mostra o custo de cada rota, sem rede)
+#   wsgi        → sobe um servidor HTTP de verdade e dispara
+#                 requisições com várias threads ao mesmo tempo
+#
+# O banco é criado do zero numa pasta temporária e populado com
+# popular_banco() (mesma semente → mesmos posts), então rodar o
+# teste em commits diferentes compara a mesma coisa. O resultado
+# vai para um JSON em benchmarks/resultados/ com o commit atual.
+#
+# Uso (dentro de modulo_05_banco_dados):
+#   python benchmarks/carga_blog.py
+#   python benchmarks/carga_blog.py --posts 100000 --requisicoes 500 --concorrencia 16
+#   python benchmarks/carga_blog.py --modos wsgi --sem-cache-paginas
+# ============================================================
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import event
+
+PASTA_MODULO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_RESULTADOS = os.path.join(PASTA_MODULO, "benchmarks", "resultados")
+sys.path.insert(0, PASTA_MODULO)
+
+PALAVRAS_BUSCA = ["python", "banco", "flask", "página", "programacao", "cache"]
+TITULO_CRIADO = "Post do teste de carga"
+
+
+# ============================================================
+# CONTAGEM DE CONSULTAS SQL
+# ============================================================
+
+class ContadorConsultas:
+    """Conta os comandos SQL executados pelo engine (todas as threads)"""
+
+    def __init__(self, engine):
+        self.total = 0
+        self._trava = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *args):
+        with self._trava:
+            self.total += 1
+
+
+# ============================================================
+# ROTAS TESTADAS
+# ============================================================
+# Cada cenário devolve (método, url, dados do formulário) para a
+# próxima requisição. Os ids são sorteados com uma semente fixa.
+# POST /excluir apaga os posts criados por POST /novo (que roda antes,
+# com o mesmo número de requisições): o banco volta ao tamanho inicial.
+
+def montar_cenarios(total_posts, total_categorias, aleatorio):
+    def post_qualquer():
+        return aleatorio.randint(1, total_posts)
+
+    criados = []
+
+    def post_criado():
+        if not criados:
+            # Na primeira exclusão, busca os ids dos posts criados
+            with blog.app.app_context():
+                criados.extend(blog.db.session.scalars(
+                    blog.db.select(blog.Post.id).filter_by(titulo=TITULO_CRIADO)
+                ))
+            if not criados:
+                raise RuntimeError("POST /excluir precisa rodar depois de POST /novo")
+        return criados.pop()
+
+    return {
+        "GET /": lambda: ("GET", "/", None),
+        "GET /?page=N": lambda: (
+            "GET", f"/?page={aleatorio.randint(1, max(1, total_posts // 5))}", None
+        ),
+        "GET /post/<id>": lambda: ("GET", f"/post/{post_qualquer()}", None),
+        "GET /busca?q=": lambda: (
+            "GET", "/busca?" + urllib.parse.urlencode({"q": aleatorio.choice(PALAVRAS_BUSCA)}), None
+        ),
+        "GET /categoria/<id>": lambda: (
+            "GET", f"/categoria/{aleatorio.randint(1, total_categorias)}", None
+        ),
+        "POST /novo": lambda: ("POST", "/novo", {
+            "titulo": TITULO_CRIADO,
+            "conteudo": "Criado pelo benchmark " * 10,
+            "categoria_id": str(aleatorio.randint(1, total_categorias)),
+        }),
+        "POST /editar/<id>": lambda: ("POST", f"/editar/{post_qualquer()}", {
+            "titulo": "Post editado pelo teste de carga",
+            "conteudo": "Editado pelo benchmark " * 10,
+            "categoria_id": str(aleatorio.randint(1, total_categorias)),
+        }),
+        "POST /excluir/<id>": lambda: ("POST", f"/excluir/{post_criado()}", None),
+    }
+
+
+def resumir(latencias, segundos, consultas):
+    """Latências (em segundos) → p50/p95/p99 em ms, req/s e consultas/req"""
+    latencias = sorted(latencias)
+    if len(latencias) >= 2:
+        percentis = statistics.quantiles(latencias, n=100, method="inclusive")
+        p50, p95, p99 = percentis[49], percentis[94], percentis[98]
+    else:
+        p50 = p95 = p99 = latencias[0]
+    return {
+        "requisicoes": len(latencias),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "req_por_segundo": round(len(latencias) / segundos, 1),
+        "consultas_por_requisicao": round(consultas / len(latencias), 2),
+    }
+
+
+# ============================================================
+# MODO 1: TEST CLIENT DO FLASK (sequencial)
+# ============================================================
+
+def medir_test_client(cenarios, requisicoes, contador):
+    cliente = blog.app.test_client()
+    resultados = {}
+    for nome, proxima in cenarios.items():
+        latencias = []
+        consultas_antes = contador.total
+        comeco = time.perf_counter()
+        for _ in range(requisicoes):
+            metodo, url, dados = proxima()
+            inicio = time.perf_counter()
+            resposta = cliente.open(url, method=metodo, data=dados)
+            latencias.append(time.perf_counter() - inicio)
+            if resposta.status_code >= 400:
+                raise RuntimeError(f"{metodo} {url} → {resposta.status_code}")
+        segundos = time.perf_counter() - comeco
+        resultados[nome] = resumir(latencias, segundos, contador.total - consultas_antes)
+    return resultados
+
+
+# ============================================================
+# MODO 2: SERVIDOR WSGI DE VERDADE (concorrente)
+# ============================================================
+
+class SemRedirecionar(urllib.request.HTTPRedirectHandler):
+    """Depois de um POST, mede só o POST (não segue o redirect)"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def medir_wsgi(cenarios, requisicoes, concorrencia, contador):
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # sem uma linha por requisição
+    servidor = make_server("127.0.0.1", 0, blog.app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_port}"
+    navegador = urllib.request.build_opener(SemRedirecionar)
+    trava_sorteio = threading.Lock()
+
+    def uma_requisicao(proxima):
+        with trava_sorteio:  # random.Random não é seguro entre threads
+            metodo, url, dados = proxima()
+        corpo = urllib.parse.urlencode(dados).encode() if dados else None
+        pedido = urllib.request.Request(base + url, data=corpo, method=metodo)
+        inicio = time.perf_counter()
+        try:
+            with navegador.open(pedido) as resposta:
+                resposta.read()
+        except urllib.error.HTTPError as erro:
+            if erro.code >= 400:
+                raise
+        return time.perf_counter() - inicio
+
+    resultados = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            for nome, proxima in cenarios.items():
+                consultas_antes = contador.total
+                comeco = time.perf_counter()
+                latencias = list(executor.map(
+                    lambda _: uma_requisicao(proxima), range(requisicoes)
+                ))
+                segundos = time.perf_counter() - comeco
+                resultados[nome] = resumir(
+                    latencias, segundos, contador.total - consultas_antes
+                )
+    finally:
+        servidor.shutdown()
+    return resultados
+
+
+# ============================================================
+# PROGRAMA PRINCIPAL
+# ============================================================
+
+def commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=PASTA_MODULO, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def imprimir(modo, resultados):
+    print(f"\n[{modo}]")
+    print(f"{'rota':<22} {'req':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'req/s':>9} {'SQL/req':>8}")
+    for nome, r in resultados.items():
+        print(f"{nome:<22} {r['requisicoes']:>6} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+              f"{r['p99_ms']:>9} {r['req_por_segundo']:>9} {r['consultas_por_requisicao']:>8}")
+
+
+def main():
+    global blog
+
+    parser = argparse.ArgumentParser(description="Teste de carga do BlogPy")
+    parser.add_argument("--posts", type=int, default=10_000, help="posts no banco de teste")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--requisicoes", type=int, default=200, help="requisições por rota")
+    parser.add_argument("--concorrencia", type=int, default=8, help="threads no modo wsgi")
+    parser.add_argument("--modos", nargs="+", default=["test_client", "wsgi"],
+                        choices=["test_client", "wsgi"])
+    parser.add_argument("--sem-cache-paginas", action="store_true",
+                        help="desliga o cache de páginas prontas")
+    parser.add_argument("--saida", help="arquivo JSON (padrão: benchmarks/resultados/)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.environ["BLOGPY_DATABASE_URI"] = "sqlite:///" + os.path.join(pasta, "carga.db")
+        blog = importlib.import_module("7_projeto_blog")
+
+        with blog.app.app_context():
+            if args.posts:
+                segundos = blog.popular_banco(args.posts, semente=args.semente)
+                print(f"Banco populado com {args.posts} posts em {segundos:.1f}s")
+            total_posts = blog.ler_contador("posts")
+            total_categorias = blog.ler_contador("categorias")
+            contador = ContadorConsultas(blog.db.engine)
+
+        if args.sem_cache_paginas:
+            blog.cache_paginas.maximo = 0
+
+        resultados = {}
+        for modo in args.modos:
+            cenarios = montar_cenarios(
+                total_posts, total_categorias, random.Random(args.semente)
+            )
+            if modo == "test_client":
+                resultados[modo] = medir_test_client(cenarios, args.requisicoes, contador)
+            else:
+                resultados[modo] = medir_wsgi(
+                    cenarios, args.requisicoes, args.concorrencia, contador
+                )
+            imprimir(modo, resultados[modo])
+
+        with blog.app.app_context():
+            blog.db.engine.dispose()  # libera o arquivo antes de apagar a pasta
+
+    commit = commit_atual()
+    agora = datetime.now()
+    saida = args.saida or os.path.join(
+        PASTA_RESULTADOS, f"carga-{agora:%Y%m%d-%H%M%S}-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "commit": commit,
+            "data": agora.isoformat(timespec="seconds"),
+            "parametros": vars(args),
+            "resultados": resultados,
+        }, arquivo, indent=2, ensure_ascii=False)
+    print(f"\nResultado salvo em {saida}")
+
+
+if __name__ == "__main__":
+    main()
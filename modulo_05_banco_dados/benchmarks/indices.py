@@ -0,0 +1,167 @@
+# ============================================================
+# BENCHMARK: LISTAGENS ANTES E DEPOIS DAS MIGRAÇÕES DE ÍNDICE
+# ============================================================
+# Simula um blogpy.db "antigo" (tabelas do BlogPy sem nenhum índice,
+# PRAGMA user_version = 0) com 1 milhão de posts e mede as consultas
+# das listagens:
+#
+#   1. com o banco antigo → o plano mostra SCAN post + USE TEMP B-TREE
+#      (lê a tabela inteira e ordena tudo para devolver 5 posts)
+#   2. importa o 7_projeto_blog apontando para esse arquivo: as
+#      MIGRAÇÕES rodam no próprio banco, sem perder nenhum post
+#   3. mede de novo → o plano mostra SCAN/SEARCH post USING INDEX
+#
+# Uso (dentro de modulo_05_banco_dados):
+#   python benchmarks/indices.py
+#   python benchmarks/indices.py --posts 200000 --repeticoes 5
+#   python benchmarks/indices.py --json resultado.json
+# ============================================================
+
+import argparse
+import importlib
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+PASTA_MODULO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_MODULO)
+
+TOTAL_CATEGORIAS = 5
+COLUNAS = "post.id, post.titulo, post.conteudo, post.criado_em, post.categoria_id"
+
+# As mesmas consultas que as rotas do BlogPy fazem (primeira página)
+CONSULTAS = {
+    "inicio": (
+        f"SELECT {COLUNAS} FROM post ORDER BY post.criado_em DESC LIMIT 5 OFFSET 0",
+        (),
+    ),
+    "categoria": (
+        f"SELECT {COLUNAS} FROM post WHERE post.categoria_id = ? "
+        "ORDER BY post.criado_em DESC LIMIT 5 OFFSET 0",
+        (3,),
+    ),
+    "cursor": (
+        f"SELECT {COLUNAS} FROM post WHERE (post.criado_em, post.id) < (?, ?) "
+        "ORDER BY post.criado_em DESC, post.id DESC LIMIT 6",
+        ("2020-06-01 00:00:00.000000", 10**9),
+    ),
+}
+
+
+def criar_banco_antigo(caminho, total_posts):
+    """Cria o banco como ele era antes das migrações: sem índices"""
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript("""
+        CREATE TABLE categoria (
+            id INTEGER NOT NULL PRIMARY KEY,
+            nome VARCHAR(50) NOT NULL UNIQUE
+        );
+        CREATE TABLE post (
+            id INTEGER NOT NULL PRIMARY KEY,
+            titulo VARCHAR(200) NOT NULL,
+            conteudo TEXT NOT NULL,
+            criado_em DATETIME,
+            categoria_id INTEGER REFERENCES categoria (id)
+        );
+    """)
+    conexao.executemany(
+        "INSERT INTO categoria (nome) VALUES (?)",
+        [(f"Categoria {i}",) for i in range(1, TOTAL_CATEGORIAS + 1)],
+    )
+    inicio = datetime(2020, 1, 1)
+    conexao.executemany(
+        "INSERT INTO post (titulo, conteudo, criado_em, categoria_id) VALUES (?, ?, ?, ?)",
+        (
+            (f"Post {i}", f"Texto do post {i} sobre python e banco de dados",
+             (inicio + timedelta(seconds=30 * i)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+             i % TOTAL_CATEGORIAS + 1)
+            for i in range(total_posts)
+        ),
+    )
+    conexao.commit()
+    conexao.close()
+
+
+def medir(caminho, repeticoes):
+    """Plano de execução e tempo (mediana) de cada consulta"""
+    conexao = sqlite3.connect(caminho)
+    resultados = {}
+    for nome, (sql, parametros) in CONSULTAS.items():
+        plano = [
+            detalhe for *_, detalhe
+            in conexao.execute("EXPLAIN QUERY PLAN " + sql, parametros)
+        ]
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            conexao.execute(sql, parametros).fetchall()
+            tempos.append(time.perf_counter() - inicio)
+        resultados[nome] = {
+            "plano": plano,
+            "ms": round(statistics.median(tempos) * 1000, 3),
+        }
+    versao = conexao.execute("PRAGMA user_version").fetchone()[0]
+    conexao.close()
+    return versao, resultados
+
+
+def imprimir(titulo, versao, resultados):
+    print(f"\n[{titulo}] PRAGMA user_version = {versao}")
+    for nome, r in resultados.items():
+        print(f"  {nome:<10} {r['ms']:>10.3f} ms   " + " | ".join(r["plano"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listagens antes e depois dos índices")
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=10, help="execuções por consulta")
+    parser.add_argument("--json", help="arquivo para salvar o resultado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "blogpy_antigo.db")
+
+        inicio = time.perf_counter()
+        criar_banco_antigo(caminho, args.posts)
+        print(f"Banco antigo criado com {args.posts} posts "
+              f"em {time.perf_counter() - inicio:.1f}s")
+
+        versao_antes, antes = medir(caminho, args.repeticoes)
+        imprimir("antes", versao_antes, antes)
+
+        # Importar o BlogPy roda create_all() + aplicar_migracoes()
+        print()
+        os.environ["BLOGPY_DATABASE_URI"] = "sqlite:///" + caminho
+        inicio = time.perf_counter()
+        blog = importlib.import_module("7_projeto_blog")
+        segundos_migracao = time.perf_counter() - inicio
+        with blog.app.app_context():
+            total = blog.db.session.query(blog.Post).count()
+            blog.db.engine.dispose()  # libera o arquivo antes de apagar a pasta
+        print(f"Migrações aplicadas em {segundos_migracao:.1f}s ({total} posts mantidos)")
+
+        versao_depois, depois = medir(caminho, args.repeticoes)
+        imprimir("depois", versao_depois, depois)
+
+    print(f"\n{'consulta':<10} {'antes ms':>10} {'depois ms':>10} {'ganho':>8}")
+    for nome in CONSULTAS:
+        ganho = antes[nome]["ms"] / max(depois[nome]["ms"], 0.001)
+        print(f"{nome:<10} {antes[nome]['ms']:>10.3f} {depois[nome]['ms']:>10.3f} {ganho:>7.0f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "parametros": vars(args),
+                "segundos_migracao": round(segundos_migracao, 2),
+                "antes": antes,
+                "depois": depois,
+            }, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# ============================================================
+# BENCHMARK: SQLITE PADRÃO x PERFIL "PRODUÇÃO"
+# ============================================================
+# Mede quantas leituras e escritas por segundo o SQLite aguenta
+# com várias threads ao mesmo tempo, com e sem os PRAGMAs de
+# configuracao_sqlite.py.
+#
+# Cada thread leitora repete a consulta da página inicial do BlogPy;
+# cada thread escritora publica posts (um commit por post, como a
+# rota /novo).
+#
+# Uso (dentro de modulo_05_banco_dados):
+#   python benchmarks/perfil_sqlite.py
+#   python benchmarks/perfil_sqlite.py --leitores 8 --escritores 2 --segundos 10
+#   python benchmarks/perfil_sqlite.py --json resultado.json
+# ============================================================
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from configuracao_sqlite import PERFIS_SQLITE, aplicar_pragmas  # noqa: E402
+
+
+CONSULTA_INICIO = (
+    "SELECT post.id, post.titulo, post.conteudo, post.criado_em, categoria.nome "
+    "FROM post LEFT JOIN categoria ON categoria.id = post.categoria_id "
+    "ORDER BY post.criado_em DESC LIMIT 5 OFFSET ?"
+)
+
+
+def criar_banco(caminho, total_posts):
+    """Cria um banco parecido com o do BlogPy, já com posts"""
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript("""
+        CREATE TABLE categoria (id INTEGER PRIMARY KEY, nome VARCHAR(50) UNIQUE NOT NULL);
+        CREATE TABLE post (
+            id INTEGER PRIMARY KEY,
+            titulo VARCHAR(200) NOT NULL,
+            conteudo TEXT NOT NULL,
+            criado_em DATETIME,
+            categoria_id INTEGER REFERENCES categoria(id)
+        );
+        CREATE INDEX ix_post_criado_em_id ON post (criado_em, id);
+    """)
+    conexao.executemany(
+        "INSERT INTO categoria (nome) VALUES (?)",
+        [(f"Categoria {i}",) for i in range(1, 6)],
+    )
+    inicio = datetime(2026, 1, 1)
+    conexao.executemany(
+        "INSERT INTO post (titulo, conteudo, criado_em, categoria_id) VALUES (?, ?, ?, ?)",
+        (
+            (f"Post {i}", "Texto de exemplo " * 20,
+             str(inicio + timedelta(minutes=i)), i % 5 + 1)
+            for i in range(total_posts)
+        ),
+    )
+    conexao.commit()
+    conexao.close()
+
+
+def rodar(caminho, pragmas, leitores, escritores, segundos):
+    """Roda leitores e escritores ao mesmo tempo e conta as operações"""
+    contagem = {"leituras": 0, "escritas": 0, "erros": 0}
+    trava = threading.Lock()
+    parar = threading.Event()
+
+    def conectar():
+        conexao = sqlite3.connect(caminho, timeout=5, check_same_thread=False)
+        aplicar_pragmas(conexao, pragmas)
+        return conexao
+
+    def leitor():
+        conexao = conectar()
+        feitas = erros = 0
+        while not parar.is_set():
+            try:
+                conexao.execute(CONSULTA_INICIO, ((feitas % 20) * 5,)).fetchall()
+                feitas += 1
+            except sqlite3.OperationalError:
+                erros += 1
+        conexao.close()
+        with trava:
+            contagem["leituras"] += feitas
+            contagem["erros"] += erros
+
+    def escritor():
+        conexao = conectar()
+        feitas = erros = 0
+        while not parar.is_set():
+            try:
+                conexao.execute(
+                    "INSERT INTO post (titulo, conteudo, criado_em, categoria_id) "
+                    "VALUES (?, ?, ?, ?)",
+                    ("Novo post", "Conteúdo " * 20, str(datetime.now()), 1),
+                )
+                conexao.commit()
+                feitas += 1
+            except sqlite3.OperationalError:
+                conexao.rollback()
+                erros += 1
+        conexao.close()
+        with trava:
+            contagem["escritas"] += feitas
+            contagem["erros"] += erros
+
+    threads = [threading.Thread(target=leitor) for _ in range(leitores)]
+    threads += [threading.Thread(target=escritor) for _ in range(escritores)]
+    for thread in threads:
+        thread.start()
+    time.sleep(segundos)
+    parar.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "leituras_por_segundo": round(contagem["leituras"] / segundos, 1),
+        "escritas_por_segundo": round(contagem["escritas"] / segundos, 1),
+        "erros": contagem["erros"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite padrão x perfil de produção")
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--leitores", type=int, default=4)
+    parser.add_argument("--escritores", type=int, default=2)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--json", help="arquivo para salvar o resultado")
+    args = parser.parse_args()
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for perfil in ("padrao", "producao"):
+            caminho = os.path.join(pasta, f"{perfil}.db")
+            criar_banco(caminho, args.posts)
+            resultados[perfil] = rodar(
+                caminho, PERFIS_SQLITE[perfil],
+                args.leitores, args.escritores, args.segundos,
+            )
+
+    print(f"{args.posts} posts, {args.leitores} leitores, "
+          f"{args.escritores} escritores, {args.segundos}s por perfil\n")
+    print(f"{'perfil':<10} {'leituras/s':>12} {'escritas/s':>12} {'erros':>8}")
+    for perfil, r in resultados.items():
+        print(f"{perfil:<10} {r['leituras_por_segundo']:>12} "
+              f"{r['escritas_por_segundo']:>12} {r['erros']:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump({"parametros": vars(args), "resultados": resultados}, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# ============================================================
+# CARREGAMENTO DA CATEGORIA DE CADA POST
+# ============================================================
+# Usado pelas lições do Módulo 5:
+#
+#   from carregamento import com_categoria
+#   app.config["CARREGAR_CATEGORIA"] = "joined"
+#   posts = com_categoria(Post.query).order_by(...).all()
+#
+# A lista de posts mostra post.categoria.nome para cada post.
+# Com o carregamento padrão ("lazy"), o SQLAlchemy busca a categoria
+# só quando alguém a acessa: UMA consulta extra POR POST da página
+# (o famoso problema "N+1").
+#
+# Estratégias (escolha em app.config["CARREGAR_CATEGORIA"]):
+#   "joined"   → traz a categoria junto, com um JOIN na mesma consulta
+#   "selectin" → uma 2ª consulta só: ... WHERE categoria.id IN (1, 2, 3)
+#   "lazy"     → comportamento padrão (uma consulta por post)
+# ============================================================
+
+from flask import current_app
+from sqlalchemy.orm import joinedload, lazyload, selectinload
+
+ESTRATEGIAS_CARREGAMENTO = {
+    "joined": joinedload,
+    "selectin": selectinload,
+    "lazy": lazyload,
+}
+
+
+def com_categoria(query):
+    """Aplica a estratégia de carregamento de post.categoria na consulta"""
+    # Cada lição tem a sua classe Post: pega a da própria consulta
+    post = query.column_descriptions[0]["entity"]
+    estrategia = ESTRATEGIAS_CARREGAMENTO[current_app.config["CARREGAR_CATEGORIA"]]
+    return query.options(estrategia(post.categoria))
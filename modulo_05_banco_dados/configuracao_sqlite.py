@@ -0,0 +1,79 @@
+# ============================================================
+# CONFIGURAÇÃO DO SQLITE PARA PRODUÇÃO
+# ============================================================
+# Usado por todas as lições do Módulo 5:
+#
+#   from configuracao_sqlite import aplicar_perfil_sqlite
+#   aplicar_perfil_sqlite(app, db)
+#
+# O SQLite vem configurado para ser seguro em qualquer situação,
+# não para ser rápido num servidor web. Com as opções padrão:
+# - cada escrita passa pelo "rollback journal" (cópia extra no disco)
+# - quem está lendo espera quem está escrevendo (e vice-versa)
+#
+# Os PRAGMAs são ajustes que valem para cada conexão aberta.
+# O perfil "producao" liga os mais usados em servidores:
+#
+#   journal_mode=WAL     → leitores e escritor trabalham ao mesmo tempo
+#   synchronous=NORMAL   → menos esperas pelo disco (seguro com WAL)
+#   mmap_size            → lê o arquivo direto da memória (sem cópias)
+#   cache_size           → mais páginas do banco guardadas em memória
+#   temp_store=MEMORY    → tabelas temporárias (ORDER BY, GROUP BY) na RAM
+#   busy_timeout         → espera até N ms pelo banco ocupado, em vez
+#                          de falhar na hora com "database is locked"
+#
+# Escolha o perfil com app.config["SQLITE_PERFIL"] ("producao" ou
+# "padrao") e ajuste PRAGMAs soltos com app.config["SQLITE_PRAGMAS"].
+# ============================================================
+
+from sqlalchemy import event
+
+PERFIS_SQLITE = {
+    # Sem nenhum ajuste: o comportamento de fábrica do SQLite
+    "padrao": {},
+    "producao": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,  # 256 MB
+        "cache_size": -64 * 1024,        # negativo = em KB → 64 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,            # 5 segundos
+    },
+}
+
+
+def pragmas_do_perfil(perfil="producao", extras=None):
+    """Junta os PRAGMAs de um perfil com ajustes extras"""
+    pragmas = dict(PERFIS_SQLITE[perfil])
+    pragmas.update(extras or {})
+    return pragmas
+
+
+def aplicar_pragmas(conexao, pragmas):
+    """Executa os PRAGMAs em uma conexão sqlite3 já aberta"""
+    cursor = conexao.cursor()
+    for nome, valor in pragmas.items():
+        cursor.execute(f"PRAGMA {nome} = {valor}")
+    cursor.close()
+
+
+def aplicar_perfil_sqlite(app, db):
+    """
+    Aplica o perfil de app.config["SQLITE_PERFIL"] em cada nova
+    conexão do banco. Chame logo depois de criar o db, antes de
+    qualquer consulta.
+    """
+    pragmas = pragmas_do_perfil(
+        app.config.get("SQLITE_PERFIL", "producao"),
+        app.config.get("SQLITE_PRAGMAS"),
+    )
+
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def ao_conectar(conexao, registro):
+        aplicar_pragmas(conexao, pragmas)
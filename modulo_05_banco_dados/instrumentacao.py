@@ -0,0 +1,255 @@
+# ============================================================
+# INSTRUMENTAÇÃO: QUANTO SQL CADA REQUISIÇÃO RODOU?
+# ============================================================
+# Usado pelas lições do Módulo 5:
+#
+#   from instrumentacao import instrumentar
+#   instrumentar(app, db)
+#
+# Para cada requisição, mede:
+#   - quantos comandos SQL rodaram e quanto tempo levaram
+#   - qual foi o comando mais lento
+#   - quanto tempo o Jinja levou para montar o HTML
+#
+# E mostra isso em dois lugares:
+#   1. Cabeçalho Server-Timing da resposta → aparece na aba
+#      "Network" (Rede) do navegador, em "Timing"
+#      (só números: o texto do SQL mais lento revela tabelas e
+#      consultas para qualquer visitante, então só aparece com
+#      app.debug ligado ou app.config["SERVER_TIMING_SQL"] = True)
+#   2. Rota /metrics → totais desde que o servidor subiu, no formato
+#      de texto do Prometheus (ferramenta de monitoramento)
+#
+# Como funciona: o SQLAlchemy avisa antes e depois de cada comando
+# (eventos before_cursor_execute / after_cursor_execute) e o Flask
+# avisa antes e depois de cada requisição (before_request /
+# after_request) e de cada template (sinais do Jinja).
+#
+# CONSULTAS LENTAS: todo comando que passar de
+# app.config["CONSULTAS_LENTAS_MS"] (padrão: 100 ms) vai para o
+# arquivo instance/consultas_lentas.log, com os parâmetros, a duração
+# e o plano de execução do SQLite (EXPLAIN QUERY PLAN). No plano:
+#   SCAN post                        → leu a tabela inteira (falta índice?)
+#   SEARCH post USING INDEX ...      → usou um índice (bom!)
+#   USE TEMP B-TREE FOR ORDER BY     → ordenou tudo em memória (falta índice?)
+# O arquivo "gira" ao chegar em 1 MB (guarda os 5 anteriores).
+# Use CONSULTAS_LENTAS_MS = None para desligar.
+# ============================================================
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from flask import g, has_request_context, request
+from flask.signals import before_render_template, template_rendered
+from sqlalchemy import event
+
+
+class Metricas:
+    """Totais por rota desde que o servidor subiu (seguro entre threads)"""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.por_rota = {}
+
+    def registrar(self, rota, status, segundos, consultas, segundos_sql, segundos_template):
+        with self._trava:
+            total = self.por_rota.setdefault(rota, {
+                "requisicoes": 0, "erros": 0, "segundos": 0.0, "consultas": 0,
+                "segundos_sql": 0.0, "segundos_template": 0.0,
+            })
+            total["requisicoes"] += 1
+            total["erros"] += status >= 500
+            total["segundos"] += segundos
+            total["consultas"] += consultas
+            total["segundos_sql"] += segundos_sql
+            total["segundos_template"] += segundos_template
+
+    def texto_prometheus(self, extras=None):
+        """Formato de texto do Prometheus: uma linha por métrica e rota"""
+        series = [
+            ("app_requisicoes_total", "counter", "Requisições atendidas", "requisicoes"),
+            ("app_requisicoes_erro_total", "counter", "Respostas 5xx", "erros"),
+            ("app_requisicao_segundos_total", "counter", "Tempo total das requisições", "segundos"),
+            ("app_sql_consultas_total", "counter", "Comandos SQL executados", "consultas"),
+            ("app_sql_segundos_total", "counter", "Tempo gasto em SQL", "segundos_sql"),
+            ("app_template_segundos_total", "counter", "Tempo gasto renderizando templates", "segundos_template"),
+        ]
+        with self._trava:
+            por_rota = {rota: dict(total) for rota, total in self.por_rota.items()}
+
+        linhas = []
+        for nome, tipo, ajuda, campo in series:
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            for rota, total in sorted(por_rota.items()):
+                linhas.append(f'{nome}{{rota="{rota}"}} {total[campo]}')
+
+        # Contador ("counter") só sobe, medidor ("gauge") sobe e desce:
+        # o Prometheus só calcula taxas (rate) certas sobre contadores
+        for nome, (tipo, ajuda, valor) in (extras() if extras else {}).items():
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            linhas.append(f"{nome} {valor}")
+        return "\n".join(linhas) + "\n"
+
+
+def criar_log_consultas_lentas(app):
+    """Logger que grava em instance/consultas_lentas.log, com rotação"""
+    arquivo = app.config.get(
+        "CONSULTAS_LENTAS_ARQUIVO",
+        os.path.join(app.instance_path, "consultas_lentas.log"),
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(arquivo)), exist_ok=True)
+
+    log = logging.getLogger(f"consultas_lentas.{app.name}")
+    log.setLevel(logging.WARNING)
+    log.propagate = False  # não repete no terminal
+    if not log.handlers:
+        destino = RotatingFileHandler(
+            arquivo, maxBytes=1024 * 1024, backupCount=5, encoding="utf-8"
+        )
+        destino.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        log.addHandler(destino)
+    return log
+
+
+def plano_de_execucao(cursor, sql, parametros):
+    """Roda EXPLAIN QUERY PLAN na mesma conexão e devolve o plano como texto"""
+    try:
+        linhas = cursor.connection.execute(
+            "EXPLAIN QUERY PLAN " + sql, parametros
+        ).fetchall()
+    except sqlite3.Error as erro:
+        return f"  (plano indisponível: {erro})"
+
+    # Cada linha: (id, id_do_pai, não_usado, detalhe) → vira uma árvore
+    profundidade = {0: 0}
+    texto = []
+    for id_, pai, _, detalhe in linhas:
+        profundidade[id_] = profundidade.get(pai, 0) + 1
+        texto.append("  " * profundidade[id_] + detalhe)
+    return "\n".join(texto) or "  (sem plano)"
+
+
+def instrumentar(app, db, extras=None):
+    """
+    Liga a instrumentação no app.
+
+    extras: função opcional que devolve
+            {nome_da_metrica: ("counter" ou "gauge", ajuda, valor)}
+            para acrescentar ao /metrics (ex.: acertos do cache;
+            contadores terminam em _total)
+    """
+    metricas = Metricas()
+    app.extensions["metricas"] = metricas
+
+    with app.app_context():
+        engine = db.engine
+
+    limite_lenta_ms = app.config.get("CONSULTAS_LENTAS_MS", 100)
+    log_lentas = criar_log_consultas_lentas(app) if limite_lenta_ms is not None else None
+
+    # ---------- SQL ----------
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def antes_do_sql(conexao, cursor, sql, parametros, contexto, executemany):
+        contexto._inicio_instrumentacao = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def depois_do_sql(conexao, cursor, sql, parametros, contexto, executemany):
+        segundos = time.perf_counter() - contexto._inicio_instrumentacao
+
+        if log_lentas and segundos * 1000 >= limite_lenta_ms:
+            registrar_consulta_lenta(cursor, sql, parametros, executemany, segundos)
+
+        if not has_request_context() or "medicao" not in g:
+            return
+        medicao = g.medicao
+        medicao["consultas"] += 1
+        medicao["segundos_sql"] += segundos
+        if segundos > medicao["mais_lenta"][0]:
+            medicao["mais_lenta"] = (segundos, sql)
+
+    def registrar_consulta_lenta(cursor, sql, parametros, executemany, segundos):
+        rota = request.path if has_request_context() else "(fora de requisição)"
+        if executemany:
+            plano = f"  (executemany com {len(parametros)} linhas: sem plano)"
+            parametros = f"{parametros[:3]}..."
+        elif engine.dialect.name == "sqlite":
+            plano = plano_de_execucao(cursor, sql, parametros)
+        else:
+            plano = "  (EXPLAIN QUERY PLAN só no SQLite)"
+        log_lentas.warning(
+            "%.1f ms em %s\nSQL: %s\nParâmetros: %s\nPlano:\n%s\n",
+            segundos * 1000, rota, " ".join(sql.split()), parametros, plano,
+        )
+
+    # ---------- Templates ----------
+
+    @before_render_template.connect_via(app)
+    def antes_do_template(remetente, template, context, **extra):
+        if "medicao" in g:
+            g.medicao["inicio_template"] = time.perf_counter()
+
+    @template_rendered.connect_via(app)
+    def depois_do_template(remetente, template, context, **extra):
+        if "medicao" in g and g.medicao.get("inicio_template"):
+            g.medicao["segundos_template"] += time.perf_counter() - g.medicao.pop("inicio_template")
+
+    # ---------- Requisição ----------
+
+    @app.before_request
+    def iniciar_medicao():
+        g.medicao = {
+            "inicio": time.perf_counter(),
+            "consultas": 0,
+            "segundos_sql": 0.0,
+            "segundos_template": 0.0,
+            "mais_lenta": (0.0, None),
+        }
+
+    @app.after_request
+    def encerrar_medicao(resposta):
+        medicao = g.pop("medicao", None)
+        if medicao is None:
+            return resposta
+
+        segundos = time.perf_counter() - medicao["inicio"]
+        rota = request.url_rule.rule if request.url_rule else "desconhecida"
+        metricas.registrar(
+            rota, resposta.status_code, segundos, medicao["consultas"],
+            medicao["segundos_sql"], medicao["segundos_template"],
+        )
+
+        # Server-Timing: durações em milissegundos
+        partes = [
+            f'sql;dur={medicao["segundos_sql"] * 1000:.2f};desc="{medicao["consultas"]} consultas"',
+            f'tpl;dur={medicao["segundos_template"] * 1000:.2f};desc="templates"',
+        ]
+        lenta_segundos, lenta_sql = medicao["mais_lenta"]
+        if lenta_sql:
+            parte = f"sql-lenta;dur={lenta_segundos * 1000:.2f}"
+            if app.config.get("SERVER_TIMING_SQL", app.debug):
+                # Cabeçalhos HTTP só aceitam ASCII com segurança
+                trecho = " ".join(lenta_sql.split())[:60].replace('"', "'")
+                trecho = trecho.encode("ascii", "ignore").decode()
+                parte += f';desc="{trecho}"'
+            partes.append(parte)
+        partes.append(f"total;dur={segundos * 1000:.2f}")
+        resposta.headers["Server-Timing"] = ", ".join(partes)
+        return resposta
+
+    # ---------- /metrics ----------
+
+    @app.route("/metrics")
+    def metrics():
+        return app.response_class(
+            metricas.texto_prometheus(extras),
+            mimetype="text/plain; version=0.0.4",
+        )
+
+    return metricas
@@ -0,0 +1,48 @@
+# ============================================================
+# MIGRAÇÕES: ATUALIZANDO UM BANCO QUE JÁ EXISTE
+# ============================================================
+# Usado pelas lições do Módulo 5:
+#
+#   from migracoes import aplicar_migracoes
+#   aplicar_migracoes(app, db, MIGRACOES)
+#
+# O db.create_all() só cria o que ainda NÃO existe: se a tabela
+# post já está no blogpy.db, um índice novo declarado no modelo
+# nunca chega ao arquivo. Quem já tem dados ficaria sem ele.
+#
+# Uma migração é uma lista de comandos SQL que leva o banco de uma
+# versão para a próxima. O SQLite guarda a versão do arquivo em
+# PRAGMA user_version (um número no cabeçalho do .db, começa em 0).
+#
+#   MIGRACOES = [
+#       ("Índice em criado_em", ["CREATE INDEX IF NOT EXISTS ..."]),  # → versão 1
+#       ("Índice em categoria_id", ["CREATE INDEX IF NOT EXISTS ..."]),  # → versão 2
+#   ]
+#
+# Ao iniciar, só rodam as migrações acima da versão do arquivo.
+# Regras de ouro:
+#   - nunca edite uma migração que já foi publicada: crie outra
+#   - use IF NOT EXISTS, para que um banco novo (criado pelo
+#     create_all() já com os índices) também passe sem erro
+# ============================================================
+
+from sqlalchemy import text
+
+
+def versao_do_banco(db):
+    """Versão atual do arquivo (PRAGMA user_version)"""
+    return db.session.execute(text("PRAGMA user_version")).scalar()
+
+
+def aplicar_migracoes(app, db, migracoes):
+    """Aplica, em ordem, as migrações que o banco ainda não tem"""
+    with app.app_context():
+        versao = versao_do_banco(db)
+        for numero, (descricao, comandos) in enumerate(migracoes, start=1):
+            if numero <= versao:
+                continue
+            for sql in comandos:
+                db.session.execute(text(sql))
+            db.session.execute(text(f"PRAGMA user_version = {numero}"))
+            db.session.commit()
+            print(f"Migração {numero} aplicada: {descricao}")
@@ -0,0 +1,168 @@
+# ============================================================
+# TESTE: QUANTAS CONSULTAS SQL CADA LISTAGEM RODA?
+# ============================================================
+# Garante que a estratégia de carregamento (carregamento.py) funciona:
+# com "joined" ou "selectin", uma página de posts custa um número
+# FIXO de consultas, sem uma consulta extra por post (N+1).
+#
+# As consultas são contadas com o evento before_cursor_execute do
+# SQLAlchemy, o mesmo que instrumentacao.py usa.
+#
+# Uso (dentro de modulo_05_banco_dados):
+#   python -m unittest discover tests
+#   python -m pytest tests
+# ============================================================
+
+import contextlib
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import event
+
+PASTA_MODULO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_MODULO)
+
+# Consultas esperadas no BlogPy, por rota e estratégia, com o cache vazio
+# (posts da página + total do contador + categorias da barra lateral)
+CONSULTAS_BLOG = {
+    "/": {"joined": 3, "selectin": 4},
+    "/?page=2": {"joined": 3, "selectin": 4},
+    "/?after=2100-01-01T00:00:00,1": {"joined": 2, "selectin": 3},
+    "/categoria/1": {"joined": 4, "selectin": 5},
+    "/busca?q=python": {"joined": 3, "selectin": 4},
+    "/busca?q=python&after=2100-01-01T00:00:00,1": {"joined": 2, "selectin": 3},
+}
+
+# Listagens das lições 5.5 e 5.6: (variável do banco, rotas)
+ROTAS_LICOES = {
+    "5_relacionamentos": ("BLOG_CATEGORIAS_DATABASE_URI", ["/", "/categoria/1"]),
+    "6_busca_paginacao": ("BLOG_BUSCA_DATABASE_URI",
+                          ["/", "/?page=2", "/categoria/1", "/busca?q=python"]),
+}
+
+
+@contextlib.contextmanager
+def contar_consultas(modulo):
+    """Guarda numa lista o texto de cada comando SQL rodado dentro do with"""
+    with modulo.app.app_context():
+        engine = modulo.db.engine
+    comandos = []
+
+    def antes_do_sql(conexao, cursor, sql, parametros, contexto, executemany):
+        comandos.append(" ".join(sql.split()))
+
+    event.listen(engine, "before_cursor_execute", antes_do_sql)
+    try:
+        yield comandos
+    finally:
+        event.remove(engine, "before_cursor_execute", antes_do_sql)
+
+
+def importar_com_banco_temporario(nome, variavel, pasta):
+    """
+    Importa um app do Módulo 5 usando um banco novo dentro de `pasta`
+    (o banco de verdade do aluno, em instance/, nem é aberto)
+    """
+    os.environ[variavel] = "sqlite:///" + os.path.join(pasta, f"{nome}.db")
+    try:
+        with contextlib.redirect_stdout(None):
+            return importlib.import_module(nome)
+    finally:
+        del os.environ[variavel]
+
+
+def fechar_banco(modulo):
+    with modulo.app.app_context():
+        modulo.db.engine.dispose()
+
+
+def consultas_da_rota(modulo, rota, estrategia):
+    """Comandos SQL que uma rota rodou com a estratégia escolhida"""
+    modulo.app.config["CARREGAR_CATEGORIA"] = estrategia
+    if hasattr(modulo, "invalidar_caches"):
+        modulo.invalidar_caches()  # sem cache: mede a página de verdade
+    with contar_consultas(modulo) as comandos:
+        resposta = modulo.app.test_client().get(rota)
+    assert resposta.status_code == 200, f"{rota} respondeu {resposta.status_code}"
+    return comandos
+
+
+def categoria_por_post(comandos, rota="/"):
+    """
+    Comandos que buscaram UMA categoria pelo id (o carregamento "lazy").
+    /categoria/<id> busca a própria categoria uma vez: essa não conta.
+    """
+    buscas = [sql for sql in comandos if "FROM categoria WHERE categoria.id = ?" in sql]
+    return buscas[1:] if rota.startswith("/categoria/") else buscas
+
+
+class TesteConsultasBlog(unittest.TestCase):
+    """BlogPy (7_projeto_blog.py) num banco temporário"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pasta = tempfile.TemporaryDirectory()
+        cls.blog = importar_com_banco_temporario(
+            "7_projeto_blog", "BLOGPY_DATABASE_URI", cls.pasta.name
+        )
+        cls.estrategia_original = cls.blog.app.config["CARREGAR_CATEGORIA"]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.blog.app.config["CARREGAR_CATEGORIA"] = cls.estrategia_original
+        fechar_banco(cls.blog)
+        cls.pasta.cleanup()
+
+    def test_numero_fixo_de_consultas_por_rota(self):
+        for rota, esperadas in CONSULTAS_BLOG.items():
+            for estrategia, quantas in esperadas.items():
+                with self.subTest(rota=rota, estrategia=estrategia):
+                    comandos = consultas_da_rota(self.blog, rota, estrategia)
+                    self.assertEqual(len(comandos), quantas, "\n".join(comandos))
+                    self.assertEqual(categoria_por_post(comandos, rota), [])
+
+    def test_lazy_faz_uma_consulta_por_categoria(self):
+        # A primeira página tem posts de várias categorias: o "lazy"
+        # busca cada categoria separada, o "joined" não
+        lazy = consultas_da_rota(self.blog, "/", "lazy")
+        joined = consultas_da_rota(self.blog, "/", "joined")
+        self.assertGreater(len(categoria_por_post(lazy)), 1)
+        self.assertEqual(len(lazy), len(joined) + len(categoria_por_post(lazy)))
+
+
+class TesteConsultasLicoes(unittest.TestCase):
+    """Lições 5.5 e 5.6 (cada uma num banco temporário): nenhuma
+    listagem busca a categoria post a post"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pasta = tempfile.TemporaryDirectory()
+        cls.licoes = {
+            nome: importar_com_banco_temporario(nome, variavel, cls.pasta.name)
+            for nome, (variavel, _) in ROTAS_LICOES.items()
+        }
+        cls.estrategias_originais = {
+            nome: licao.app.config["CARREGAR_CATEGORIA"] for nome, licao in cls.licoes.items()
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        for nome, licao in cls.licoes.items():
+            licao.app.config["CARREGAR_CATEGORIA"] = cls.estrategias_originais[nome]
+            fechar_banco(licao)
+        cls.pasta.cleanup()
+
+    def test_sem_consulta_de_categoria_por_post(self):
+        for nome, (_, rotas) in ROTAS_LICOES.items():
+            for rota in rotas:
+                for estrategia in ("joined", "selectin"):
+                    with self.subTest(licao=nome, rota=rota, estrategia=estrategia):
+                        comandos = consultas_da_rota(self.licoes[nome], rota, estrategia)
+                        self.assertEqual(categoria_por_post(comandos, rota), [])
+
+
+if __name__ == "__main__":
+    unittest.main()